@@ -12,10 +12,35 @@ class Settings:
     ADMIN_PASSWORD: str = os.getenv("ADMIN_PASSWORD") or secrets.token_urlsafe(16)
     DB_PATH: str = os.getenv("DB_PATH", "invest_v8_secure.db")
     BACKUP_DIR: str = os.getenv("BACKUP_DIR", "backups")
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "8"))
+    DB_MMAP_MB: int = int(os.getenv("DB_MMAP_MB", "256"))
+    DB_CACHE_MB: int = int(os.getenv("DB_CACHE_MB", "32"))
+    DB_BUSY_TIMEOUT_MS: int = int(os.getenv("DB_BUSY_TIMEOUT_MS", "5000"))
     YF_CACHE_TTL: int = int(os.getenv("YF_CACHE_TTL", "300"))
     MAX_WORKERS: int = int(os.getenv("MAX_WORKERS", "10"))
     YF_TIMEOUT: int = int(os.getenv("YF_TIMEOUT", "10"))
+    YF_TAXA: float = float(os.getenv("YF_TAXA", "5"))
+    YF_RAJADA: int = int(os.getenv("YF_RAJADA", "10"))
+    YF_TENTATIVAS: int = int(os.getenv("YF_TENTATIVAS", "3"))
+    DISJUNTOR_FALHAS: int = int(os.getenv("DISJUNTOR_FALHAS", "5"))
+    DISJUNTOR_ESPERA: float = float(os.getenv("DISJUNTOR_ESPERA", "30"))
+    HISTORICO_DIR: str = os.getenv("HISTORICO_DIR", "data/raw")
+    HISTORICO_TTL: int = int(os.getenv("HISTORICO_TTL", "3600"))
+    DIVIDENDOS_TTL: int = int(os.getenv("DIVIDENDOS_TTL", "43200"))
+    PROVEDOR_MERCADO: str = os.getenv("PROVEDOR_MERCADO", "yahoo")
+    REPLAY_DIR: str = os.getenv("REPLAY_DIR", "data/raw/fixtures")
+    REPLAY_LATENCIA_MS: float = float(os.getenv("REPLAY_LATENCIA_MS", "0"))
+    REPLAY_TAXA_ERRO: float = float(os.getenv("REPLAY_TAXA_ERRO", "0"))
+    PROCESSADOS_DIR: str = os.getenv("PROCESSADOS_DIR", "data/processed")
+    SCANNER_INTERVALO: int = int(os.getenv("SCANNER_INTERVALO", "900"))
+    ALERTAS_INTERVALO: int = int(os.getenv("ALERTAS_INTERVALO", "300"))
     ENABLE_AUDIT_LOG: bool = os.getenv("ENABLE_AUDIT_LOG", "true").lower() == "true"
+    AUDITORIA_LOTE: int = int(os.getenv("AUDITORIA_LOTE", "200"))
+    AUDITORIA_INTERVALO: float = float(os.getenv("AUDITORIA_INTERVALO", "2"))
+    AUDITORIA_FILA: int = int(os.getenv("AUDITORIA_FILA", "10000"))
+    LOG_PATH: str = os.getenv("LOG_PATH", "logs/app.log")
+    TELEMETRIA_ATIVA: bool = os.getenv("TELEMETRIA_ATIVA", "true").lower() == "true"
+    TELEMETRIA_AMOSTRAS: int = int(os.getenv("TELEMETRIA_AMOSTRAS", "2000"))
     DEBUG_MODE: bool = os.getenv("DEBUG_MODE", "false").lower() == "true"
     
     @classmethod
@@ -26,3 +51,34 @@ class Settings:
 
 settings = Settings()
 settings.validate()
+
+# Listas para Scanner de Oportunidades
+SCANNER_FIIS = [
+    "MXRF11", "HGLG11", "KNRI11", "XPLG11", "CPTS11", "KNCR11", "HGBS11", "VISC11", "BRCR11",
+    "HGRE11", "VINO11", "VRTA11", "RZTR11", "BCFF11", "BTLG11", "GTWR11", "HSML11", "MALL11"
+]
+
+SCANNER_ACOES = [
+    "VALE3", "PETR4", "ITUB4", "WEGE3", "BBAS3", "PRIO3", "RAIZ4", "BBDC4", "ABEV3", "RENT3",
+    "EQTL3", "SUZB3", "ELET3", "JBSS3", "LREN3", "RADL3", "HAPV3", "GGBR4", "CMIG4", "UGPA3"
+]
+
+SCANNER_ETFS = [
+    "IVVB11", "BOVA11", "SMAL11", "PIBB11", "FIXA11"
+]
+
+SCANNER_BDRS = [
+    "AAPL34", "GOOGL34", "MSFT34", "AMZO34", "NVDC34", "MELI34"
+]
+
+SCANNER_INTERNACIONAL = [
+    "IVV", "SPY", "VOO", "QQQ", "AAPL", "MSFT", "GOOGL", "AMZN", "TSLA", "NVDA"
+]
+
+CATEGORIAS_SCANNER = {
+    "FIIs": SCANNER_FIIS,
+    "Ações": SCANNER_ACOES,
+    "ETFs Nacionais": SCANNER_ETFS,
+    "BDRs": SCANNER_BDRS,
+    "Internacional": SCANNER_INTERNACIONAL
+}
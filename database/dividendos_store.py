@@ -0,0 +1,66 @@
+# database/dividendos_store.py
+import json
+import os
+import re
+import tempfile
+from pathlib import Path
+import pandas as pd
+from config.settings import settings
+
+class DividendosStore:
+    """Proventos por ticker persistidos em Parquet, indexados pela data-com.
+
+    Cada `<ticker>.parquet` tem uma linha por data-com (coluna 'valor', por
+    ação), e o `<ticker>.json` ao lado guarda a última consulta completa ao
+    provedor e o resumo de 12 meses calculado nela.
+    """
+
+    def __init__(self, base_dir: str = None):
+        self.base_dir = Path(base_dir or Path(settings.PROCESSADOS_DIR) / "dividendos")
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+
+    def _caminho(self, ticker: str, extensao: str) -> Path:
+        return self.base_dir / f"{re.sub(r'[^A-Za-z0-9._-]', '_', ticker)}.{extensao}"
+
+    def carregar(self, ticker: str) -> pd.Series:
+        """Proventos salvos (Series vazia se não houver)."""
+        caminho = self._caminho(ticker, "parquet")
+        if not caminho.exists():
+            return pd.Series(dtype=float, name='valor', index=pd.DatetimeIndex([], name='data_com'))
+        try:
+            return pd.read_parquet(caminho)['valor']
+        except Exception as e:
+            print(f"Proventos corrompidos para {ticker}, serão consultados novamente: {e}")
+            return pd.Series(dtype=float, name='valor', index=pd.DatetimeIndex([], name='data_com'))
+
+    def carregar_meta(self, ticker: str) -> dict:
+        caminho = self._caminho(ticker, "json")
+        if not caminho.exists():
+            return {}
+        try:
+            return json.loads(caminho.read_text())
+        except Exception:
+            return {}
+
+    def salvar(self, ticker: str, dividendos: pd.Series, meta: dict):
+        self._escrever_atomico(self._caminho(ticker, "parquet"),
+                               lambda tmp: dividendos.rename('valor').to_frame().to_parquet(tmp))
+        self.salvar_meta(ticker, meta)
+
+    def salvar_meta(self, ticker: str, meta: dict):
+        conteudo = json.dumps(meta).encode('utf-8')
+
+        def _escrever(tmp):
+            with open(tmp, 'wb') as f:
+                f.write(conteudo)
+        self._escrever_atomico(self._caminho(ticker, "json"), _escrever)
+
+    def _escrever_atomico(self, caminho: Path, escrever):
+        fd, tmp = tempfile.mkstemp(dir=self.base_dir, suffix='.tmp')
+        os.close(fd)
+        try:
+            escrever(tmp)
+            os.replace(tmp, caminho)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
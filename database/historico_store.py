@@ -0,0 +1,122 @@
+# database/historico_store.py
+import json
+import os
+import re
+import tempfile
+from datetime import datetime
+from pathlib import Path
+import pandas as pd
+from config.settings import settings
+
+class HistoricoStore:
+    """Histórico diário (OHLCV) persistido em Parquet, um arquivo por ticker.
+
+    Ao lado de cada `<ticker>.parquet` fica um `<ticker>.json` com o período
+    que o arquivo cobre e o momento da última sincronização com o Yahoo, e um
+    `<ticker>.stats.json` com as estatísticas rolantes calculadas sobre ele.
+    """
+
+    def __init__(self, base_dir: str = None):
+        self.base_dir = Path(base_dir or settings.HISTORICO_DIR)
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+
+    def _nome_arquivo(self, ticker: str) -> str:
+        # ^BVSP, USDBRL=X etc. viram nomes de arquivo seguros
+        return re.sub(r'[^A-Za-z0-9._-]', '_', ticker)
+
+    def _caminho(self, ticker: str) -> Path:
+        return self.base_dir / f"{self._nome_arquivo(ticker)}.parquet"
+
+    def _caminho_meta(self, ticker: str) -> Path:
+        return self.base_dir / f"{self._nome_arquivo(ticker)}.json"
+
+    def _caminho_estatisticas(self, ticker: str) -> Path:
+        return self.base_dir / f"{self._nome_arquivo(ticker)}.stats.json"
+
+    def carregar(self, ticker: str) -> pd.DataFrame:
+        """Retorna o histórico salvo (DataFrame vazio se não houver)."""
+        caminho = self._caminho(ticker)
+        if not caminho.exists():
+            return pd.DataFrame()
+        try:
+            return pd.read_parquet(caminho)
+        except Exception as e:
+            print(f"Histórico corrompido para {ticker}, será baixado novamente: {e}")
+            return pd.DataFrame()
+
+    def carregar_meta(self, ticker: str) -> dict:
+        caminho = self._caminho_meta(ticker)
+        if not caminho.exists():
+            return {}
+        try:
+            return json.loads(caminho.read_text())
+        except Exception:
+            return {}
+
+    def salvar(self, ticker: str, hist: pd.DataFrame, periodo: str) -> pd.DataFrame:
+        """Substitui o histórico do ticker pelo `hist` completo de `periodo`."""
+        hist = hist[~hist.index.duplicated(keep='last')].sort_index()
+        # 'base' muda a cada download completo: o 'Adj Close' antigo deixou de valer
+        self._gravar(ticker, hist, {'periodo': periodo, 'base': datetime.now().isoformat()})
+        return hist
+
+    def anexar(self, ticker: str, novos: pd.DataFrame) -> pd.DataFrame:
+        """Acrescenta barras novas; a última barra salva é sobrescrita (pode ser parcial)."""
+        hist = self.carregar(ticker)
+        if not hist.empty:
+            novos = novos.reindex(columns=hist.columns)
+            hist = pd.concat([hist, novos])
+        else:
+            hist = novos
+        hist = hist[~hist.index.duplicated(keep='last')].sort_index()
+        meta = self.carregar_meta(ticker)
+        self._gravar(ticker, hist, {'periodo': meta.get('periodo', 'max'), 'base': meta.get('base')})
+        return hist
+
+    def marcar_sincronizado(self, ticker: str):
+        """Registra uma sincronização que não trouxe barras novas."""
+        meta = self.carregar_meta(ticker)
+        meta['atualizado_em'] = datetime.now().isoformat()
+        self._escrever_atomico(self._caminho_meta(ticker), json.dumps(meta).encode('utf-8'))
+
+    def expirar(self, ticker: str):
+        """Esquece a última sincronização: a próxima leitura vai à rede buscar as barras novas."""
+        meta = self.carregar_meta(ticker)
+        if meta.pop('atualizado_em', None) is not None:
+            self._escrever_atomico(self._caminho_meta(ticker), json.dumps(meta).encode('utf-8'))
+
+    def carregar_estatisticas(self, ticker: str) -> dict:
+        caminho = self._caminho_estatisticas(ticker)
+        if not caminho.exists():
+            return {}
+        try:
+            return json.loads(caminho.read_text())
+        except Exception:
+            return {}
+
+    def salvar_estatisticas(self, ticker: str, dados: dict):
+        self._escrever_atomico(self._caminho_estatisticas(ticker), json.dumps(dados).encode('utf-8'))
+
+    def _gravar(self, ticker: str, hist: pd.DataFrame, meta: dict):
+        meta['atualizado_em'] = datetime.now().isoformat()
+        meta['ultima_data'] = hist.index[-1].isoformat() if not hist.empty else None
+        fd, tmp = tempfile.mkstemp(dir=self.base_dir, suffix='.parquet.tmp')
+        os.close(fd)
+        try:
+            hist.to_parquet(tmp)
+            os.replace(tmp, self._caminho(ticker))
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        self._escrever_atomico(self._caminho_meta(ticker), json.dumps(meta).encode('utf-8'))
+
+    def _escrever_atomico(self, caminho: Path, conteudo: bytes):
+        # Várias sessões podem sincronizar o mesmo ticker: escreve em temporário e renomeia
+        fd, tmp = tempfile.mkstemp(dir=self.base_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(conteudo)
+            os.replace(tmp, caminho)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
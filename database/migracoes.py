@@ -0,0 +1,116 @@
+# database/migracoes.py
+"""Migrações versionadas do schema, controladas por `PRAGMA user_version`.
+
+Cada migração roda uma única vez por banco, numa transação própria; para
+evoluir o schema basta acrescentar uma função e uma entrada em `MIGRACOES`.
+"""
+from database.transacoes import DATA_ABERTURA
+
+def _v1_indices(conn):
+    # A posição passa a ser única por (user_id, ticker): linhas repetidas viram uma só,
+    # com as quantidades somadas e o preço médio ponderado (0 se a soma das quantidades zerar;
+    # sem o COALESCE a divisão por zero vira NULL e viola o NOT NULL de pm)
+    conn.execute("""
+        UPDATE ativos SET
+            pm = (SELECT COALESCE(SUM(a.qtd * a.pm) / NULLIF(SUM(a.qtd), 0), 0) FROM ativos a
+                  WHERE a.user_id = ativos.user_id AND a.ticker = ativos.ticker),
+            qtd = (SELECT SUM(a.qtd) FROM ativos a
+                   WHERE a.user_id = ativos.user_id AND a.ticker = ativos.ticker)
+        WHERE id IN (SELECT MIN(id) FROM ativos GROUP BY user_id, ticker HAVING COUNT(*) > 1)
+    """)
+    conn.execute("DELETE FROM ativos WHERE id NOT IN (SELECT MIN(id) FROM ativos GROUP BY user_id, ticker)")
+    # Também atende as consultas só por user_id (prefixo do índice)
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_ativos_user_ticker ON ativos(user_id, ticker)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_metas_user ON metas_alocacao(user_id)")
+    # Parcial: só os alertas ativos, que são os únicos consultados pelas páginas
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_alertas_user_ativos ON alertas(user_id, ticker) WHERE ativo = 1")
+
+def _v2_transacoes(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS transacoes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            ticker TEXT NOT NULL,
+            tipo TEXT NOT NULL CHECK (tipo IN ('compra', 'venda', 'desdobramento', 'dividendo', 'ajuste')),
+            data TEXT NOT NULL,
+            qtd REAL NOT NULL DEFAULT 0,
+            preco REAL NOT NULL DEFAULT 0,
+            taxas REAL NOT NULL DEFAULT 0,
+            setor TEXT,
+            resultado REAL,
+            criado_em TEXT NOT NULL,
+            FOREIGN KEY(user_id) REFERENCES usuarios(id)
+        )
+    """)
+    # Marca d'água do materializador (id > versão) e reconstrução/consulta por ticker
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_transacoes_user ON transacoes(user_id, id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_transacoes_user_ticker ON transacoes(user_id, ticker, data, id)")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS carteira_versoes (
+            user_id INTEGER PRIMARY KEY,
+            versao INTEGER NOT NULL
+        )
+    """)
+    conn.execute("ALTER TABLE ativos ADD COLUMN lucro_realizado REAL NOT NULL DEFAULT 0")
+    conn.execute("ALTER TABLE ativos ADD COLUMN proventos REAL NOT NULL DEFAULT 0")
+    conn.execute("ALTER TABLE ativos ADD COLUMN ultima_data TEXT")
+    # As posições atuais viram o saldo de abertura do livro, datado antes de qualquer
+    # negociação: compras e vendas retroativas lançadas depois somam-se a ele
+    conn.execute("""
+        INSERT INTO transacoes (user_id, ticker, tipo, data, qtd, preco, setor, criado_em)
+        SELECT user_id, ticker, 'ajuste', ?, qtd, pm, setor, datetime('now', 'localtime')
+        FROM ativos ORDER BY id
+    """, (DATA_ABERTURA,))
+    conn.execute("UPDATE ativos SET ultima_data = ?", (DATA_ABERTURA,))
+    conn.execute("INSERT INTO carteira_versoes (user_id, versao) SELECT user_id, MAX(id) FROM transacoes GROUP BY user_id")
+
+def _v3_alertas_disparados(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS alertas_disparados (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            alerta_id TEXT NOT NULL,
+            user_id INTEGER NOT NULL,
+            ticker TEXT NOT NULL,
+            tipo TEXT NOT NULL,
+            preco_alvo REAL NOT NULL,
+            preco REAL NOT NULL,
+            disparado_em TEXT NOT NULL,
+            visto INTEGER NOT NULL DEFAULT 0,
+            FOREIGN KEY(user_id) REFERENCES usuarios(id)
+        )
+    """)
+    # Dashboard e página de alertas: disparos recentes (e não vistos) do usuário
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_disparos_user ON alertas_disparados(user_id, id)")
+
+MIGRACOES = [
+    (1, "Índices por usuário, posição única por (user_id, ticker) e alertas ativos", _v1_indices),
+    (2, "Livro de transações e posições materializadas", _v2_transacoes),
+    (3, "Eventos de alertas disparados", _v3_alertas_disparados),
+]
+
+def versao_schema(conn) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def aplicar_migracoes(conn) -> int:
+    """Aplica as migrações pendentes e retorna a versão final do schema."""
+    aplicadas = 0
+    for numero, descricao, migrar in MIGRACOES:
+        if versao_schema(conn) >= numero:
+            continue
+        # IMMEDIATE: dois processos subindo juntos não aplicam a mesma migração
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if versao_schema(conn) >= numero:
+                conn.rollback()
+                continue
+            migrar(conn)
+            conn.execute(f"PRAGMA user_version = {numero}")
+            conn.commit()
+            aplicadas += 1
+            print(f"Migração {numero} aplicada: {descricao}")
+        except Exception:
+            conn.rollback()
+            raise
+    if aplicadas:
+        conn.execute("PRAGMA optimize")
+    return versao_schema(conn)
@@ -0,0 +1,102 @@
+# database/pool.py
+import queue
+import sqlite3
+import threading
+from config.settings import settings
+
+# Instruções preparadas mantidas por conexão (o padrão do sqlite3 é 128)
+INSTRUCOES_EM_CACHE = 256
+
+class ConexaoPool(sqlite3.Connection):
+    """Conexão SQLite cujo `close()` devolve a conexão ao pool em vez de fechá-la.
+
+    Assim o código que já faz `conn = get_connection() ... conn.close()`
+    passa a reaproveitar conexões (e as instruções preparadas de cada uma)
+    sem nenhuma mudança.
+    """
+
+    pool = None
+    emprestada = False
+
+    def close(self):
+        if self.pool is None:
+            return super().close()
+        if not self.emprestada:
+            return  # close() repetido não pode devolver a mesma conexão duas vezes
+        self.emprestada = False
+        # Mesma semântica do close() original: o que não foi commitado é descartado
+        if self.in_transaction:
+            self.rollback()
+        self.row_factory = None
+        self.pool.devolver(self)
+
+    def fechar(self):
+        super().close()
+
+
+class PoolConexoes:
+    """Pool de conexões SQLite com WAL e pragmas de desempenho.
+
+    Em WAL, leitores não bloqueiam o escritor (e vice-versa), então várias
+    sessões do Streamlit podem ler a carteira enquanto outra salva. O pool
+    nunca bloqueia: se não houver conexão livre abre uma nova, e na devolução
+    mantém no máximo `tamanho` conexões ociosas.
+    """
+
+    def __init__(self, db_path: str, tamanho: int = None):
+        self.db_path = db_path
+        self.tamanho = tamanho or settings.DB_POOL_SIZE
+        self._livres = queue.LifoQueue()
+        self._fechado = False
+
+    def _abrir(self) -> ConexaoPool:
+        conn = sqlite3.connect(
+            self.db_path,
+            factory=ConexaoPool,
+            check_same_thread=False,
+            timeout=settings.DB_BUSY_TIMEOUT_MS / 1000,
+            cached_statements=INSTRUCOES_EM_CACHE
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA mmap_size={settings.DB_MMAP_MB * 1024 * 1024}")
+        # Valor negativo: tamanho em KiB, não em páginas
+        conn.execute(f"PRAGMA cache_size=-{settings.DB_CACHE_MB * 1024}")
+        conn.execute(f"PRAGMA busy_timeout={settings.DB_BUSY_TIMEOUT_MS}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.pool = self
+        return conn
+
+    def conectar(self) -> ConexaoPool:
+        try:
+            conn = self._livres.get_nowait()
+        except queue.Empty:
+            conn = self._abrir()
+        conn.emprestada = True
+        return conn
+
+    def devolver(self, conn: ConexaoPool):
+        if self._fechado or self._livres.qsize() >= self.tamanho:
+            conn.fechar()
+            return
+        self._livres.put(conn)
+
+    def fechar(self):
+        self._fechado = True
+        while True:
+            try:
+                self._livres.get_nowait().fechar()
+            except queue.Empty:
+                break
+
+
+_pools = {}
+_lock = threading.Lock()
+
+def obter_pool(db_path: str) -> PoolConexoes:
+    """Pool único por arquivo de banco no processo."""
+    with _lock:
+        pool = _pools.get(db_path)
+        if pool is None:
+            pool = _pools[db_path] = PoolConexoes(db_path)
+        return pool
@@ -1,6 +1,7 @@
 import sqlite3
 from contextlib import contextmanager
 from pathlib import Path
+from database.pool import obter_pool
 
 class DatabaseManager:
     def __init__(self, db_path="database/invest.db"):
@@ -22,7 +23,7 @@ class DatabaseManager:
 
     @contextmanager
     def get_connection(self):
-        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn = obter_pool(self.db_path).conectar()
         conn.row_factory = sqlite3.Row
         try:
             yield conn
@@ -0,0 +1,188 @@
+# database/transacoes.py
+"""Livro de transações (append-only) e a materialização das posições.
+
+Cada evento (compra, venda, desdobramento, dividendo ou ajuste manual) é
+gravado em `transacoes` e aplicado na hora à linha correspondente de
+`ativos`, que continua sendo a fonte das páginas: ler a carteira custa
+O(posições), por maior que seja o histórico. `carteira_versoes` guarda, por
+usuário, o id da última transação aplicada; ela serve de marca d'água para
+aplicar só o que falta e de versão da carteira para caches.
+
+Convenções de `qtd` e `preco` por tipo:
+    compra/venda   cotas e preço unitário
+    desdobramento  fator em `qtd` (2 = cada cota vira duas; 0.5 = grupamento)
+    dividendo      cotas com direito e valor por cota
+    ajuste         quantidade e preço médio absolutos (edição manual)
+
+O saldo de abertura (posições que já existiam antes do livro) é um ajuste
+datado de `DATA_ABERTURA`, antes de qualquer negociação possível: compras e
+vendas retroativas são aplicadas depois dele, e não apagadas por ele.
+"""
+from datetime import date, datetime
+
+TIPOS = ('compra', 'venda', 'desdobramento', 'dividendo', 'ajuste')
+
+# Abaixo disso a posição é considerada zerada (arredondamento de frações)
+EPSILON_QTD = 1e-9
+
+# Data do saldo de abertura semeado pela migração 2
+DATA_ABERTURA = '1900-01-01'
+
+def versao_carteira(conn, user_id) -> int:
+    row = conn.execute("SELECT versao FROM carteira_versoes WHERE user_id = ?", (user_id,)).fetchone()
+    return row[0] if row else 0
+
+def _carregar_posicao(conn, user_id, ticker):
+    row = conn.execute(
+        "SELECT qtd, pm, setor, lucro_realizado, proventos, ultima_data FROM ativos WHERE user_id = ? AND ticker = ?",
+        (user_id, ticker)
+    ).fetchone()
+    if row is None:
+        return None
+    return {'qtd': row[0], 'pm': row[1], 'setor': row[2], 'lucro_realizado': row[3],
+            'proventos': row[4], 'ultima_data': row[5]}
+
+def posicao_vazia(setor):
+    return {'qtd': 0.0, 'pm': 0.0, 'setor': setor or 'Ações', 'lucro_realizado': 0.0,
+            'proventos': 0.0, 'ultima_data': None}
+
+class VendaDescoberta(ValueError):
+    """Venda maior que a posição na data do evento."""
+
+def aplicar_evento(posicao, tipo, qtd, preco, taxas, setor):
+    """Aplica um evento à posição (in-place). Retorna o resultado realizado, se for uma venda.
+
+    Levanta `VendaDescoberta` se a venda for maior que a posição.
+    """
+    resultado = None
+    if tipo == 'compra':
+        total = posicao['qtd'] + qtd
+        posicao['pm'] = (posicao['qtd'] * posicao['pm'] + qtd * preco + taxas) / total
+        posicao['qtd'] = total
+    elif tipo == 'venda':
+        if qtd > posicao['qtd'] + EPSILON_QTD:
+            raise VendaDescoberta(f"venda de {qtd:g} cotas com posição de {posicao['qtd']:g}")
+        # Só absorve a diferença de arredondamento
+        qtd = min(qtd, posicao['qtd'])
+        resultado = qtd * (preco - posicao['pm']) - taxas
+        posicao['lucro_realizado'] += resultado
+        posicao['qtd'] -= qtd
+        if posicao['qtd'] < EPSILON_QTD:
+            posicao['qtd'], posicao['pm'] = 0.0, 0.0
+    elif tipo == 'desdobramento':
+        posicao['qtd'] *= qtd
+        posicao['pm'] /= qtd
+    elif tipo == 'dividendo':
+        posicao['proventos'] += qtd * preco
+    elif tipo == 'ajuste':
+        posicao['qtd'], posicao['pm'] = qtd, preco
+    if setor:
+        posicao['setor'] = setor
+    return resultado
+
+def _gravar_posicao(conn, user_id, ticker, posicao):
+    conn.execute(
+        """INSERT INTO ativos (user_id, ticker, qtd, pm, setor, lucro_realizado, proventos, ultima_data)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+           ON CONFLICT(user_id, ticker) DO UPDATE SET
+               qtd = excluded.qtd, pm = excluded.pm, setor = excluded.setor,
+               lucro_realizado = excluded.lucro_realizado, proventos = excluded.proventos,
+               ultima_data = excluded.ultima_data""",
+        (user_id, ticker, posicao['qtd'], posicao['pm'], posicao['setor'],
+         posicao['lucro_realizado'], posicao['proventos'], posicao['ultima_data'])
+    )
+
+def _reconstruir_ticker(conn, user_id, ticker, ate_id):
+    """Refaz a posição de um ticker na ordem (data, id) — só quando chega um evento retroativo."""
+    posicao = posicao_vazia(None)
+    eventos = conn.execute(
+        """SELECT id, data, tipo, qtd, preco, taxas, setor FROM transacoes
+           WHERE user_id = ? AND ticker = ? AND id <= ? ORDER BY data, id""",
+        (user_id, ticker, ate_id)
+    ).fetchall()
+    resultados = []
+    for id_, data, tipo, qtd, preco, taxas, setor in eventos:
+        resultado = aplicar_evento(posicao, tipo, qtd, preco, taxas, setor)
+        posicao['ultima_data'] = data
+        if resultado is not None:
+            resultados.append((resultado, id_))
+    conn.executemany("UPDATE transacoes SET resultado = ? WHERE id = ?", resultados)
+    return posicao
+
+def materializar(conn, user_id) -> int:
+    """Aplica às posições as transações do usuário ainda não aplicadas. Retorna a nova versão.
+
+    Eventos em ordem cronológica custam O(1) cada; um evento com data
+    anterior ao último já aplicado naquele ticker refaz apenas aquele ticker,
+    o que também revalida as vendas posteriores a ele.
+    """
+    versao = versao_carteira(conn, user_id)
+    pendentes = conn.execute(
+        """SELECT id, ticker, data, tipo, qtd, preco, taxas, setor FROM transacoes
+           WHERE user_id = ? AND id > ? ORDER BY id""",
+        (user_id, versao)
+    ).fetchall()
+    if not pendentes:
+        return versao
+    posicoes = {}
+    for id_, ticker, data, tipo, qtd, preco, taxas, setor in pendentes:
+        if ticker not in posicoes:
+            posicoes[ticker] = _carregar_posicao(conn, user_id, ticker) or posicao_vazia(setor)
+        posicao = posicoes[ticker]
+        if posicao['ultima_data'] and data < posicao['ultima_data']:
+            posicoes[ticker] = _reconstruir_ticker(conn, user_id, ticker, id_)
+        else:
+            resultado = aplicar_evento(posicao, tipo, qtd, preco, taxas, setor)
+            posicao['ultima_data'] = data
+            if resultado is not None:
+                conn.execute("UPDATE transacoes SET resultado = ? WHERE id = ?", (resultado, id_))
+        versao = id_
+    for ticker, posicao in posicoes.items():
+        _gravar_posicao(conn, user_id, ticker, posicao)
+    conn.execute(
+        """INSERT INTO carteira_versoes (user_id, versao) VALUES (?, ?)
+           ON CONFLICT(user_id) DO UPDATE SET versao = excluded.versao""",
+        (user_id, versao)
+    )
+    return versao
+
+def registrar_transacao(conn, user_id, ticker, tipo, qtd, preco=0.0, data=None, taxas=0.0, setor=None) -> int:
+    """Grava o evento e atualiza a posição na mesma transação do banco. Retorna o id do evento.
+
+    A venda é validada contra a posição na data dela (e as vendas seguintes
+    contra a posição já com ela), dentro da transação de escrita: uma venda
+    que a posição não cobre levanta `ValueError` e nada é gravado.
+    """
+    if tipo not in TIPOS:
+        raise ValueError(f"Tipo de transação inválido: {tipo}")
+    ticker = ticker.upper().strip()
+    data = (data or date.today()).isoformat() if not isinstance(data, str) else data
+    if tipo in ('compra', 'venda', 'desdobramento') and qtd <= 0:
+        raise ValueError("Quantidade deve ser maior que zero")
+    # IMMEDIATE: a posição lida para validar não muda até o commit de quem chamou;
+    # dentro de uma transação já aberta, o savepoint desfaz só este evento
+    propria = not conn.in_transaction
+    conn.execute("BEGIN IMMEDIATE" if propria else "SAVEPOINT registrar_transacao")
+    try:
+        if tipo == 'dividendo' and not qtd:
+            posicao = _carregar_posicao(conn, user_id, ticker)
+            qtd = posicao['qtd'] if posicao else 0.0
+        cur = conn.execute(
+            """INSERT INTO transacoes (user_id, ticker, tipo, data, qtd, preco, taxas, setor, criado_em)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            (user_id, ticker, tipo, data, float(qtd), float(preco), float(taxas), setor,
+             datetime.now().isoformat(timespec='seconds'))
+        )
+        materializar(conn, user_id)
+    except Exception as e:
+        if propria:
+            conn.rollback()
+        else:
+            conn.execute("ROLLBACK TO registrar_transacao")
+            conn.execute("RELEASE registrar_transacao")
+        if isinstance(e, VendaDescoberta):
+            raise ValueError(f"Quantidade vendida maior que a posição em {ticker} em {data}") from None
+        raise
+    if not propria:
+        conn.execute("RELEASE registrar_transacao")
+    return cur.lastrowid
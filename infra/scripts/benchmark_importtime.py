@@ -0,0 +1,81 @@
+"""Benchmark de cold start: tempo de import até a tela de login.
+
+Uso (a partir da raiz do projeto):
+    python infra/scripts/benchmark_importtime.py [--repeticoes 5] [--paginas]
+
+Roda cada cenário num interpretador novo com `python -X importtime` e soma
+o tempo próprio de todos os módulos importados (a mediana das repetições).
+"login" é o que o `app.py` importa antes da autenticação; "monolito" são os
+imports de topo do `app.py` de antes da divisão em `paginas/`. Com
+`--paginas`, mede também o import de cada página sobre o login.
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+LOGIN = ["streamlit", "modules.database", "modules.auth", "services.auditoria_service"]
+
+MONOLITO = [
+    "streamlit", "pandas", "yfinance", "plotly.express", "plotly.graph_objects", "numpy",
+    "sqlite3", "io", "streamlit_authenticator", "services.cache_mercado", "services.preco_service",
+    "services.risco_service", "services.evolucao_service", "src.backtesting",
+    "services.analise_service", "services.scanner_service", "services.alerta_service",
+    "services.auditoria_service", "services.simulacao_service", "config.settings",
+    "database.pool", "database.migracoes", "database.transacoes",
+]
+
+PAGINAS = ["dashboard", "montar_carteira", "evolucao", "alertas", "imposto", "preco_teto",
+           "analise_avancada", "gestao", "bola_neve", "balanceamento", "scanner"]
+
+# Módulos que a tela de login não deveria carregar (o próprio streamlit já
+# importa plotly.io e plotly.graph_objects; plotly.express é o caro)
+PESADOS = ["yfinance", "plotly.express", "scipy"]
+
+LINHA = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+def medir(modulos):
+    """(tempo total em ms, nomes de todos os módulos importados) de um interpretador novo."""
+    codigo = "; ".join(f"import {m}" for m in modulos)
+    saida = subprocess.run([sys.executable, "-X", "importtime", "-c", codigo], cwd=RAIZ,
+                           capture_output=True, text=True)
+    if saida.returncode != 0:
+        raise RuntimeError(saida.stderr.strip().splitlines()[-1])
+    total, nomes = 0, set()
+    for linha in saida.stderr.splitlines():
+        m = LINHA.match(linha)
+        if m:
+            total += int(m.group(1))
+            nomes.add(m.group(4))
+    return total / 1000, nomes
+
+def cenario(rotulo, modulos, repeticoes):
+    tempos, nomes = [], set()
+    for _ in range(repeticoes):
+        tempo, nomes = medir(modulos)
+        tempos.append(tempo)
+    pesados = [p for p in PESADOS if p in nomes]
+    print(f"{rotulo:<28} {statistics.median(tempos):>9.1f} ms {len(nomes):>6} módulos"
+          f"   pesados: {', '.join(pesados) or '-'}")
+    return statistics.median(tempos)
+
+def main():
+    parser = argparse.ArgumentParser(description="Tempo de import do app (python -X importtime)")
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--paginas", action="store_true", help="mede também cada página")
+    args = parser.parse_args()
+
+    print(f"{'cenário':<28} {'mediana':>12} {'':>13}")
+    monolito = cenario("monolito (antes)", MONOLITO, args.repeticoes)
+    login = cenario("login (app.py)", LOGIN, args.repeticoes)
+    print(f"\nLogin {monolito / login:.1f}x mais rápido para importar ({monolito - login:.0f} ms a menos)\n")
+    if args.paginas:
+        for pagina in PAGINAS:
+            cenario(f"login + paginas.{pagina}", LOGIN + [f"paginas.{pagina}"], args.repeticoes)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Benchmark das consultas das páginas antes e depois das migrações de índices.
+
+Uso (a partir da raiz do projeto):
+    python infra/scripts/benchmark_indices.py [--usuarios 10000] [--posicoes 100]
+
+Cria um banco temporário com o schema original (versão 0), povoa com
+`usuarios` x `posicoes` ativos (1M no padrão), alertas e metas, mede as
+consultas de `modules.database`, aplica `database.migracoes` e mede de novo.
+"""
+import argparse
+import logging
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import modules.database as db  # noqa: E402
+from database.migracoes import aplicar_migracoes  # noqa: E402
+from database.pool import obter_pool  # noqa: E402
+
+logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+SETORES = ["Ações", "FII Papel", "FII Tijolo", "ETF", "Renda Fixa"]
+
+def povoar(usuarios, posicoes):
+    rng = random.Random(42)
+    conn = db.get_connection()
+    conn.executemany(
+        "INSERT INTO usuarios (id, username, nome, senha_hash) VALUES (?, ?, ?, '')",
+        ((u, f"user{u}", f"Usuário {u}") for u in range(1, usuarios + 1))
+    )
+    conn.executemany(
+        "INSERT INTO ativos (user_id, ticker, qtd, pm, setor) VALUES (?, ?, ?, ?, ?)",
+        ((u, f"TICK{t}", rng.randint(1, 500), rng.uniform(5, 100), rng.choice(SETORES))
+         for u in range(1, usuarios + 1) for t in range(posicoes))
+    )
+    conn.executemany(
+        "INSERT INTO metas_alocacao (user_id, classe, percentual) VALUES (?, ?, 20)",
+        ((u, s) for u in range(1, usuarios + 1) for s in SETORES)
+    )
+    # Metade dos alertas já disparados/inativos
+    conn.executemany(
+        "INSERT INTO alertas (id, user_id, ticker, tipo, preco, ativo, criado_em) VALUES (?, ?, ?, 'acima', 10, ?, '')",
+        ((f"{u}_{a}", u, f"TICK{a}", a % 2) for u in range(1, usuarios + 1) for a in range(6))
+    )
+    conn.commit()
+    conn.close()
+
+def medir(funcao, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos) * 1000
+
+def rodada(titulo, usuarios, posicoes, repeticoes):
+    rng = random.Random(7)
+    casos = [
+        ("carregar_ativos", lambda: db.carregar_ativos(rng.randint(1, usuarios))),
+        ("carregar_metas", lambda: db.carregar_metas(rng.randint(1, usuarios))),
+        ("carregar_alertas", lambda: db.carregar_alertas(rng.randint(1, usuarios))),
+        ("atualizar_ativo", lambda: db.atualizar_ativo(rng.randint(1, usuarios), f"TICK{rng.randrange(posicoes)}",
+                                                       rng.randint(1, 500), 10.0, "Ações")),
+    ]
+    resultado = {}
+    print(f"\n== {titulo} ==")
+    for nome, funcao in casos:
+        resultado[nome] = medir(funcao, repeticoes)
+        print(f"{nome:<20}{resultado[nome]:>10.3f} ms (mediana de {repeticoes})")
+    return resultado
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--usuarios", type=int, default=10_000)
+    parser.add_argument("--posicoes", type=int, default=100)
+    parser.add_argument("--repeticoes-antes", type=int, default=30)
+    parser.add_argument("--repeticoes-depois", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db.DB_PATH = os.path.join(tmp, "benchmark.db")
+        # Schema original, sem as migrações
+        migrar = db.aplicar_migracoes
+        db.aplicar_migracoes = lambda conn: 0
+        db.init_db()
+        db.aplicar_migracoes = migrar
+
+        inicio = time.perf_counter()
+        povoar(args.usuarios, args.posicoes)
+        print(f"{args.usuarios * args.posicoes:,} posições povoadas em {time.perf_counter() - inicio:.1f}s")
+
+        antes = rodada("antes (schema v0)", args.usuarios, args.posicoes, args.repeticoes_antes)
+
+        conn = db.get_connection()
+        inicio = time.perf_counter()
+        versao = aplicar_migracoes(conn)
+        conn.close()
+        print(f"\nMigrações até a versão {versao} em {time.perf_counter() - inicio:.1f}s")
+
+        depois = rodada(f"depois (schema v{versao})", args.usuarios, args.posicoes, args.repeticoes_depois)
+        print()
+        for nome in antes:
+            print(f"{nome:<20}{antes[nome] / depois[nome]:>8.0f}x mais rápido")
+        obter_pool(db.DB_PATH).fechar()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Micro-benchmark do CRUD: conexão nova a cada chamada x pool de conexões (WAL).
+
+Uso (a partir da raiz do projeto):
+    python infra/scripts/benchmark_pool.py [--usuarios 200] [--repeticoes 2000] [--threads 8]
+
+Cada estratégia usa um banco próprio num diretório temporário, com os mesmos
+dados. Mede a latência média das funções de `modules.database` e a vazão de
+leituras concorrentes enquanto uma thread grava.
+"""
+import argparse
+import logging
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import modules.database as db  # noqa: E402
+from database.pool import obter_pool  # noqa: E402
+
+# st.success/st.error fora do `streamlit run` só geram avisos
+logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+SETORES = ["Ações", "FIIs", "ETFs", "Renda Fixa"]
+
+def conexao_por_chamada():
+    return sqlite3.connect(db.DB_PATH, check_same_thread=False)
+
+def conexao_do_pool():
+    return obter_pool(db.DB_PATH).conectar()
+
+def preparar(caminho, usuarios):
+    db.DB_PATH = caminho
+    db.get_connection = conexao_por_chamada
+    db.init_db()
+    conn = sqlite3.connect(caminho)
+    rng = random.Random(42)
+    conn.executemany(
+        "INSERT INTO ativos (user_id, ticker, qtd, pm, setor) VALUES (?, ?, ?, ?, ?)",
+        [(u, f"TICK{t}", rng.randint(1, 500), rng.uniform(5, 100), rng.choice(SETORES))
+         for u in range(1, usuarios + 1) for t in range(15)]
+    )
+    conn.executemany(
+        "INSERT INTO alertas (id, user_id, ticker, tipo, preco, ativo, criado_em) VALUES (?, ?, ?, ?, ?, 1, '')",
+        [(f"{u}_{t}", u, f"TICK{t}", "acima", 10.0) for u in range(1, usuarios + 1) for t in range(3)]
+    )
+    conn.commit()
+    conn.close()
+
+def medir(nome, funcao, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return nome, statistics.mean(tempos) * 1e6, statistics.quantiles(tempos, n=100)[94] * 1e6
+
+def concorrencia(threads, duracao, usuarios):
+    leituras = [0] * threads
+    parar = threading.Event()
+
+    def leitor(i):
+        rng = random.Random(i)
+        while not parar.is_set():
+            db.carregar_alertas(rng.randint(1, usuarios))
+            leituras[i] += 1
+
+    def escritor():
+        rng = random.Random(99)
+        while not parar.is_set():
+            db.salvar_alerta(rng.randint(1, usuarios), "TICK0", "abaixo", rng.uniform(1, 50))
+
+    trabalhadores = [threading.Thread(target=leitor, args=(i,)) for i in range(threads)]
+    trabalhadores.append(threading.Thread(target=escritor))
+    for t in trabalhadores:
+        t.start()
+    time.sleep(duracao)
+    parar.set()
+    for t in trabalhadores:
+        t.join()
+    return sum(leituras) / duracao
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--usuarios", type=int, default=200)
+    parser.add_argument("--repeticoes", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--duracao", type=float, default=3.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for estrategia, fabrica in [("conexão por chamada", conexao_por_chamada), ("pool (WAL)", conexao_do_pool)]:
+            caminho = os.path.join(tmp, f"{fabrica.__name__}.db")
+            preparar(caminho, args.usuarios)
+            db.get_connection = fabrica
+            rng = random.Random(7)
+            casos = [
+                ("carregar_ativos", lambda: db.carregar_ativos(rng.randint(1, args.usuarios))),
+                ("carregar_alertas", lambda: db.carregar_alertas(rng.randint(1, args.usuarios))),
+                ("carregar_metas", lambda: db.carregar_metas(rng.randint(1, args.usuarios))),
+                ("atualizar_ativo", lambda: db.atualizar_ativo(rng.randint(1, args.usuarios), "TICK1",
+                                                               rng.randint(1, 500), 10.0, "Ações")),
+            ]
+            print(f"\n== {estrategia} ==")
+            print(f"{'operação':<20}{'média (µs)':>12}{'p95 (µs)':>12}")
+            for nome, media, p95 in (medir(n, f, args.repeticoes) for n, f in casos):
+                print(f"{nome:<20}{media:>12.1f}{p95:>12.1f}")
+            vazao = concorrencia(args.threads, args.duracao, args.usuarios)
+            print(f"leituras/s com {args.threads} leitores + 1 escritor: {vazao:,.0f}")
+            obter_pool(caminho).fechar()
+
+if __name__ == "__main__":
+    main()
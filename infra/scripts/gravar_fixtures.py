@@ -0,0 +1,127 @@
+"""Grava os históricos OHLCV + proventos usados pela suíte de benchmarks.
+
+Uso (a partir da raiz do projeto):
+    python infra/scripts/gravar_fixtures.py [--periodo 5y] [TICKER ...]
+    python infra/scripts/gravar_fixtures.py --sintetico [--semente 42]
+
+Cada ticker vira um `data/raw/fixtures/<ticker_yf>.parquet` no formato de
+`Ticker.history(auto_adjust=False)` (Open, High, Low, Close, Adj Close,
+Volume, Dividends, Stock Splits; índice com fuso), e `manifest.json`
+registra a origem, o período e o arquivo de cada ticker. Sem acesso ao
+Yahoo, `--sintetico` gera séries determinísticas no mesmo formato: um
+fator de mercado comum, um fator por classe, proventos trimestrais (ações)
+ou mensais (FIIs), o câmbio USDBRL=X e o 'Adj Close' descontando os
+proventos como o Yahoo faz. As gravações também alimentam o provedor
+"replay" (PROVEDOR_MERCADO=replay, ver services/provedor_mercado.py).
+"""
+import argparse
+import json
+import os
+import re
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from config.settings import SCANNER_ACOES, SCANNER_FIIS  # noqa: E402
+from services.preco_service import formatar_ticker_yf  # noqa: E402
+
+DESTINO = Path(__file__).resolve().parents[2] / "data" / "raw" / "fixtures"
+
+TICKERS = SCANNER_ACOES[:6] + SCANNER_FIIS[:4] + ["BOVA11", "IVVB11", "^BVSP", "USDBRL=X"]
+
+COLUNAS = ['Open', 'High', 'Low', 'Close', 'Adj Close', 'Volume', 'Dividends', 'Stock Splits']
+
+def gravar_yahoo(tickers, periodo):
+    import yfinance as yf
+    gravados = {}
+    for ticker in tickers:
+        ticker_yf = formatar_ticker_yf(ticker)
+        hist = yf.Ticker(ticker_yf).history(period=periodo, auto_adjust=False)
+        if hist.empty:
+            print(f"{ticker_yf}: sem dados, ignorado")
+            continue
+        gravados[ticker_yf] = hist.reindex(columns=COLUNAS, fill_value=0.0)
+    return gravados
+
+def _classe(ticker):
+    if ticker in SCANNER_FIIS:
+        return 'fii'
+    if ticker.endswith('=X'):
+        return 'cambio'
+    if ticker.startswith('^') or ticker in ("BOVA11", "IVVB11"):
+        return 'indice'
+    return 'acao'
+
+def gerar_sinteticos(tickers, periodo, semente):
+    rng = np.random.default_rng(semente)
+    anos = int(periodo[:-1]) if periodo.endswith("y") else 5
+    datas = pd.bdate_range(end=pd.Timestamp("2026-09-30"), periods=anos * 252, tz="America/Sao_Paulo")
+    n = len(datas)
+    mercado = rng.normal(0.0003, 0.011, n)
+    fatores = {c: rng.normal(0.0, 0.006, n) for c in ('acao', 'fii', 'indice')}
+    gravados = {}
+    for ticker in tickers:
+        classe = _classe(ticker)
+        beta = {'acao': rng.uniform(0.7, 1.4), 'fii': rng.uniform(0.2, 0.5), 'indice': 1.0, 'cambio': 0.0}[classe]
+        ruido = {'acao': 0.014, 'fii': 0.007, 'indice': 0.002, 'cambio': 0.006}[classe]
+        retornos = beta * mercado + fatores.get(classe, 0.0) + rng.normal(0.0, ruido, n)
+        inicial = rng.uniform(8, 120) if classe != 'cambio' else 5.0
+        close = np.round(inicial * np.exp(np.cumsum(retornos)), 2)
+        abertura = np.round(close * (1 + rng.normal(0, 0.004, n)), 2)
+        amplitude = np.abs(rng.normal(0, 0.008, n)) * close
+        high = np.round(np.maximum(close, abertura) + amplitude, 2)
+        low = np.round(np.minimum(close, abertura) - amplitude, 2)
+
+        dividendos = np.zeros(n)
+        if classe in ('acao', 'fii'):
+            passo = 21 if classe == 'fii' else 63
+            dy = rng.uniform(0.08, 0.12) if classe == 'fii' else rng.uniform(0.03, 0.09)
+            pagamentos = np.arange(rng.integers(5, passo), n, passo)
+            dividendos[pagamentos] = np.round(close[pagamentos] * dy * passo / 252, 4)
+        # Fator de ajuste do Yahoo: cada provento reduz os preços anteriores à data-com
+        fator = np.ones(n)
+        for i in np.flatnonzero(dividendos):
+            fator[:i] *= 1 - dividendos[i] / close[i - 1]
+        gravados[formatar_ticker_yf(ticker)] = pd.DataFrame({
+            'Open': abertura, 'High': high, 'Low': low, 'Close': close,
+            'Adj Close': np.round(close * fator, 6),
+            'Volume': rng.integers(10_000, 5_000_000, n).astype(float) if classe in ('acao', 'fii') else 0.0,
+            'Dividends': dividendos, 'Stock Splits': 0.0
+        }, index=pd.DatetimeIndex(datas, name='Date'))
+    return gravados
+
+def main():
+    parser = argparse.ArgumentParser(description="Grava os históricos usados pelos benchmarks")
+    parser.add_argument("tickers", nargs="*", default=TICKERS)
+    parser.add_argument("--periodo", default="5y")
+    parser.add_argument("--sintetico", action="store_true", help="gera séries determinísticas, sem rede")
+    parser.add_argument("--semente", type=int, default=42)
+    args = parser.parse_args()
+
+    if args.sintetico:
+        gravados = gerar_sinteticos(args.tickers, args.periodo, args.semente)
+    else:
+        gravados = gravar_yahoo(args.tickers, args.periodo)
+    DESTINO.mkdir(parents=True, exist_ok=True)
+    arquivos = {}
+    for ticker_yf, hist in gravados.items():
+        # ^BVSP etc. viram nomes de arquivo seguros, como no HistoricoStore
+        arquivos[ticker_yf] = re.sub(r'[^A-Za-z0-9._-]', '_', ticker_yf) + ".parquet"
+        hist.astype({c: 'float64' for c in COLUNAS}).to_parquet(DESTINO / arquivos[ticker_yf])
+    manifesto = {
+        'origem': 'sintetico' if args.sintetico else 'yahoo',
+        'semente': args.semente if args.sintetico else None,
+        'periodo': args.periodo,
+        'gravado_em': datetime.now().isoformat(timespec='seconds'),
+        'arquivos': dict(sorted(arquivos.items()))
+    }
+    (DESTINO / "manifest.json").write_text(json.dumps(manifesto, indent=2, ensure_ascii=False) + "\n")
+    print(f"{len(gravados)} históricos gravados em {DESTINO}")
+
+if __name__ == "__main__":
+    main()
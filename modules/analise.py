@@ -1,96 +1,59 @@
 # Modules/analise.py
-import yfinance as yf
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
 from datetime import datetime
 import streamlit as st
+from services.cache_mercado import obter_cache_mercado
+from services.dividendos_service import dividendos_service
+from services.preco_service import PrecoService
+from services.risco_service import RiscoService
+from services.evolucao_service import EvolucaoService
+from modules.database import carregar_livro, versao_livro
+from services.telemetria_service import cronometrar
 
-@st.cache_data(ttl=300)
 def pegar_preco(ticker):
     """Busca preço atual do ativo. Retorna (preco, status, msg)."""
-    try:
-        if ticker[-1].isdigit():
-            ticker_yf = f"{ticker}.SA"
-        else:
-            ticker_yf = ticker
-        acao = yf.Ticker(ticker_yf)
-        hist = acao.history(period="2d")
-        if hist.empty:
-            return None, "erro", "Sem dados disponíveis"
-        preco = hist['Close'].iloc[-1]
-        ultima_data = hist.index[-1].date()
-        hoje = datetime.now().date()
-        if ultima_data == hoje:
-            return preco, "ok", "Atualizado"
-        else:
-            return preco, "aviso", f"Último: {ultima_data.strftime('%d/%m')}"
-    except Exception as e:
-        return None, "erro", str(e)
+    return obter_cache_mercado().cotacao(ticker)
 
 def pegar_preco_simples(ticker):
     preco, _, _ = pegar_preco(ticker)
     return preco if preco else 0.0
 
-@st.cache_data(ttl=3600)
+@cronometrar("mercado")
+def pegar_precos(tickers):
+    """Busca o preço atual de vários ativos num único download. Retorna {ticker: (preco, status, msg)}."""
+    return obter_cache_mercado().cotacoes(tickers)
+
+@cronometrar("mercado")
 def buscar_dados_historicos(ticker, periodo="5y"):
+    """Métricas históricas do ativo, compartilhadas entre sessões (somente leitura)."""
+    return obter_cache_mercado().historico(ticker, periodo, _carregar_dados_historicos)
+
+def _carregar_dados_historicos(ticker, periodo):
     """Busca dados históricos e retorna um dicionário com métricas."""
     try:
         if ticker[-1].isdigit():
             ticker_yf = f"{ticker}.SA"
         else:
             ticker_yf = ticker
-        acao = yf.Ticker(ticker_yf)
-        hist = acao.history(period=periodo)
+        # Histórico persistido em disco; métricas mantidas incrementalmente a cada barra nova
+        hist, estatisticas = PrecoService.buscar_estatisticas(ticker_yf, periodo)
         if hist.empty:
-            hist = acao.history(period="max")
-            if hist.empty:
-                return None
-        preco_atual = hist['Close'].iloc[-1]
-        if len(hist) >= 252:
-            preco_medio_12m = hist['Close'].tail(252).mean()
-        else:
-            preco_medio_12m = hist['Close'].mean()
-        preco_medio_5y = hist['Close'].mean()
-        percentil_20 = hist['Close'].quantile(0.20)
-        percentil_80 = hist['Close'].quantile(0.80)
-        minimo_5y = hist['Close'].min()
-        maximo_5y = hist['Close'].max()
-        if len(hist) > 252:
-            preco_1ano_atras = hist['Close'].iloc[-252]
-            variacao_anual = (preco_atual / preco_1ano_atras - 1) * 100
-        else:
-            variacao_anual = 0
-        try:
-            dividends = acao.dividends.tail(24)
-            if not dividends.empty:
-                dividends_12m = dividends.tail(12).sum()
-                if len(dividends) < 12:
-                    dividends_12m = dividends.mean() * 12
-                if preco_atual > 0:
-                    dy = (dividends_12m / preco_atual) * 100
-                else:
-                    dy = None
-            else:
-                dy = None
-        except:
-            dy = None
+            return None
+        preco_atual = hist['Close'].iloc[-1]  # preço de fechamento real para exibição
+        dy = dividendos_service.dividend_yield(ticker, preco_atual)
         return {
             'ticker': ticker,
             'preco_atual': preco_atual,
-            'preco_medio_12m': preco_medio_12m,
-            'preco_medio_5y': preco_medio_5y,
-            'percentil_20': percentil_20,
-            'percentil_80': percentil_80,
-            'minimo_5y': minimo_5y,
-            'maximo_5y': maximo_5y,
-            'variacao_anual': variacao_anual,
+            **estatisticas,
             'dividend_yield': dy,
             'dados': hist
         }
     except Exception as e:
         return None
 
+@cronometrar("analise")
 def analisar_preco_ativo(ticker, dados_historicos):
     """Retorna (status, mensagem, cor, explicacao, pontuacao)."""
     if not dados_historicos:
@@ -160,30 +123,61 @@ def analisar_preco_ativo(ticker, dados_historicos):
         status = "oportunidade"
         mensagem = "🔥 OPORTUNIDADE! Muito barato"
         cor = "#00FF00"
-        explicacao = "### ✅ OPORTUNIDADE DE COMPRA!\n\n" + "".join([f"• {m}\n" for m in motivos[:4]]) + f"\n📊 **Preço atual:** R$ {preco:.2f}\n📊 **Média 12m:** R$ {media_12m:.2f}\n📊 **Mínima 5 anos:** R$ {minimo:.2f}\n📊 **Máxima 5 anos:** R$ {maximo:.2f}\n" + (f"💰 **Dividend Yield:** {dados_historicos['dividend_yield']:.2f}%\n" if dados_historicos['dividend_yield'] else "") + f"\n💡 **RECOMENDAÇÃO:** COMPRAR - Ótimo ponto de entrada!" + alerta_risco
+        explicacao = ("### ✅ OPORTUNIDADE DE COMPRA!\n\n" +
+                      "".join([f"• {m}\n" for m in motivos[:4]]) +
+                      f"\n📊 **Preço atual:** R$ {preco:.2f}\n"
+                      f"📊 **Média 12m:** R$ {media_12m:.2f}\n"
+                      f"📊 **Mínima 5 anos:** R$ {minimo:.2f}\n"
+                      f"📊 **Máxima 5 anos:** R$ {maximo:.2f}\n")
+        if dados_historicos['dividend_yield']:
+            explicacao += f"💰 **Dividend Yield:** {dados_historicos['dividend_yield']:.2f}%\n"
+        explicacao += f"\n💡 **RECOMENDAÇÃO:** COMPRAR - Ótimo ponto de entrada!" + alerta_risco
     elif pontuacao <= -20:
         status = "barato"
         mensagem = "👍 Barato - Bom momento"
         cor = "#90EE90"
-        explicacao = "### ✅ PREÇO ATRATIVO\n\n" + "".join([f"• {m}\n" for m in motivos[:3]]) + f"\n📊 **Preço atual:** R$ {preco:.2f}\n📊 **Média 12m:** R$ {media_12m:.2f}\n" + (f"💰 **Dividend Yield:** {dados_historicos['dividend_yield']:.2f}%\n" if dados_historicos['dividend_yield'] else "") + f"\n💡 **RECOMENDAÇÃO:** Pode comprar - preço justo" + alerta_risco
+        explicacao = ("### ✅ PREÇO ATRATIVO\n\n" +
+                      "".join([f"• {m}\n" for m in motivos[:3]]) +
+                      f"\n📊 **Preço atual:** R$ {preco:.2f}\n"
+                      f"📊 **Média 12m:** R$ {media_12m:.2f}\n")
+        if dados_historicos['dividend_yield']:
+            explicacao += f"💰 **Dividend Yield:** {dados_historicos['dividend_yield']:.2f}%\n"
+        explicacao += f"\n💡 **RECOMENDAÇÃO:** Pode comprar - preço justo" + alerta_risco
     elif pontuacao <= 0:
         status = "neutro"
         mensagem = "⚖️ Preço justo"
         cor = "#D4AF37"
-        explicacao = "### ⚖️ PREÇO JUSTO\n\n" + "".join([f"• {m}\n" for m in motivos[:2]]) + f"\n📊 **Preço atual:** R$ {preco:.2f}\n📊 **Média 12m:** R$ {media_12m:.2f}\n" + f"\n💡 **RECOMENDAÇÃO:** Compra neutra - nem barato nem caro" + alerta_risco
+        explicacao = ("### ⚖️ PREÇO JUSTO\n\n" +
+                      "".join([f"• {m}\n" for m in motivos[:2]]) +
+                      f"\n📊 **Preço atual:** R$ {preco:.2f}\n"
+                      f"📊 **Média 12m:** R$ {media_12m:.2f}\n"
+                      f"\n💡 **RECOMENDAÇÃO:** Compra neutra - nem barato nem caro" + alerta_risco)
     elif pontuacao <= 20:
         status = "atencao"
         mensagem = "⚠️ Atenção - Acima da média"
         cor = "#FFA500"
-        explicacao = "### ⚠️ PREÇO ELEVADO\n\n" + "".join([f"• {m}\n" for m in motivos[:3]]) + f"\n📊 **Preço atual:** R$ {preco:.2f}\n📊 **Média 12m:** R$ {media_12m:.2f}\n📊 **Máxima 5 anos:** R$ {maximo:.2f}\n" + f"\n💡 **RECOMENDAÇÃO:** Comprar só se necessário - preço salgado" + alerta_risco
+        explicacao = ("### ⚠️ PREÇO ELEVADO\n\n" +
+                      "".join([f"• {m}\n" for m in motivos[:3]]) +
+                      f"\n📊 **Preço atual:** R$ {preco:.2f}\n"
+                      f"📊 **Média 12m:** R$ {media_12m:.2f}\n"
+                      f"📊 **Máxima 5 anos:** R$ {maximo:.2f}\n"
+                      f"\n💡 **RECOMENDAÇÃO:** Comprar só se necessário - preço salgado" + alerta_risco)
     else:
         status = "caro"
         mensagem = "❌ CARO! Evite comprar"
         cor = "#FF4444"
         preco_ideal = media_12m * 0.9
-        explicacao = "### ❌ PREÇO CARO DEMAIS!\n\n" + "".join([f"• {m}\n" for m in motivos[:4]]) + f"\n📊 **Preço atual:** R$ {preco:.2f}\n📊 **Média 12m:** R$ {media_12m:.2f}\n📊 **Máxima 5 anos:** R$ {maximo:.2f}\n" + (f"💰 **Dividend Yield:** {dados_historicos['dividend_yield']:.2f}%\n" if dados_historicos['dividend_yield'] else "") + f"\n💡 **RECOMENDAÇÃO:** NÃO COMPRAR AGORA!\n   Espere o preço cair para pelo menos R$ {preco_ideal:.2f}" + alerta_risco
+        explicacao = ("### ❌ PREÇO CARO DEMAIS!\n\n" +
+                      "".join([f"• {m}\n" for m in motivos[:4]]) +
+                      f"\n📊 **Preço atual:** R$ {preco:.2f}\n"
+                      f"📊 **Média 12m:** R$ {media_12m:.2f}\n"
+                      f"📊 **Máxima 5 anos:** R$ {maximo:.2f}\n")
+        if dados_historicos['dividend_yield']:
+            explicacao += f"💰 **Dividend Yield:** {dados_historicos['dividend_yield']:.2f}%\n"
+        explicacao += f"\n💡 **RECOMENDAÇÃO:** NÃO COMPRAR AGORA!\n   Espere o preço cair para pelo menos R$ {preco_ideal:.2f}" + alerta_risco
     return status, mensagem, cor, explicacao, pontuacao
 
+@cronometrar("grafico")
 def plotar_grafico_historico(dados_historicos, ticker):
     if not dados_historicos:
         return None
@@ -193,7 +187,7 @@ def plotar_grafico_historico(dados_historicos, ticker):
     p20 = dados_historicos['percentil_20']
     p80 = dados_historicos['percentil_80']
     fig = go.Figure()
-    fig.add_trace(go.Scatter(x=hist.index, y=hist['Close'], mode='lines', name='Preço', line=dict(color='#D4AF37', width=2)))
+    fig.add_trace(go.Scatter(x=hist.index, y=hist['Adj Close'], mode='lines', name='Preço Ajustado', line=dict(color='#D4AF37', width=2)))
     fig.add_trace(go.Scatter(x=hist.index, y=[media_12m]*len(hist), mode='lines', name='Média 12m', line=dict(color='white', width=1, dash='dash')))
     fig.add_hrect(y0=p20, y1=p80, fillcolor="green", opacity=0.1, line_width=0, name="Faixa Normal (20-80%)")
     cor_status = "#00FF00" if preco_atual < media_12m else "#FF4444"
@@ -201,28 +195,17 @@ def plotar_grafico_historico(dados_historicos, ticker):
     fig.update_layout(title=f"{ticker} - Histórico de Preços (5 anos)", yaxis_title="Preço (R$)", xaxis_title="Data", height=400, showlegend=True, plot_bgcolor='#0F1116', paper_bgcolor='#0F1116', font=dict(color='white'))
     return fig
 
+@cronometrar("analise")
 def calcular_matriz_correlacao(tickers, periodo="1y"):
     if len(tickers) < 2:
         return None, None
-    dados = {}
-    for ticker in tickers:
-        try:
-            if ticker[-1].isdigit():
-                ticker_yf = f"{ticker}.SA"
-            else:
-                ticker_yf = ticker
-            acao = yf.Ticker(ticker_yf)
-            hist = acao.history(period=periodo)['Close']
-            if not hist.empty:
-                dados[ticker] = hist
-        except:
-            continue
-    if len(dados) < 2:
+    # Mesma matriz alinhada usada pelo risco: baixada uma vez por carteira e período
+    analise = RiscoService.analisar(tickers, periodo)
+    if analise.precos.shape[1] < 2:
         return None, None
-    df = pd.DataFrame(dados)
-    correlacao = df.pct_change().corr()
-    return correlacao, df
+    return analise.correlacao, analise.precos
 
+@cronometrar("analise")
 def analisar_concentracao_setorial(df_ativos):
     if df_ativos.empty:
         return None, None
@@ -240,64 +223,25 @@ def analisar_concentracao_setorial(df_ativos):
             alertas.append({'setor': setor, 'percentual': percentual, 'nivel': 'MÉDIO', 'cor': '#D4AF37', 'mensagem': f"📊 {percentual:.1f}% em {setor} - dentro do limite recomendado"})
     return alertas, setores
 
+@cronometrar("analise")
 def calcular_preco_teto_bazin(ticker, dy_desejado=0.06):
+    """Preço teto de Bazin com os proventos dos últimos 12 meses. Retorna (preco_teto, mensagem)."""
     try:
-        if ticker[-1].isdigit():
-            ticker_yf = f"{ticker}.SA"
-        else:
-            ticker_yf = ticker
-        acao = yf.Ticker(ticker_yf)
-        dividends = acao.dividends.tail(12)
-        if dividends.empty:
-            return None, "Sem histórico de dividendos"
-        dividendo_anual_medio = dividends.mean() * 4
-        preco_teto = dividendo_anual_medio / dy_desejado
-        return preco_teto, f"R$ {preco_teto:.2f}"
+        return dividendos_service.preco_teto(ticker, dy_desejado)
     except Exception as e:
         return None, str(e)
 
-def calcular_risco_retorno(tickers):
-    dados_risco = {}
-    for ticker in tickers:
-        try:
-            if ticker[-1].isdigit():
-                ticker_yf = f"{ticker}.SA"
-            else:
-                ticker_yf = ticker
-            acao = yf.Ticker(ticker_yf)
-            hist = acao.history(period="1y")['Close']
-            if not hist.empty:
-                retornos = hist.pct_change().dropna()
-                dados_risco[ticker] = {
-                    'retorno_medio': retornos.mean() * 252 * 100,
-                    'volatilidade': retornos.std() * np.sqrt(252) * 100,
-                    'max_drawdown': (hist / hist.cummax() - 1).min() * 100
-                }
-        except:
-            continue
-    return dados_risco
+@cronometrar("analise")
+def calcular_risco_retorno(tickers, periodo="1y"):
+    analise = RiscoService.analisar(tickers, periodo)
+    return analise.risco.dropna(how='all').to_dict('index')
 
-def calcular_evolucao_patrimonio(df_ativos):
-    dados_historicos = {}
-    for ticker in df_ativos['ticker']:
-        try:
-            if ticker[-1].isdigit():
-                ticker_yf = f"{ticker}.SA"
-            else:
-                ticker_yf = ticker
-            acao = yf.Ticker(ticker_yf)
-            hist = acao.history(period="1mo")
-            if not hist.empty:
-                qtd = df_ativos[df_ativos['ticker'] == ticker]['qtd'].iloc[0]
-                dados_historicos[ticker] = hist['Close'] * qtd
-        except:
-            continue
-    if dados_historicos:
-        df_evolucao = pd.DataFrame(dados_historicos)
-        df_evolucao['Total'] = df_evolucao.sum(axis=1)
-        return df_evolucao
-    return None
+@cronometrar("analise")
+def calcular_evolucao_patrimonio(user_id, periodo="1y"):
+    """EvolucaoCarteira do usuário, recalculada só quando o livro de transações muda."""
+    return EvolucaoService.avaliar(user_id, versao_livro(user_id), periodo, lambda: carregar_livro(user_id))
 
+@cronometrar("analise")
 def calcular_rebalanceamento(df_ativos, metas, valor_disponivel=0):
     if df_ativos.empty or not metas:
         return None
@@ -315,13 +259,10 @@ def calcular_rebalanceamento(df_ativos, metas, valor_disponivel=0):
         diferenca = alvo - atual
         if diferenca > 0:
             acao = "COMPRAR"
-            cor = "#00FF00"
         elif diferenca < 0:
             acao = "VENDER"
-            cor = "#FF4444"
         else:
             acao = "OK"
-            cor = "#D4AF37"
         recomendacoes.append({
             'Classe': classe,
             'Atual (R$)': atual,
@@ -329,7 +270,6 @@ def calcular_rebalanceamento(df_ativos, metas, valor_disponivel=0):
             'Meta (%)': meta_pct,
             'Alvo (R$)': alvo,
             'Diferença (R$)': diferenca,
-            'Ação': acao,
-            'Cor': cor
+            'Ação': acao
         })
     return pd.DataFrame(recomendacoes)
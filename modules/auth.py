@@ -1,22 +1,28 @@
+# Modules/auth.py
 import streamlit_authenticator as stauth
-import sqlite3
+from modules.database import get_connection
 
 def carregar_credenciais():
-    conn = sqlite3.connect('data/invest_v10.db')
+    conn = get_connection()
     c = conn.cursor()
-    try:
-        c.execute("SELECT username, nome, senha_hash FROM usuarios")
-        rows = c.fetchall()
-    except:
-        rows = []
-    finally:
-        conn.close()
-    
-    cred = {"usernames": {}}
-    for r in rows:
-        cred["usernames"][r[0]] = {"name": r[1], "password": r[2]}
-    return cred
+    c.execute("SELECT username, nome, senha_hash FROM usuarios")
+    usuarios = c.fetchall()
+    conn.close()
+    credentials = {"usernames": {}}
+    for u in usuarios:
+        credentials["usernames"][u[0]] = {
+            "name": u[1],
+            "password": u[2]
+        }
+    return credentials
 
 def criar_authenticator():
-    cred = carregar_credenciais()
-    return stauth.Authenticate(cred, "invest_v10_cookie", "auth_key_123", 30)
+    credentials = carregar_credenciais()
+    COOKIE_KEY = "chave_super_secreta_12345678901234567890"
+    authenticator = stauth.Authenticate(
+        credentials,
+        "invest_app_cookie",
+        COOKIE_KEY,
+        30
+    )
+    return authenticator
@@ -3,11 +3,17 @@ import sqlite3
 import pandas as pd
 import streamlit as st
 from datetime import datetime
+from database.pool import obter_pool
+from database.migracoes import aplicar_migracoes
+from database.transacoes import registrar_transacao, versao_carteira
+from services.auditoria_service import obter_auditoria
+from services.telemetria_service import cronometrar
 
 DB_PATH = 'invest_v8.db'
 
 def get_connection():
-    return sqlite3.connect(DB_PATH, check_same_thread=False)
+    # Conexão emprestada do pool (WAL); conn.close() a devolve para reuso
+    return obter_pool(DB_PATH).conectar()
 
 def init_db():
     """Cria as tabelas necessárias se não existirem."""
@@ -58,9 +64,11 @@ def init_db():
         )
     ''')
     conn.commit()
+    aplicar_migracoes(conn)
     conn.close()
 
 # -------------------- Ativos --------------------
+@cronometrar("db")
 def salvar_ativo(user_id, ticker, qtd, pm, setor):
     if not ticker or len(ticker.strip()) < 2:
         st.error("❌ Ticker inválido!")
@@ -73,55 +81,119 @@ def salvar_ativo(user_id, ticker, qtd, pm, setor):
         return False
     try:
         conn = get_connection()
-        c = conn.cursor()
-        c.execute(
-            "INSERT INTO ativos (user_id, ticker, qtd, pm, setor) VALUES (?, ?, ?, ?, ?)",
-            (user_id, ticker.upper().strip(), float(qtd), float(pm), setor)
-        )
+        # Compra no livro de transações; a posição e o preço médio são atualizados junto
+        registrar_transacao(conn, user_id, ticker, 'compra', float(qtd), float(pm), setor=setor)
         conn.commit()
         conn.close()
+        obter_auditoria(DB_PATH).registrar(user_id, "salvar_ativo", f"{ticker} {qtd} @ {pm}")
         st.success(f"✅ {ticker.upper()} salvo!")
         return True
     except Exception as e:
         st.error(f"❌ Erro ao salvar: {str(e)}")
         return False
 
+@cronometrar("db")
 def excluir_ativo(user_id, ticker):
     try:
         conn = get_connection()
-        c = conn.cursor()
-        c.execute("DELETE FROM ativos WHERE user_id = ? AND ticker = ?", (user_id, ticker))
+        # O livro é só de inclusão: a exclusão zera a posição com um ajuste
+        registrar_transacao(conn, user_id, ticker, 'ajuste', 0.0, 0.0)
         conn.commit()
         conn.close()
+        obter_auditoria(DB_PATH).registrar(user_id, "excluir_ativo", ticker)
         st.success(f"✅ {ticker} excluído!")
         return True
     except Exception as e:
         st.error(f"❌ Erro ao excluir: {str(e)}")
         return False
 
+@cronometrar("db")
 def atualizar_ativo(user_id, ticker, qtd, pm, setor):
     try:
         conn = get_connection()
-        c = conn.cursor()
-        c.execute(
-            "UPDATE ativos SET qtd=?, pm=?, setor=? WHERE user_id=? AND ticker=?",
-            (float(qtd), float(pm), setor, user_id, ticker.upper().strip())
-        )
+        registrar_transacao(conn, user_id, ticker, 'ajuste', float(qtd), float(pm), setor=setor)
         conn.commit()
         conn.close()
+        obter_auditoria(DB_PATH).registrar(user_id, "atualizar_ativo", f"{ticker} {qtd} @ {pm}")
         st.success(f"✅ {ticker} atualizado!")
         return True
     except Exception as e:
         st.error(f"❌ Erro ao atualizar: {str(e)}")
         return False
 
+@cronometrar("db")
 def carregar_ativos(user_id):
     conn = get_connection()
-    df = pd.read_sql_query("SELECT * FROM ativos WHERE user_id = ?", conn, params=(user_id,))
+    # Posições zeradas continuam na tabela (lucro realizado e proventos), mas fora da carteira
+    df = pd.read_sql_query("SELECT * FROM ativos WHERE user_id = ? AND qtd > 0", conn, params=(user_id,))
+    conn.close()
+    return df
+
+# -------------------- Transações --------------------
+@cronometrar("db")
+def salvar_transacao(user_id, ticker, tipo, qtd, preco, data=None, taxas=0.0, setor=None):
+    try:
+        conn = get_connection()
+        registrar_transacao(conn, user_id, ticker, tipo, qtd, preco, data=data, taxas=taxas, setor=setor)
+        conn.commit()
+        conn.close()
+        obter_auditoria(DB_PATH).registrar(user_id, "salvar_transacao", f"{tipo} {ticker} {qtd} @ {preco}")
+        st.success(f"✅ {tipo.capitalize()} de {ticker.upper()} registrada!")
+        return True
+    except ValueError as e:
+        st.error(f"❌ {e}")
+        return False
+    except Exception as e:
+        st.error(f"❌ Erro ao registrar transação: {str(e)}")
+        return False
+
+@cronometrar("db")
+def carregar_transacoes(user_id, limite=200):
+    conn = get_connection()
+    df = pd.read_sql_query(
+        "SELECT id, data, ticker, tipo, qtd, preco, taxas, resultado FROM transacoes WHERE user_id = ? ORDER BY id DESC LIMIT ?",
+        conn, params=(user_id, limite)
+    )
+    conn.close()
+    return df
+
+@cronometrar("db")
+def carregar_livro(user_id):
+    """Livro completo do usuário na ordem em que os eventos são aplicados."""
+    conn = get_connection()
+    df = pd.read_sql_query(
+        "SELECT data, ticker, tipo, qtd, preco, taxas FROM transacoes WHERE user_id = ? ORDER BY data, id",
+        conn, params=(user_id,)
+    )
+    conn.close()
+    return df
+
+def versao_livro(user_id):
+    conn = get_connection()
+    versao = versao_carteira(conn, user_id)
+    conn.close()
+    return versao
+
+@cronometrar("db")
+def carregar_eventos_ano(user_id, ano):
+    """Dividendos do ano e vendas até o fim dele, com o setor da posição, para o resumo do IR.
+
+    As vendas de anos anteriores entram para o prejuízo acumulado chegar certo ao ano.
+    """
+    conn = get_connection()
+    df = pd.read_sql_query(
+        """SELECT t.data, t.ticker, t.tipo, t.qtd, t.preco, t.taxas, t.resultado, a.setor
+           FROM transacoes t LEFT JOIN ativos a ON a.user_id = t.user_id AND a.ticker = t.ticker
+           WHERE t.user_id = ? AND t.data <= ?
+             AND (t.tipo = 'venda' OR (t.tipo = 'dividendo' AND t.data >= ?))
+           ORDER BY t.data, t.id""",
+        conn, params=(user_id, f"{ano}-12-31", f"{ano}-01-01")
+    )
     conn.close()
     return df
 
 # -------------------- Metas --------------------
+@cronometrar("db")
 def salvar_metas(user_id, metas):
     try:
         conn = get_connection()
@@ -139,6 +211,7 @@ def salvar_metas(user_id, metas):
         st.error(f"❌ Erro ao salvar metas: {str(e)}")
         return False
 
+@cronometrar("db")
 def carregar_metas(user_id):
     try:
         conn = get_connection()
@@ -149,6 +222,7 @@ def carregar_metas(user_id):
         return {}
 
 # -------------------- Alertas --------------------
+@cronometrar("db")
 def salvar_alerta(user_id, ticker, tipo, preco):
     try:
         conn = get_connection()
@@ -165,6 +239,7 @@ def salvar_alerta(user_id, ticker, tipo, preco):
         st.error(f"❌ Erro ao salvar alerta: {str(e)}")
         return False
 
+@cronometrar("db")
 def carregar_alertas(user_id):
     try:
         conn = get_connection()
@@ -196,11 +271,30 @@ def excluir_alerta(alerta_id):
     except:
         return False
 
+@cronometrar("db")
+def carregar_disparos(user_id, apenas_novos=False, limite=50):
+    """Alertas disparados pelo AlertaService (mais recentes primeiro)."""
+    conn = get_connection()
+    filtro = " AND visto = 0" if apenas_novos else ""
+    df = pd.read_sql_query(
+        f"SELECT id, ticker, tipo, preco_alvo, preco, disparado_em, visto FROM alertas_disparados WHERE user_id = ?{filtro} ORDER BY id DESC LIMIT ?",
+        conn, params=(user_id, limite)
+    )
+    conn.close()
+    return df
+
+def marcar_disparos_vistos(user_id):
+    conn = get_connection()
+    conn.execute("UPDATE alertas_disparados SET visto = 1 WHERE user_id = ? AND visto = 0", (user_id,))
+    conn.commit()
+    conn.close()
+
+
 # -------------------- Usuários --------------------
 def criar_usuario(username, nome, senha_plana):
     """Cria um novo usuário com senha criptografada."""
     from streamlit_authenticator import Hasher
-    hashed = Hasher([senha_plana]).generate()[0]
+    hashed = Hasher.hash(senha_plana)
     conn = get_connection()
     c = conn.cursor()
     try:
@@ -213,6 +307,7 @@ def criar_usuario(username, nome, senha_plana):
         return True
     except Exception as e:
         print(f"Erro ao criar usuário: {e}")
+        conn.close()
         return False
 
 def buscar_usuario_por_username(username):
@@ -224,3 +319,14 @@ def buscar_usuario_por_username(username):
     if row:
         return {'id': row[0], 'username': row[1], 'nome': row[2], 'senha_hash': row[3]}
     return None
+
+@st.cache_resource
+def bootstrap_db():
+    """Cria as tabelas, aplica as migrações e garante o usuário admin, uma vez por processo."""
+    init_db()
+    if buscar_usuario_por_username('admin') is None:
+        criar_usuario('admin', 'Igor Barbo', "1234")
+        print("✅ Usuário admin criado com senha 1234")
+    else:
+        print("ℹ️ Usuário admin já existe")
+    return True
@@ -0,0 +1,64 @@
+# paginas/alertas.py
+import streamlit as st
+from config.settings import settings
+from modules.database import DB_PATH, carregar_alertas, carregar_ativos, carregar_disparos, excluir_alerta, marcar_disparos_vistos, salvar_alerta
+from modules.analise import pegar_preco
+from services.alerta_service import obter_alertas
+
+def show_alertas(user_id):
+    st.title("🔔 Central de Alertas")
+    df = carregar_ativos(user_id)
+    if df.empty:
+        st.info("Adicione ativos para configurar alertas")
+    else:
+        tab_alerta1, tab_alerta2, tab_alerta3 = st.tabs(["⚙️ Configurar", "📋 Meus Alertas", "🚨 Disparados"])
+        with tab_alerta1:
+            st.write("### Configurar Novo Alerta")
+            col_a1, col_a2, col_a3 = st.columns(3)
+            with col_a1:
+                ticker_alerta = st.selectbox("Ativo", df['ticker'].tolist())
+            with col_a2:
+                tipo_alerta = st.selectbox("Tipo", ["Acima de R$", "Abaixo de R$"])
+            with col_a3:
+                preco_alerta = st.number_input("Preço alvo", min_value=0.01, value=10.0, step=1.0)
+            preco_atual, status, _ = pegar_preco(ticker_alerta)
+            if preco_atual:
+                st.caption(f"💰 Preço atual: R$ {preco_atual:.2f}")
+            if st.button("✅ Ativar Alerta", use_container_width=True):
+                if salvar_alerta(user_id, ticker_alerta, tipo_alerta, preco_alerta):
+                    st.success("Alerta configurado!")
+                    st.rerun()
+        with tab_alerta2:
+            alertas = carregar_alertas(user_id)
+            if not alertas:
+                st.info("Nenhum alerta ativo")
+            else:
+                st.caption(f"Verificados em segundo plano a cada {settings.ALERTAS_INTERVALO // 60} min, mesmo com esta página fechada.")
+                for alerta_id, alerta in list(alertas.items()):
+                    with st.container():
+                        col1, col2, col3, col4 = st.columns([2, 2, 2, 1])
+                        with col1:
+                            st.write(f"**{alerta['ticker']}**")
+                        with col2:
+                            st.write(f"{alerta['tipo']} R$ {alerta['preco']:.2f}")
+                        with col3:
+                            st.caption(f"Criado em {alerta['criado_em']}")
+                        with col4:
+                            if st.button("🗑️", key=f"del_{alerta_id}"):
+                                excluir_alerta(alerta_id)
+                                st.rerun()
+                        st.divider()
+        with tab_alerta3:
+            if st.button("🔄 Verificar agora"):
+                with st.spinner("Verificando alertas..."):
+                    obter_alertas(DB_PATH).verificar()
+            disparos = carregar_disparos(user_id)
+            if disparos.empty:
+                st.info("Nenhum alerta disparado ainda")
+            else:
+                st.dataframe(disparos.drop(columns=['id']).rename(columns={
+                    'ticker': 'Ativo', 'tipo': 'Tipo', 'preco_alvo': 'Alvo (R$)', 'preco': 'Disparou a (R$)',
+                    'disparado_em': 'Quando', 'visto': 'Visto'
+                }), use_container_width=True, hide_index=True)
+                if not disparos['visto'].all():
+                    marcar_disparos_vistos(user_id)
@@ -0,0 +1,146 @@
+# paginas/analise_avancada.py
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+from datetime import datetime
+from modules.database import carregar_ativos, carregar_metas
+from modules.analise import analisar_preco_ativo, buscar_dados_historicos, calcular_matriz_correlacao, calcular_risco_retorno, pegar_precos, plotar_grafico_historico
+from services.risco_service import RiscoService
+from src.backtesting import FREQUENCIAS, backtest_carteira, metricas, pesos_de_metas
+from utils.exportacao import exportar_para_csv, exportar_para_excel
+
+def show_analise_avancada(user_id):
+    st.title("📊 Análise Avançada da Carteira")
+    df = carregar_ativos(user_id)
+    if df.empty:
+        st.info("Adicione ativos para ver análises avançadas")
+    else:
+        tab_av1, tab_av2, tab_av3, tab_av4, tab_av5 = st.tabs(["📊 Correlação", "📈 Risco", "💰 Análise Preço", "📥 Exportar", "🧪 Backtest"])
+        with tab_av1:
+            st.subheader("📊 Matriz de Correlação entre Ativos")
+            st.caption("Mostra como os ativos se movem juntos. Valores próximos de 1 indicam alta correlação.")
+            with st.spinner("Calculando correlações..."):
+                correlacao, _ = calcular_matriz_correlacao(df['ticker'].tolist())
+                ausentes = RiscoService.analisar(df['ticker'].tolist(), "1y").ausentes if len(df) > 1 else []
+                if ausentes:
+                    st.warning(f"Sem histórico de {', '.join(ausentes)} agora; esses ativos ficaram fora da análise.")
+                if correlacao is not None:
+                    fig = px.imshow(correlacao, text_auto=True, aspect="auto", color_continuous_scale='RdYlGn', title="Matriz de Correlação")
+                    st.plotly_chart(fig, use_container_width=True)
+                    st.subheader("🔍 Insights de Correlação")
+                    pares_altos, pares_baixos = RiscoService.analisar(df['ticker'].tolist(), "1y").pares()
+                    for ativo1, ativo2, corr_val in pares_altos:
+                        st.warning(f"⚠️ **Alta correlação** entre {ativo1} e {ativo2}: {corr_val:.2f}")
+                        st.caption("Isso significa que eles tendem a se mover na mesma direção. Pouca diversificação.")
+                    for ativo1, ativo2, corr_val in pares_baixos:
+                        st.success(f"✅ **Baixa correlação** entre {ativo1} e {ativo2}: {corr_val:.2f}")
+                        st.caption("Ótimo para diversificação! Eles se movem de forma independente.")
+                else:
+                    st.warning("Não foi possível calcular correlações (precisa de pelo menos 2 ativos com histórico)")
+        with tab_av2:
+            st.subheader("📈 Análise de Risco")
+            with st.spinner("Calculando métricas de risco..."):
+                dados_risco = calcular_risco_retorno(df['ticker'].tolist())
+                ausentes = [t for t in df['ticker'] if t not in dados_risco]
+                if ausentes:
+                    st.warning(f"Sem histórico de {', '.join(ausentes)} agora; esses ativos ficaram fora da análise.")
+                if dados_risco:
+                    df_risco = pd.DataFrame(dados_risco).T
+                    df_risco.columns = ['Retorno Anual %', 'Volatilidade %', 'Drawdown Máx %']
+                    st.dataframe(df_risco.style.format('{:.2f}%'), width='stretch')
+                    fig = px.scatter(df_risco, x='Volatilidade %', y='Retorno Anual %',
+                                    text=df_risco.index,
+                                    title="Risco x Retorno",
+                                    labels={'Volatilidade %': 'Risco (Volatilidade)', 'Retorno Anual %': 'Retorno Esperado'})
+                    fig.update_traces(textposition='top center')
+                    st.plotly_chart(fig, use_container_width=True)
+        with tab_av3:
+            st.subheader("💰 Análise de Preço - Caro ou Barato?")
+            ticker_selecionado = st.selectbox("Selecione um ativo para análise", df['ticker'].tolist())
+            if ticker_selecionado:
+                with st.spinner("Analisando dados históricos..."):
+                    dados_hist = buscar_dados_historicos(ticker_selecionado)
+                    status, msg_status, cor_status, explicacao, pontuacao = analisar_preco_ativo(ticker_selecionado, dados_hist)
+                    st.markdown(f"<h3 style='color:{cor_status}'>{msg_status}</h3>", unsafe_allow_html=True)
+                    st.markdown(explicacao)
+                    if dados_hist:
+                        fig = plotar_grafico_historico(dados_hist, ticker_selecionado)
+                        if fig:
+                            st.plotly_chart(fig, use_container_width=True)
+        with tab_av4:
+            st.subheader("📥 Exportar Dados")
+            with st.spinner("Preparando dados para exportação..."):
+                cotacoes = pegar_precos(df['ticker'].tolist())
+                precos_info = []
+                for ticker in df['ticker']:
+                    preco, status, msg = cotacoes[ticker]
+                    precos_info.append({'ticker': ticker, 'preco': preco if preco else 0, 'status': status})
+                df_precos = pd.DataFrame(precos_info)
+                df_export = df.merge(df_precos, on='ticker')
+                df_export['Patrimônio'] = df_export['qtd'] * df_export['preco']
+                df_export['Custo Total'] = df_export['qtd'] * df_export['pm']
+                df_export['Lucro/Prejuízo'] = df_export['Patrimônio'] - df_export['Custo Total']
+                analise_precos = []
+                for ticker in df['ticker']:
+                    dados_hist = buscar_dados_historicos(ticker)
+                    if dados_hist:
+                        status, _, _, _, _ = analisar_preco_ativo(ticker, dados_hist)
+                        analise_precos.append({'ticker': ticker, 'analise': status})
+                df_analise = pd.DataFrame(analise_precos) if analise_precos else None
+            col_exp1, col_exp2 = st.columns(2)
+            with col_exp1:
+                st.write("**Exportar para Excel**")
+                excel_data = exportar_para_excel(df_export, df_analise)
+                st.download_button(
+                    label="📥 Baixar Excel",
+                    data=excel_data,
+                    file_name=f"carteira_{datetime.now().strftime('%Y%m%d')}.xlsx",
+                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                    width='stretch'
+                )
+            with col_exp2:
+                st.write("**Exportar para CSV**")
+                csv_data = exportar_para_csv(df_export)
+                st.download_button(
+                    label="📥 Baixar CSV",
+                    data=csv_data,
+                    file_name=f"carteira_{datetime.now().strftime('%Y%m%d')}.csv",
+                    mime="text/csv",
+                    width='stretch'
+                )
+            with st.expander("📋 Prévia dos dados"):
+                st.dataframe(df_export, width='stretch')
+        with tab_av5:
+            st.subheader("🧪 Backtest com as Metas de Alocação")
+            metas_bt = carregar_metas(user_id)
+            pesos_bt = pesos_de_metas(df, metas_bt)
+            st.caption("Pesos alvo: a meta de cada classe dividida igualmente entre os seus ativos"
+                       if metas_bt else "Sem metas cadastradas: pesos iguais entre os ativos")
+            col_bt1, col_bt2, col_bt3, col_bt4 = st.columns(4)
+            with col_bt1:
+                periodo_bt = st.selectbox("Período", ["1y", "2y", "5y", "10y"], index=2)
+            with col_bt2:
+                frequencia_bt = st.selectbox("Rebalanceamento", list(FREQUENCIAS), format_func=str.capitalize)
+            with col_bt3:
+                aporte_bt = st.number_input("Aporte mensal (R$)", min_value=0.0, value=1000.0, step=100.0)
+            with col_bt4:
+                custo_bt = st.number_input("Custo por operação (%)", min_value=0.0, value=0.05, step=0.01) / 100
+            if st.button("▶️ Rodar backtest", use_container_width=True):
+                with st.spinner("Simulando..."):
+                    comparacao_bt, resultado_bt = backtest_carteira(
+                        pesos_bt.index, pesos_bt, periodo_bt, rebalanceamento=frequencia_bt,
+                        aporte_mensal=aporte_bt, custo=custo_bt
+                    )
+                if comparacao_bt is None:
+                    st.warning("Sem histórico suficiente para o backtest")
+                else:
+                    fig = px.line(comparacao_bt, title="Cota da Carteira vs Ibovespa (base 1)",
+                                  labels={'value': 'Cota', 'index': 'Data', 'variable': ''})
+                    st.plotly_chart(fig, use_container_width=True)
+                    m = metricas(resultado_bt)
+                    col_m1, col_m2, col_m3, col_m4 = st.columns(4)
+                    col_m1.metric("Retorno anual", f"{m['retorno_anual']:.2f}%")
+                    col_m2.metric("Volatilidade", f"{m['volatilidade']:.2f}%")
+                    col_m3.metric("Drawdown máximo", f"{m['max_drawdown']:.2f}%")
+                    col_m4.metric("Patrimônio final", f"R$ {m['patrimonio_final']:,.2f}",
+                                  f"Aportado R$ {resultado_bt['Aportado'].iloc[-1]:,.2f}", delta_color="off")
@@ -0,0 +1,121 @@
+# paginas/balanceamento.py
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+from modules.database import carregar_ativos, carregar_metas
+from modules.analise import pegar_precos
+
+def show_balanceamento(user_id):
+    st.title("🔄 Balanceamento Inteligente da Carteira")
+    st.markdown("### Mantenha sua carteira equilibrada mês a mês")
+    df = carregar_ativos(user_id)
+    if df.empty:
+        st.info("Adicione ativos para ver as recomendações de balanceamento.")
+    else:
+        with st.spinner("Atualizando preços..."):
+            cotacoes = pegar_precos(df['ticker'].tolist())
+            precos_info = []
+            for ticker in df['ticker']:
+                preco, _, _ = cotacoes[ticker]
+                precos_info.append(preco if preco else 0)
+            df['preco'] = precos_info
+            df['Patrimônio'] = df['qtd'] * df['preco']
+        total_patrimonio = df['Patrimônio'].sum()
+        metas = carregar_metas(user_id)
+        if not metas:
+            st.warning("Você ainda não definiu metas de alocação. Vá em 'Montar Carteira' e defina seu perfil primeiro.")
+        else:
+            alocacao_atual = df.groupby('setor')['Patrimônio'].sum().to_dict()
+            comparacao = []
+            for classe, meta_pct in metas.items():
+                atual_valor = alocacao_atual.get(classe, 0)
+                atual_pct = (atual_valor / total_patrimonio) * 100 if total_patrimonio > 0 else 0
+                diferenca = atual_pct - meta_pct
+                status = "🔴 Acima" if diferenca > 5 else "🟢 OK" if abs(diferenca) <= 5 else "🔵 Abaixo"
+                comparacao.append({
+                    "Classe": classe,
+                    "Meta (%)": f"{meta_pct:.1f}%",
+                    "Atual (R$)": f"R$ {atual_valor:,.2f}",
+                    "Atual (%)": f"{atual_pct:.1f}%",
+                    "Diferença": f"{diferenca:+.1f}%",
+                    "Status": status
+                })
+            df_comp = pd.DataFrame(comparacao)
+            st.subheader("📊 Alocação Atual vs. Meta")
+            col_g1, col_g2 = st.columns(2)
+            with col_g1:
+                st.caption("**Alocação Atual**")
+                fig_atual = px.pie(values=[alocacao_atual.get(classe,0) for classe in metas.keys()], 
+                                    names=list(metas.keys()), hole=0.4,
+                                    color_discrete_sequence=px.colors.sequential.Gold)
+                st.plotly_chart(fig_atual, use_container_width=True)
+            with col_g2:
+                st.caption("**Alocação Meta**")
+                fig_meta = px.pie(values=list(metas.values()), names=list(metas.keys()), hole=0.4,
+                                  color_discrete_sequence=px.colors.sequential.Gold_r)
+                st.plotly_chart(fig_meta, use_container_width=True)
+            st.subheader("📋 Detalhamento")
+            st.dataframe(df_comp.style.applymap(lambda x: 'color: red' if x == '🔴 Acima' else ('color: green' if x == '🟢 OK' else 'color: blue'), subset=['Status']), width='stretch')
+            st.subheader("💰 Recomendação de Aporte Mensal")
+            valor_aporte = st.number_input("Quanto você pretende aportar este mês? (R$)", min_value=0.0, value=500.0, step=100.0)
+            if valor_aporte > 0:
+                novo_total = total_patrimonio + valor_aporte
+                recomendacoes = []
+                for classe, meta_pct in metas.items():
+                    atual_valor = alocacao_atual.get(classe, 0)
+                    valor_desejado = novo_total * meta_pct / 100
+                    diferenca = valor_desejado - atual_valor
+                    if diferenca > 0:
+                        acao = "COMPRAR"
+                        sugestao = f"Aporte R$ {diferenca:,.2f} em {classe}"
+                    elif diferenca < 0:
+                        acao = "VENDER"
+                        sugestao = f"Venda R$ {abs(diferenca):,.2f} em {classe} (ou aguarde)"
+                    else:
+                        acao = "OK"
+                        sugestao = f"{classe} já está na meta"
+                    recomendacoes.append({
+                        "Classe": classe,
+                        "Atual (R$)": atual_valor,
+                        "Desejado (R$)": valor_desejado,
+                        "Diferença (R$)": diferenca,
+                        "Ação": acao,
+                        "Sugestão": sugestao
+                    })
+                df_rec = pd.DataFrame(recomendacoes)
+                st.dataframe(df_rec.style.format({"Atual (R$)": "R$ {:.2f}", "Desejado (R$)": "R$ {:.2f}", "Diferença (R$)": "R$ {:.2f}"}), width='stretch')
+                compras = df_rec[df_rec['Ação'] == "COMPRAR"]
+                if not compras.empty:
+                    total_compras = compras['Diferença (R$)'].sum()
+                    st.success(f"✅ Para balancear, você deve aportar **R$ {total_compras:,.2f}** distribuídos conforme a tabela acima.")
+                else:
+                    st.info("Sua carteira já está balanceada. Continue com seus aportes regulares.")
+            st.subheader("📉 Simulador de Estresse (Proteção contra Crises)")
+            st.caption("Veja como sua carteira reagiria a uma queda generalizada do mercado.")
+            queda = st.slider("Queda simulada nos preços dos ativos (%)", 0, 50, 20) / 100
+            df_sim = df.copy()
+            df_sim['preco_queda'] = df_sim['preco'] * (1 - queda)
+            df_sim['Patrimônio_queda'] = df_sim['qtd'] * df_sim['preco_queda']
+            total_queda = df_sim['Patrimônio_queda'].sum()
+            perda = total_patrimonio - total_queda
+            pct_perda = (perda / total_patrimonio) * 100 if total_patrimonio > 0 else 0
+            col_q1, col_q2, col_q3 = st.columns(3)
+            col_q1.metric("Patrimônio atual", f"R$ {total_patrimonio:,.2f}")
+            col_q2.metric("Após queda", f"R$ {total_queda:,.2f}", delta=f"-{pct_perda:.1f}%", delta_color="inverse")
+            col_q3.metric("Perda estimada", f"R$ {perda:,.2f}")
+            st.write("**Impacto no balanceamento:**")
+            nova_alocacao = df_sim.groupby('setor')['Patrimônio_queda'].sum().to_dict()
+            novos_desvios = []
+            for classe, meta_pct in metas.items():
+                novo_valor = nova_alocacao.get(classe, 0)
+                novo_pct = (novo_valor / total_queda) * 100 if total_queda > 0 else 0
+                desvio = novo_pct - meta_pct
+                novos_desvios.append({
+                    "Classe": classe,
+                    "Novo %": f"{novo_pct:.1f}%",
+                    "Meta %": f"{meta_pct:.1f}%",
+                    "Desvio": f"{desvio:+.1f}%"
+                })
+            df_desvios = pd.DataFrame(novos_desvios)
+            st.dataframe(df_desvios, width='stretch')
+            st.info("💡 **Dica:** Em cenários de crise, mantenha a calma e evite vender ativos desvalorizados. Use os aportes mensais para comprar nas classes que ficaram abaixo da meta, aproveitando preços baixos.")
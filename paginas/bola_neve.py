@@ -0,0 +1,74 @@
+# paginas/bola_neve.py
+import streamlit as st
+import plotly.express as px
+import plotly.graph_objects as go
+from services.simulacao_service import SimulacaoService
+
+def show_bola_neve(user_id):
+    st.title("❄️ Efeito Bola de Neve")
+    st.markdown("### Simule o crescimento do seu patrimônio com aportes mensais")
+    col1, col2 = st.columns(2)
+    with col1:
+        valor_inicial = st.number_input("💰 Valor inicial (R$)", min_value=0.0, value=0.0, step=1000.0)
+        aporte_mensal = st.number_input("📅 Aporte mensal (R$)", min_value=0.0, value=500.0, step=100.0)
+    with col2:
+        taxa_anual = st.slider("📈 Rentabilidade anual (%)", 0.0, 20.0, 10.0, step=0.5) / 100
+        anos = st.slider("⏳ Período (anos)", 1, 50, 20)
+    meses = anos * 12
+    # Trajetórias pela fórmula fechada, sem laço mês a mês
+    df_sim = SimulacaoService.bola_de_neve(valor_inicial, aporte_mensal, taxa_anual, meses)
+    # Totais
+    final_com = df_sim['Com reinvestimento'].iloc[-1]
+    final_sem = df_sim['Sem reinvestimento'].iloc[-1]
+    total_aportado = valor_inicial + aporte_mensal * meses
+    lucro_com = final_com - total_aportado
+    lucro_sem = final_sem - total_aportado
+    diferenca = final_com - final_sem
+    # Métricas
+    col_m1, col_m2, col_m3 = st.columns(3)
+    col_m1.metric("Total aportado", f"R$ {total_aportado:,.2f}")
+    col_m2.metric("Com reinvestimento", f"R$ {final_com:,.2f}", delta=f"Lucro: R$ {lucro_com:,.2f}")
+    col_m3.metric("Sem reinvestimento", f"R$ {final_sem:,.2f}", delta=f"Lucro: R$ {lucro_sem:,.2f}")
+    st.info(f"💡 **Diferença:** Se você gastar os rendimentos, deixará de ganhar **R$ {diferenca:,.2f}** em {anos} anos.")
+    # Gráfico
+    fig = px.line(df_sim, x='Mês', y=['Com reinvestimento', 'Sem reinvestimento'],
+                  title=f"Crescimento do patrimônio em {anos} anos",
+                  labels={'value': 'Patrimônio (R$)', 'variable': 'Cenário'},
+                  color_discrete_map={'Com reinvestimento': '#D4AF37', 'Sem reinvestimento': '#FF4B4B'})
+    st.plotly_chart(fig, use_container_width=True)
+    # Cenários com volatilidade
+    if st.checkbox("🎲 Simular cenários com volatilidade (Monte Carlo)"):
+        col_mc1, col_mc2 = st.columns(2)
+        with col_mc1:
+            volatilidade = st.slider("📉 Volatilidade anual (%)", 0.0, 40.0, 15.0, step=1.0) / 100
+        with col_mc2:
+            caminhos = st.select_slider("🔢 Cenários simulados", options=[10_000, 25_000, 50_000, 100_000], value=10_000)
+        # Semente fixa: mexer nos sliders não embaralha as faixas
+        faixas = SimulacaoService.monte_carlo(valor_inicial, aporte_mensal, taxa_anual, volatilidade,
+                                              meses, caminhos=caminhos, semente=42)
+        fig_mc = go.Figure()
+        fig_mc.add_trace(go.Scatter(x=faixas.index, y=faixas['P95'], line=dict(width=0), showlegend=False, hoverinfo='skip'))
+        fig_mc.add_trace(go.Scatter(x=faixas.index, y=faixas['P5'], fill='tonexty', fillcolor='rgba(212,175,55,0.15)',
+                                    line=dict(width=0), name='5% a 95%'))
+        fig_mc.add_trace(go.Scatter(x=faixas.index, y=faixas['P75'], line=dict(width=0), showlegend=False, hoverinfo='skip'))
+        fig_mc.add_trace(go.Scatter(x=faixas.index, y=faixas['P25'], fill='tonexty', fillcolor='rgba(212,175,55,0.35)',
+                                    line=dict(width=0), name='25% a 75%'))
+        fig_mc.add_trace(go.Scatter(x=faixas.index, y=faixas['P50'], line=dict(color='#D4AF37'), name='Mediana'))
+        fig_mc.add_trace(go.Scatter(x=df_sim['Mês'], y=df_sim['Com reinvestimento'], line=dict(color='#FFFFFF', dash='dash'),
+                                    name='Rentabilidade constante'))
+        fig_mc.update_layout(title="Faixas de patrimônio nos cenários simulados",
+                             xaxis_title='Mês', yaxis_title='Patrimônio (R$)')
+        st.plotly_chart(fig_mc, use_container_width=True)
+        col_p1, col_p2, col_p3 = st.columns(3)
+        col_p1.metric("Cenário pessimista (5%)", f"R$ {faixas['P5'].iloc[-1]:,.2f}")
+        col_p2.metric("Cenário mediano", f"R$ {faixas['P50'].iloc[-1]:,.2f}")
+        col_p3.metric("Cenário otimista (95%)", f"R$ {faixas['P95'].iloc[-1]:,.2f}")
+    # Tabela anual
+    with st.expander("📊 Ver tabela anual"):
+        df_sim['Ano'] = ((df_sim['Mês'] - 1) // 12) + 1
+        df_anual = df_sim.groupby('Ano').last().reset_index()
+        df_anual = df_anual[['Ano', 'Com reinvestimento', 'Sem reinvestimento']]
+        df_anual.columns = ['Ano', 'Com reinvestimento (R$)', 'Sem reinvestimento (R$)']
+        df_anual['Com reinvestimento (R$)'] = df_anual['Com reinvestimento (R$)'].apply(lambda x: f"{x:,.2f}")
+        df_anual['Sem reinvestimento (R$)'] = df_anual['Sem reinvestimento (R$)'].apply(lambda x: f"{x:,.2f}")
+        st.table(df_anual)
@@ -0,0 +1,93 @@
+# paginas/dashboard.py
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+from datetime import datetime
+from modules.database import carregar_ativos, carregar_disparos, carregar_metas, marcar_disparos_vistos
+from modules.analise import analisar_concentracao_setorial, calcular_rebalanceamento, pegar_precos
+from services.cache_mercado import obter_cache_mercado
+
+def show_dashboard(user_id):
+    st.title("🏛️ Patrimônio em Tempo Real")
+    col1, col2, col3 = st.columns([3, 1, 1])
+    with col1:
+        st.markdown("### 📊 Resumo da Carteira")
+    with col2:
+        st.caption(f"🕐 {datetime.now().strftime('%H:%M:%S')}")
+    with col3:
+        if st.button("🔄 Atualizar Preços"):
+            # Só os ativos desta carteira; o cache das outras sessões continua valendo
+            obter_cache_mercado().invalidar(carregar_ativos(user_id)['ticker'])
+            st.rerun()
+    disparos_novos = carregar_disparos(user_id, apenas_novos=True)
+    if not disparos_novos.empty:
+        for _, d in disparos_novos.iterrows():
+            st.warning(f"🚨 **{d['ticker']}** {d['tipo']} {d['preco_alvo']:.2f} — disparou a R$ {d['preco']:.2f} em {d['disparado_em']}")
+        if st.button("✔️ Marcar alertas como vistos"):
+            marcar_disparos_vistos(user_id)
+            st.rerun()
+    df = carregar_ativos(user_id)
+    if not df.empty:
+        with st.spinner('🔄 Buscando preços do mercado...'):
+            cotacoes = pegar_precos(df['ticker'].tolist())
+            precos_info = []
+            for ticker in df['ticker']:
+                preco, status, msg = cotacoes[ticker]
+                precos_info.append({'ticker': ticker, 'preco': preco if preco else 0, 'status': status, 'msg': msg})
+            df_precos = pd.DataFrame(precos_info)
+            df = df.merge(df_precos, on='ticker')
+            df['Patrimônio'] = df['qtd'] * df['preco']
+            df['Custo Total'] = df['qtd'] * df['pm']
+            df['Lucro/Prejuízo'] = df['Patrimônio'] - df['Custo Total']
+            df['Variação %'] = (df['preco'] / df['pm'] - 1) * 100
+            total_patrimonio = df['Patrimônio'].sum()
+            total_custo = df['Custo Total'].sum()
+            total_lucro = df['Lucro/Prejuízo'].sum()
+            renda_est = total_patrimonio * 0.0085
+        if df['msg'].str.endswith('atualizando', na=False).any():
+            st.caption("⏳ Alguns preços são da última cotação conhecida e estão sendo atualizados em segundo plano.")
+        c1, c2, c3, c4 = st.columns(4)
+        c1.metric("Total Investido", f"R$ {total_custo:,.2f}")
+        c2.metric("Patrimônio Atual", f"R$ {total_patrimonio:,.2f}")
+        c3.metric("Lucro/Prejuízo", f"R$ {total_lucro:,.2f}")
+        c4.metric("Renda Mensal Est.", f"R$ {renda_est:,.2f}")
+        st.write("---")
+        # Alertas setoriais
+        alertas_setoriais, setores = analisar_concentracao_setorial(df)
+        if alertas_setoriais:
+            with st.expander("⚠️ Análise de Concentração Setorial", expanded=True):
+                for alerta in alertas_setoriais:
+                    if alerta['nivel'] in ['CRÍTICO', 'ALTO']:
+                        st.markdown(f"<p style='color:{alerta['cor']}; font-weight:bold;'>{alerta['mensagem']}</p>", unsafe_allow_html=True)
+                    else:
+                        st.markdown(f"<p style='color:{alerta['cor']};'>{alerta['mensagem']}</p>", unsafe_allow_html=True)
+        st.subheader("📋 Detalhamento por Ativo")
+        df_display = df[['ticker', 'qtd', 'pm', 'preco', 'Patrimônio', 'Lucro/Prejuízo', 'Variação %', 'status', 'msg']].copy()
+        df_display.columns = ['Ticker', 'Qtd', 'P.Médio', 'P.Atual', 'Patrimônio', 'Lucro/Prej', 'Var %', 'Status', 'Cotação']
+        st.dataframe(df_display.style.format({'P.Médio': 'R$ {:.2f}', 'P.Atual': 'R$ {:.2f}', 'Patrimônio': 'R$ {:.2f}', 'Lucro/Prej': 'R$ {:.2f}', 'Var %': '{:.1f}%'}), width='stretch', height=400)
+        col_g1, col_g2 = st.columns(2)
+        with col_g1:
+            st.subheader("Distribuição por Ativo")
+            fig1 = px.pie(df, values='Patrimônio', names='ticker', hole=0.5, color_discrete_sequence=px.colors.sequential.Gold)
+            st.plotly_chart(fig1, use_container_width=True)
+        with col_g2:
+            st.subheader("Distribuição por Setor")
+            fig2 = px.pie(df, values='Patrimônio', names='setor', hole=0.5, color_discrete_sequence=["#D4AF37", "#8B6914", "#B8860B", "#CD7F32", "#C0C0C0"])
+            st.plotly_chart(fig2, use_container_width=True)
+        # Rebalanceamento
+        metas = carregar_metas(user_id)
+        if metas:
+            st.write("---")
+            st.subheader("🔄 Recomendação de Rebalanceamento")
+            valor_aporte = st.number_input("💰 Valor disponível para aporte (R$)", min_value=0.0, value=0.0, step=100.0, key="aporte_rebalanceamento")
+            df_rebalanceamento = calcular_rebalanceamento(df, metas, valor_aporte)
+            if df_rebalanceamento is not None:
+                st.dataframe(df_rebalanceamento.style.format({'Atual (R$)': 'R$ {:.2f}', 'Atual (%)': '{:.2f}%', 'Meta (%)': '{:.2f}%', 'Alvo (R$)': 'R$ {:.2f}', 'Diferença (R$)': 'R$ {:.2f}'}), width='stretch')
+                compras = df_rebalanceamento[df_rebalanceamento['Ação'] == 'COMPRAR']
+                if not compras.empty and valor_aporte > 0:
+                    st.success("### 📝 Sugestão de aporte:")
+                    for _, row in compras.iterrows():
+                        st.write(f"• **{row['Classe']}:** aportar R$ {row['Diferença (R$)']:,.2f} para atingir a meta")
+    else:
+        st.info("📭 Sua carteira está vazia. Vá em 'Gestão de Carteira' para adicionar ativos.")
+        st.info("💡 Ou use o assistente 'Montar Carteira' para começar do zero!")
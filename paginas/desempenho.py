@@ -0,0 +1,102 @@
+# paginas/desempenho.py
+import json
+from pathlib import Path
+import streamlit as st
+import plotly.express as px
+from config.settings import settings
+from services.provedor_mercado import obter_provedor
+from services.single_flight import single_flight
+from services.telemetria_service import telemetria
+
+def _ultimas_renderizacoes(n=30):
+    """Últimas linhas JSON que a telemetria gravou no log (lê só o fim do arquivo)."""
+    caminho = Path(settings.LOG_PATH)
+    if not caminho.is_file():
+        return []
+    with open(caminho, 'rb') as f:
+        f.seek(max(0, caminho.stat().st_size - 256 * 1024))
+        linhas = f.read().decode('utf-8', errors='ignore').splitlines()
+    registros = []
+    for linha in reversed(linhas):
+        data, _, corpo = linha.partition(' {')
+        try:
+            registro = json.loads('{' + corpo)
+        except ValueError:
+            continue
+        registros.append({'Quando': data.rsplit(',', 1)[0], 'Página': registro['pagina'],
+                          'Total (ms)': registro['ms'],
+                          'Funções': ", ".join(f"{f} {v['ms']:.0f}ms" for f, v in
+                                              sorted(registro['funcoes'].items(), key=lambda i: -i[1]['ms'])[:4])})
+        if len(registros) >= n:
+            break
+    return registros
+
+def show_desempenho(user_id):
+    if st.session_state.get('username') != settings.ADMIN_USERNAME:
+        st.error("Página restrita ao administrador.")
+        st.stop()
+    st.title("⏱️ Desempenho")
+    st.caption(f"Percentis das últimas {telemetria.capacidade} chamadas de cada função e renderizações de cada página, "
+               "desde o início do processo.")
+    if not telemetria.ativa:
+        st.info("Telemetria desligada (TELEMETRIA_ATIVA=false).")
+        return
+
+    if st.button("🗑️ Zerar métricas"):
+        telemetria.limpar()
+        single_flight.zerar()
+        st.rerun()
+
+    formato = {'p50 (ms)': '{:.1f}', 'p95 (ms)': '{:.1f}', 'p99 (ms)': '{:.1f}', 'Máx (ms)': '{:.1f}',
+               'Acerto (%)': '{:.1f}', 'Bytes': '{:,.0f}'}
+
+    st.markdown("### 📄 Por página")
+    paginas = telemetria.por_pagina()
+    if paginas.empty:
+        st.info("Nenhuma renderização registrada ainda.")
+    else:
+        st.dataframe(paginas.style.format({k: v for k, v in formato.items() if k in paginas.columns}, na_rep="-"),
+                     use_container_width=True, hide_index=True)
+
+    st.markdown("### 🔧 Por função")
+    funcoes = telemetria.por_funcao()
+    if funcoes.empty:
+        st.info("Nenhuma chamada instrumentada registrada ainda.")
+    else:
+        categorias = sorted(funcoes['Categoria'].unique())
+        escolhidas = st.multiselect("Categorias", categorias, default=categorias)
+        funcoes = funcoes[funcoes['Categoria'].isin(escolhidas)]
+        st.dataframe(funcoes.style.format(formato, na_rep="-"), use_container_width=True, hide_index=True)
+        medidas = funcoes.dropna(subset=['p95 (ms)']).head(15)
+        if not medidas.empty:
+            fig = px.bar(medidas.iloc[::-1], x='p95 (ms)', y='Nome', color='Categoria', orientation='h',
+                         title="Funções mais lentas (p95)")
+            st.plotly_chart(fig, use_container_width=True)
+
+    st.markdown("### 🌐 Provedor de mercado")
+    provedor = obter_provedor()
+    if hasattr(provedor, 'estado'):
+        estado = provedor.estado()
+        c1, c2, c3 = st.columns(3)
+        c1.metric("Circuito", estado['circuito'].capitalize(),
+                  f"reabre em {estado['reabre_em_s']:.0f}s" if estado['reabre_em_s'] else None, delta_color="off")
+        c2.metric("Falhas seguidas", estado['falhas_seguidas'])
+        c3.metric("Taxa (req/s)", f"{estado['taxa_atual']:.1f} / {estado['taxa_maxima']:.0f}")
+        st.caption(f"Provedor {estado['provedor']}; latência e erros por endpoint aparecem acima na categoria \"rede\".")
+    else:
+        st.caption(f"Provedor {provedor.nome}, sem limitador nem circuit breaker.")
+
+    st.markdown("### 🔀 Buscas coalescidas")
+    st.caption("Pedidos simultâneos da mesma chave (tipo, ticker, período) que esperaram uma busca já em andamento.")
+    coalescidas = single_flight.estatisticas()
+    if coalescidas:
+        st.dataframe(coalescidas, use_container_width=True, hide_index=True)
+    else:
+        st.info("Nenhuma busca de mercado registrada ainda.")
+
+    st.markdown("### 🧾 Últimas renderizações")
+    registros = _ultimas_renderizacoes()
+    if registros:
+        st.dataframe(registros, use_container_width=True, hide_index=True)
+    else:
+        st.info(f"Nada gravado em {settings.LOG_PATH} ainda.")
@@ -0,0 +1,38 @@
+# paginas/evolucao.py
+import streamlit as st
+import numpy as np
+import plotly.express as px
+from modules.analise import calcular_evolucao_patrimonio
+
+def show_evolucao(user_id):
+    st.title("📈 Evolução do Patrimônio")
+    periodos_ev = {"1 mês": "1mo", "6 meses": "6mo", "1 ano": "1y", "5 anos": "5y", "10 anos": "10y", "20 anos": "20y"}
+    periodo_ev = st.select_slider("Período", options=list(periodos_ev), value="1 ano")
+    with st.spinner("Reconstruindo o patrimônio a partir das transações..."):
+        evolucao = calcular_evolucao_patrimonio(user_id, periodos_ev[periodo_ev])
+    if evolucao.ausentes:
+        st.warning(f"Sem cotações de {', '.join(evolucao.ausentes)} agora; esses ativos ficaram fora do patrimônio. "
+                   "Tente de novo em instantes.")
+    if evolucao.vazia:
+        st.info("Registre compras em Gestão → Transações para ver a evolução")
+    else:
+        df_evolucao = evolucao.diario
+        fig = px.line(df_evolucao, y=['Patrimônio', 'Investido'], title=f"Patrimônio Total - {periodo_ev}",
+                      labels={'value': 'R$', 'index': 'Data', 'variable': ''},
+                      color_discrete_map={'Patrimônio': '#D4AF37', 'Investido': '#888888'})
+        fig.update_traces(line_width=3, selector={'name': 'Patrimônio'})
+        st.plotly_chart(fig, use_container_width=True)
+        col_ev1, col_ev2, col_ev3, col_ev4 = st.columns(4)
+        with col_ev1:
+            st.metric("Patrimônio Atual", f"R$ {df_evolucao['Patrimônio'].iloc[-1]:,.2f}")
+        with col_ev2:
+            st.metric("Rentabilidade (TWR)", f"{evolucao.twr:.2f}%", help="Retorno ponderado pelo tempo: ignora o efeito dos aportes")
+        with col_ev3:
+            mwr = evolucao.mwr
+            st.metric("TIR (MWR) a.a.", f"{mwr:.2f}%" if np.isfinite(mwr) else "—", help="Retorno ponderado pelo dinheiro, anualizado")
+        with col_ev4:
+            st.metric("Máximo", f"R$ {df_evolucao['Patrimônio'].max():,.2f}")
+        fig_rent = px.area(df_evolucao, y='Rentabilidade', title="Rentabilidade Acumulada (%)",
+                           labels={'Rentabilidade': '%', 'index': 'Data'})
+        fig_rent.update_traces(line_color='#D4AF37')
+        st.plotly_chart(fig_rent, use_container_width=True)
@@ -0,0 +1,91 @@
+# paginas/gestao.py
+import streamlit as st
+from datetime import datetime
+from modules.database import atualizar_ativo, carregar_ativos, carregar_transacoes, excluir_ativo, salvar_ativo, salvar_transacao
+
+def show_gestao(user_id):
+    st.title("⚙️ Gerenciar Ativos")
+    tab1, tab2, tab3 = st.tabs(["📥 Adicionar", "✏️ Editar/Excluir", "🧾 Transações"])
+    with tab1:
+        with st.form("add_ativo", clear_on_submit=True):
+            st.subheader("➕ Novo Ativo")
+            col1, col2 = st.columns(2)
+            with col1:
+                ticker = st.text_input("📌 Ticker", help="Ex: PETR4, MXRF11").upper()
+                qtd = st.number_input("🔢 Quantidade", min_value=0.01, step=0.01, format="%.2f")
+            with col2:
+                pm = st.number_input("💵 Preço Médio (R$)", min_value=0.01, step=0.01, format="%.2f")
+                setor = st.selectbox("🏷️ Setor", ["Ações", "FII Papel", "FII Tijolo", "ETF", "Renda Fixa"])
+            submitted = st.form_submit_button("💾 Salvar Ativo", use_container_width=True)
+            if submitted:
+                if salvar_ativo(user_id, ticker, qtd, pm, setor):
+                    st.balloons()
+    with tab2:
+        st.subheader("📋 Ativos Cadastrados")
+        df_lista = carregar_ativos(user_id)
+        if not df_lista.empty:
+            if 'editando' not in st.session_state:
+                st.session_state.editando = None
+            for idx, row in df_lista.iterrows():
+                with st.container():
+                    col1, col2, col3 = st.columns([4, 1, 1])
+                    with col1:
+                        st.write(f"**{row['ticker']}** | {row['qtd']:.2f} cotas | R$ {row['pm']:.2f} | {row['setor']}")
+                    with col2:
+                        if st.button(f"✏️", key=f"edit_{row['ticker']}", use_container_width=True):
+                            st.session_state.editando = row['ticker']
+                            st.rerun()
+                    with col3:
+                        if st.button(f"🗑️", key=f"del_{row['ticker']}", use_container_width=True):
+                            if excluir_ativo(user_id, row['ticker']):
+                                st.rerun()
+                    if st.session_state.editando == row['ticker']:
+                        with st.form(key=f"form_edit_{row['ticker']}"):
+                            nova_qtd = st.number_input("Quantidade", value=float(row['qtd']))
+                            novo_pm = st.number_input("Preço Médio", value=float(row['pm']))
+                            novo_setor = st.selectbox("Setor", ["Ações", "FII Papel", "FII Tijolo", "ETF", "Renda Fixa"],
+                                                      index=["Ações", "FII Papel", "FII Tijolo", "ETF", "Renda Fixa"].index(row['setor']))
+                            col_s1, col_s2 = st.columns(2)
+                            with col_s1:
+                                if st.form_submit_button("Salvar"):
+                                    if atualizar_ativo(user_id, row['ticker'], nova_qtd, novo_pm, novo_setor):
+                                        st.session_state.editando = None
+                                        st.rerun()
+                            with col_s2:
+                                if st.form_submit_button("Cancelar"):
+                                    st.session_state.editando = None
+                                    st.rerun()
+                    st.divider()
+        else:
+            st.info("📭 Nenhum ativo cadastrado.")
+    with tab3:
+        with st.form("add_transacao", clear_on_submit=True):
+            st.subheader("🧾 Nova Transação")
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                tipo_tr = st.selectbox("Tipo", ["compra", "venda", "dividendo", "desdobramento"],
+                                       format_func=str.capitalize)
+                ticker_tr = st.text_input("📌 Ticker").upper()
+            with col2:
+                data_tr = st.date_input("📅 Data", value=datetime.now().date())
+                qtd_tr = st.number_input("🔢 Quantidade (fator, no desdobramento)", min_value=0.0, step=0.01,
+                                         format="%.2f", help="Dividendo com quantidade 0 usa a posição atual")
+            with col3:
+                preco_tr = st.number_input("💵 Preço / valor por cota (R$)", min_value=0.0, step=0.01, format="%.2f")
+                taxas_tr = st.number_input("🧾 Taxas (R$)", min_value=0.0, step=0.01, format="%.2f")
+            setor_tr = st.selectbox("🏷️ Setor (só para ativo novo)", ["", "Ações", "FII Papel", "FII Tijolo", "ETF", "Renda Fixa"])
+            if st.form_submit_button("💾 Registrar", use_container_width=True):
+                if not ticker_tr:
+                    st.error("❌ Ticker não pode estar vazio")
+                elif salvar_transacao(user_id, ticker_tr, tipo_tr, qtd_tr, preco_tr,
+                                      data_tr, taxas_tr, setor_tr or None):
+                    st.rerun()
+        st.subheader("📜 Últimas Transações")
+        df_tr = carregar_transacoes(user_id)
+        if not df_tr.empty:
+            st.dataframe(df_tr.drop(columns=['id']).rename(columns={
+                'data': 'Data', 'ticker': 'Ticker', 'tipo': 'Tipo', 'qtd': 'Qtd', 'preco': 'Preço',
+                'taxas': 'Taxas', 'resultado': 'Resultado'
+            }), use_container_width=True, hide_index=True)
+        else:
+            st.info("📭 Nenhuma transação registrada.")
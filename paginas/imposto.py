@@ -0,0 +1,72 @@
+# paginas/imposto.py
+import streamlit as st
+import pandas as pd
+from datetime import datetime
+from modules.database import carregar_eventos_ano
+from services.imposto_service import ImpostoService, classe_ir
+
+def show_imposto(user_id):
+    st.title("📝 Imposto de Renda")
+    tab_ir1, tab_ir2, tab_ir3 = st.tabs(["📊 Venda de Ações", "🏢 FIIs", "📋 Resumo Anual"])
+    with tab_ir1:
+        st.write("### Simulador de IR - Venda de Ações")
+        col_ir1, col_ir2, col_ir3 = st.columns(3)
+        with col_ir1:
+            acao_venda = st.text_input("Ativo vendido", "PETR4").upper()
+            qtd_venda = st.number_input("Quantidade vendida", min_value=0.0, value=100.0)
+        with col_ir2:
+            preco_compra = st.number_input("Preço médio de compra (R$)", min_value=0.01, value=30.0)
+            preco_venda = st.number_input("Preço de venda (R$)", min_value=0.01, value=35.0)
+        with col_ir3:
+            total_vendas_mes = st.number_input("Total vendido no mês (R$)", min_value=0.0, value=15000.0)
+        custo_total = qtd_venda * preco_compra
+        venda_total = qtd_venda * preco_venda
+        lucro = venda_total - custo_total
+        st.write("---")
+        if lucro > 0 and total_vendas_mes > 20000:
+            ir_devido = lucro * 0.15
+            st.error(f"IR devido: R$ {ir_devido:,.2f}")
+            with st.expander("Código DARF"):
+                st.code(f"""
+                DARF - Código 6015
+                Valor: R$ {ir_devido:.2f}
+                Vencimento: Último dia útil do mês seguinte
+                """)
+        else:
+            st.success("✅ ISENTO de IR")
+    with tab_ir2:
+        st.write("### Imposto sobre FIIs")
+        col_f1, col_f2 = st.columns(2)
+        with col_f1:
+            dividendos = st.number_input("Dividendos recebidos (R$)", min_value=0.0, value=500.0)
+        with col_f2:
+            lucro_fii = st.number_input("Lucro com vendas (R$)", min_value=0.0, value=0.0)
+        ir_total = (dividendos + lucro_fii) * 0.20
+        if ir_total > 0:
+            st.error(f"IR sobre FIIs: R$ {ir_total:,.2f}")
+    with tab_ir3:
+        st.write("### Resumo Anual (a partir das transações)")
+        ano_ir = st.selectbox("Ano", list(range(datetime.now().year, datetime.now().year - 6, -1)))
+        df_ev = carregar_eventos_ano(user_id, ano_ir)
+        do_ano = df_ev['data'].str[:4] == str(ano_ir)
+        if not do_ano.any():
+            st.info("📭 Nenhuma venda ou dividendo registrado no ano. Use Gestão → Transações.")
+        else:
+            vendas = df_ev[df_ev['tipo'] == 'venda']
+            if do_ano[vendas.index].any():
+                # Ações: isenção para vendas de até R$ 20 mil no mês; ETFs e BDRs: 15% sem isenção;
+                # FIIs: 20%. O prejuízo é compensado dentro de cada classe, desde os anos anteriores
+                df_resumo = ImpostoService.apurar_mensal(vendas)
+                df_resumo = df_resumo[df_resumo['Mês'].str.startswith(str(ano_ir))]
+                st.dataframe(df_resumo.style.format({c: 'R$ {:,.2f}' for c in df_resumo.columns if c != 'Mês'}),
+                             use_container_width=True, hide_index=True)
+                st.metric("IR devido no ano", f"R$ {df_resumo['IR devido'].sum():,.2f}")
+                fora = vendas.loc[do_ano[vendas.index] & vendas['setor'].map(classe_ir).isna(), 'ticker'].unique()
+                if len(fora):
+                    st.caption(f"Fora da apuração (regras próprias): {', '.join(fora)}")
+            proventos = df_ev[(df_ev['tipo'] == 'dividendo') & do_ano]
+            if not proventos.empty:
+                st.write("#### 💰 Proventos recebidos")
+                por_ativo = (proventos.qtd * proventos.preco).groupby(proventos.ticker).sum()
+                st.dataframe(por_ativo.rename('Valor (R$)').to_frame(), use_container_width=True)
+                st.metric("Total de proventos", f"R$ {por_ativo.sum():,.2f}")
@@ -0,0 +1,210 @@
+# paginas/montar_carteira.py
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+from modules.config import ATIVOS
+from modules.database import salvar_ativo, salvar_metas
+from modules.analise import analisar_preco_ativo, buscar_dados_historicos, plotar_grafico_historico
+
+def show_montar_carteira(user_id):
+    st.title("🎯 Assistente Inteligente de Carteira")
+    st.markdown("### Meta: Rentabilidade de **8% a 12% ao ano**")
+    if 'etapa_carteira' not in st.session_state:
+        st.session_state.etapa_carteira = 1
+        st.session_state.valor_investir = 1000.0
+        st.session_state.perfil_usuario = "Moderado"
+        st.session_state.prazo_usuario = "Médio (3-5 anos)"
+        st.session_state.objetivo_usuario = "Crescimento patrimonial"
+        st.session_state.alocacao_escolhida = None
+        st.session_state.retorno_esperado = 0.095
+    # ETAPA 1: PERFIL
+    if st.session_state.etapa_carteira == 1:
+        st.markdown("---")
+        st.subheader("📋 Passo 1: Conte sobre você")
+        col1, col2 = st.columns(2)
+        with col1:
+            valor = st.number_input("💰 Quanto quer investir? (R$)", min_value=100.0, value=st.session_state.valor_investir, step=500.0, help="Valor total disponível para investir agora")
+            perfil = st.selectbox("🎲 Seu perfil de investidor", ["Conservador", "Moderado", "Arrojado"], index=["Conservador", "Moderado", "Arrojado"].index(st.session_state.perfil_usuario), help="Conservador: prioriza segurança | Moderado: equilíbrio | Arrojado: busca retorno")
+        with col2:
+            prazo = st.selectbox("⏱️ Prazo do investimento", ["Curto (1-2 anos)", "Médio (3-5 anos)", "Longo (5+ anos)"], index=["Curto (1-2 anos)", "Médio (3-5 anos)", "Longo (5+ anos)"].index(st.session_state.prazo_usuario))
+            objetivo = st.selectbox("🎯 Objetivo principal", ["Crescimento patrimonial", "Geração de renda mensal", "Proteção contra inflação"], index=["Crescimento patrimonial", "Geração de renda mensal", "Proteção contra inflação"].index(st.session_state.objetivo_usuario))
+        if st.button("✅ Próximo: Ver alocação ideal", use_container_width=True):
+            st.session_state.valor_investir = valor
+            st.session_state.perfil_usuario = perfil
+            st.session_state.prazo_usuario = prazo
+            st.session_state.objetivo_usuario = objetivo
+            st.session_state.etapa_carteira = 2
+            st.rerun()
+    # ETAPA 2: ALOCAÇÃO
+    elif st.session_state.etapa_carteira == 2:
+        st.markdown("---")
+        st.subheader("📊 Passo 2: Alocação recomendada para seu perfil")
+        valor = st.session_state.valor_investir
+        perfil = st.session_state.perfil_usuario
+        if perfil == "Conservador":
+            alocacao = {"Renda Fixa": {"pct": 70, "cor": "#2E86AB", "retorno": 0.08}, "FIIs": {"pct": 20, "cor": "#D4AF37", "retorno": 0.09}, "Ações": {"pct": 10, "cor": "#F18F01", "retorno": 0.10}}
+            descricao = "🔒 Foco em segurança, com pequena exposição a risco"
+        elif perfil == "Moderado":
+            alocacao = {"Renda Fixa": {"pct": 40, "cor": "#2E86AB", "retorno": 0.08}, "FIIs": {"pct": 35, "cor": "#D4AF37", "retorno": 0.10}, "Ações": {"pct": 25, "cor": "#F18F01", "retorno": 0.12}}
+            descricao = "⚖️ Equilíbrio entre segurança e rentabilidade"
+        else:
+            alocacao = {"Renda Fixa": {"pct": 20, "cor": "#2E86AB", "retorno": 0.08}, "FIIs": {"pct": 40, "cor": "#D4AF37", "retorno": 0.11}, "Ações": {"pct": 40, "cor": "#F18F01", "retorno": 0.13}}
+            descricao = "🚀 Busca pelo máximo retorno, assumindo riscos"
+        st.info(f"📌 **Seu perfil:** {perfil} - {descricao}")
+        metas = {classe: dados['pct'] for classe, dados in alocacao.items()}
+        salvar_metas(user_id, metas)
+        df_alloc = pd.DataFrame([{"Classe": classe, "Percentual": f"{dados['pct']}%", "Valor (R$)": f"R$ {valor * dados['pct']/100:,.2f}", "Retorno Anual": f"{dados['retorno']*100:.1f}%"} for classe, dados in alocacao.items()])
+        st.dataframe(df_alloc, width='stretch')
+        fig = px.pie(values=[d['pct'] for d in alocacao.values()], names=list(alocacao.keys()), title="Distribuição da Carteira", color_discrete_sequence=[d['cor'] for d in alocacao.values()])
+        st.plotly_chart(fig, use_container_width=True)
+        retorno_total = sum((d['pct']/100) * d['retorno'] for d in alocacao.values())
+        col_r1, col_r2, col_r3 = st.columns(3)
+        with col_r1:
+            st.metric("Total a Investir", f"R$ {valor:,.2f}")
+        with col_r2:
+            st.metric("Retorno Anual Esperado", f"{retorno_total*100:.1f}%")
+        with col_r3:
+            renda_mensal = valor * retorno_total / 12
+            st.metric("Renda Mensal Estimada", f"R$ {renda_mensal:,.2f}")
+        if 0.08 <= retorno_total <= 0.12:
+            st.success("✅ Esta carteira está dentro da meta de 8% a 12% ao ano!")
+        elif retorno_total < 0.08:
+            st.warning("⚠️ Esta carteira está abaixo da meta de 8%. Considere um perfil mais arrojado.")
+        else:
+            st.warning("⚠️ Esta carteira está acima da meta de 12%. Considere um perfil mais conservador.")
+        col_b1, col_b2 = st.columns(2)
+        with col_b1:
+            if st.button("🔙 Voltar ao perfil", use_container_width=True):
+                st.session_state.etapa_carteira = 1
+                st.rerun()
+        with col_b2:
+            if st.button("✅ Aceitar e escolher ativos", use_container_width=True):
+                st.session_state.alocacao_escolhida = alocacao
+                st.session_state.retorno_esperado = retorno_total
+                st.session_state.etapa_carteira = 3
+                st.rerun()    # ETAPA 3: ATIVOS ESPECÍFICOS
+    elif st.session_state.etapa_carteira == 3:
+        st.markdown("---")
+        st.subheader("📈 Passo 3: Escolha seus ativos com análise inteligente")
+        valor = st.session_state.valor_investir
+        alocacao = st.session_state.alocacao_escolhida
+        carteira_montada = []
+        for classe, dados in alocacao.items():
+            valor_classe = valor * dados['pct']/100
+            with st.expander(f"### 📌 {classe} - R$ {valor_classe:,.2f} ({dados['pct']}%)", expanded=True):
+                st.caption(f"Retorno esperado para esta classe: {dados['retorno']*100:.1f}% a.a.")
+                if classe in ATIVOS:
+                    for ativo in ATIVOS[classe]:
+                        with st.container():
+                            with st.spinner(f"Analisando {ativo['ticker']}..."):
+                                dados_hist = buscar_dados_historicos(ativo['ticker'])
+                                status, msg_status, cor_status, explicacao, pontuacao = analisar_preco_ativo(ativo['ticker'], dados_hist)
+                            col1, col2, col3, col4, col5, col6 = st.columns([1.2, 2, 1, 1, 1.5, 1.2])
+                            with col1:
+                                st.write(f"**{ativo['ticker']}**")
+                            with col2:
+                                st.write(ativo['nome'][:20] + "...")
+                            with col3:
+                                st.write(f"R$ {ativo['preco']:.2f}")
+                            with col4:
+                                if status == "neutro" and msg_status == "🔵 DADOS INSUFICIENTES":
+                                    st.markdown(f"<span style='color:{cor_status}' title='Ativos de renda fixa não possuem histórico de preços para análise comparativa.'>🔵 DADOS INSUF.</span>", unsafe_allow_html=True)
+                                else:
+                                    st.markdown(f"<span style='color:{cor_status}'>{msg_status[:10]}...</span>", unsafe_allow_html=True)
+                            with col5:
+                                cotas_max = int(valor_classe // ativo['preco'])
+                                if cotas_max > 0:
+                                    cotas = st.number_input("Qtd", min_value=0, max_value=cotas_max, value=0, step=1, key=f"qtd_{classe}_{ativo['ticker']}", label_visibility="collapsed")
+                                else:
+                                    cotas = 0
+                                    st.write("💰")
+                            with col6:
+                                if st.button("🔍", key=f"info_{ativo['ticker']}", help="Ver análise detalhada"):
+                                    st.session_state[f"show_info_{ativo['ticker']}"] = not st.session_state.get(f"show_info_{ativo['ticker']}", False)
+                            if st.session_state.get(f"show_info_{ativo['ticker']}", False):
+                                with st.container():
+                                    st.markdown(f"<div style='background-color: #1A1A1A; padding: 10px; border-radius: 5px; margin: 5px 0;'>", unsafe_allow_html=True)
+                                    st.markdown(explicacao)
+                                    if dados_hist:
+                                        fig = plotar_grafico_historico(dados_hist, ativo['ticker'])
+                                        if fig:
+                                            st.plotly_chart(fig, use_container_width=True)
+                                    if st.button("Ocultar", key=f"hide_{ativo['ticker']}"):
+                                        st.session_state[f"show_info_{ativo['ticker']}"] = False
+                                        st.rerun()
+                                    st.markdown("</div>", unsafe_allow_html=True)
+                            if cotas > 0:
+                                investimento = cotas * ativo['preco']
+                                if investimento <= valor_classe:
+                                    carteira_montada.append({
+                                        "Classe": classe,
+                                        "Ticker": ativo['ticker'],
+                                        "Nome": ativo['nome'],
+                                        "Preço": ativo['preco'],
+                                        "Cotas": cotas,
+                                        "Investimento": investimento,
+                                        "Status": status,
+                                        "Pontuação": pontuacao
+                                    })
+                            st.divider()
+        if carteira_montada:
+            st.markdown("---")
+            st.success("### 🎯 Sua carteira montada!")
+            df_final = pd.DataFrame(carteira_montada)
+            total_investido = df_final['Investimento'].sum()
+            sobra = valor - total_investido
+            df_resumo = df_final.groupby('Classe').agg({'Investimento': 'sum', 'Ticker': 'count'}).reset_index()
+            df_resumo.columns = ['Classe', 'Investido', 'Qtd Ativos']
+            col_r1, col_r2 = st.columns(2)
+            with col_r1:
+                st.subheader("📊 Resumo por Classe")
+                for _, row in df_resumo.iterrows():
+                    pct_real = (row['Investido'] / valor) * 100
+                    st.write(f"**{row['Classe']}:** R$ {row['Investido']:,.2f} ({pct_real:.1f}%) - {row['Qtd Ativos']} ativos")
+            with col_r2:
+                st.subheader("📈 Retorno Estimado")
+                st.metric("Retorno Anual", f"{st.session_state.retorno_esperado*100:.1f}%")
+                renda_mensal = total_investido * st.session_state.retorno_esperado / 12
+                st.metric("Renda Mensal", f"R$ {renda_mensal:,.2f}")
+            st.subheader("📋 Ativos Selecionados")
+            df_display = df_final[['Ticker', 'Nome', 'Preço', 'Cotas', 'Investimento', 'Status']].copy()
+            def colorir_status(val):
+                if val == 'oportunidade':
+                    return 'background-color: #006400'
+                elif val == 'barato':
+                    return 'background-color: #006400'
+                elif val == 'neutro':
+                    return 'background-color: #8B6914'
+                elif val == 'atencao':
+                    return 'background-color: #8B4500'
+                elif val == 'caro':
+                    return 'background-color: #8B0000'
+                return ''
+            st.dataframe(df_display.style.format({'Preço': 'R$ {:.2f}', 'Investimento': 'R$ {:.2f}'}).applymap(colorir_status, subset=['Status']), width='stretch')
+            col_f1, col_f2, col_f3 = st.columns(3)
+            with col_f1:
+                st.metric("Total investido", f"R$ {total_investido:,.2f}")
+            with col_f2:
+                st.metric("Sobra", f"R$ {sobra:,.2f}")
+            with col_f3:
+                st.metric("Cotas totais", df_final['Cotas'].sum())
+            if sobra > 0:
+                st.info(f"💡 Com R$ {sobra:.2f} de sobra, você pode aumentar posições existentes ou guardar para o próximo aporte")
+            col_b1, col_b2, col_b3 = st.columns(3)
+            with col_b1:
+                if st.button("🔄 Recomeçar", use_container_width=True):
+                    st.session_state.etapa_carteira = 1
+                    st.rerun()
+            with col_b2:
+                if st.button("💾 Salvar na Carteira", use_container_width=True):
+                    for _, ativo in df_final.iterrows():
+                        salvar_ativo(user_id, ativo['Ticker'], ativo['Cotas'], ativo['Preço'], ativo['Classe'])
+                    st.balloons()
+                    st.success("✅ Todos os ativos foram salvos na sua carteira!")
+                    st.info("📋 Vá para o Dashboard para acompanhar seus investimentos")
+            with col_b3:
+                if st.button("📊 Ver Dashboard", use_container_width=True):
+                    st.session_state.etapa_carteira = 1
+                    st.rerun()
+        else:
+            st.info("👆 Selecione as quantidades de cada ativo para montar sua carteira")
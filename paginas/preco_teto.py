@@ -0,0 +1,47 @@
+# paginas/preco_teto.py
+import streamlit as st
+import pandas as pd
+from modules.database import carregar_ativos
+from modules.analise import pegar_precos
+from services.dividendos_service import dividendos_service
+
+def show_preco_teto(user_id):
+    st.title("💰 Preço Teto - Método Bazin")
+    st.caption("Baseado nos dividendos dos últimos 12 meses")
+    df = carregar_ativos(user_id)
+    if df.empty:
+        st.info("Adicione ativos para calcular preço teto")
+    else:
+        col_t1, col_t2 = st.columns(2)
+        with col_t1:
+            dy_desejado = st.slider("📊 Dividend Yield desejado (%)", 4, 12, 6) / 100
+            st.caption("6% é o padrão do método Bazin")
+        with col_t2:
+            st.metric("DY Selecionado", f"{dy_desejado*100:.1f}%")
+        resultados_teto = []
+        # Proventos de 12 meses já resumidos localmente + um único download de cotações
+        resumos = dividendos_service.resumos(df['ticker'].tolist())
+        cotacoes = pegar_precos(df['ticker'].tolist())
+        for ticker in df['ticker']:
+            soma_12m = resumos[ticker]['soma_12m']
+            preco_atual, _, _ = cotacoes[ticker]
+            if soma_12m > 0 and preco_atual:
+                preco_teto = soma_12m / dy_desejado
+                diferenca = (preco_teto - preco_atual) / preco_atual * 100
+                if preco_atual <= preco_teto:
+                    status = "✅ COMPRAR"
+                else:
+                    status = "⏳ ESPERAR"
+                resultados_teto.append({
+                    'Ticker': ticker,
+                    'Preço Atual': preco_atual,
+                    'Proventos 12m': soma_12m,
+                    'DY 12m %': soma_12m / preco_atual * 100,
+                    'Preço Teto': preco_teto,
+                    'Diferença %': diferenca,
+                    'Status': status
+                })
+        if resultados_teto:
+            df_teto = pd.DataFrame(resultados_teto)
+            st.dataframe(df_teto.style.format({'Preço Atual': 'R$ {:.2f}', 'Proventos 12m': 'R$ {:.2f}', 'DY 12m %': '{:.2f}%',
+                                               'Preço Teto': 'R$ {:.2f}', 'Diferença %': '{:.1f}%'}), width='stretch', height=400)
@@ -0,0 +1,59 @@
+# paginas/scanner.py
+import streamlit as st
+from config.settings import CATEGORIAS_SCANNER
+from modules.analise import analisar_preco_ativo, buscar_dados_historicos, plotar_grafico_historico
+from services.scanner_service import obter_scanner
+
+def show_scanner(user_id):
+    st.title("🔍 Scanner de Oportunidades")
+    st.markdown("### Encontre ativos baratos em diversas categorias")
+    categoria = st.selectbox("Escolha uma categoria para analisar", list(CATEGORIAS_SCANNER))
+    sensibilidade = st.select_slider("Sensibilidade da análise", 
+                                     options=["Conservador", "Moderado", "Agressivo"], 
+                                     value="Moderado")
+    # Os snapshots são recalculados em segundo plano; a página só lê o último
+    scanner = obter_scanner()
+    snapshot = scanner.snapshot(categoria)
+    if st.button("🔄 Recalcular agora", use_container_width=True) or snapshot is None:
+        with st.spinner(f"Analisando {len(CATEGORIAS_SCANNER[categoria])} ativos..."):
+            snapshot = scanner.calcular(categoria)
+    if snapshot is None or snapshot.resultado.empty:
+        st.warning("Nenhum dado encontrado para os ativos desta categoria.")
+    else:
+        st.caption(f"🕐 Calculado em {snapshot.calculado_em.strftime('%d/%m/%Y %H:%M')} "
+                   f"· atualizado automaticamente a cada {scanner.intervalo // 60} min")
+        # A sensibilidade só reclassifica as pontuações guardadas, sem novo download
+        df_scan = snapshot.tabela(sensibilidade).sort_values("Pontuação", ascending=True)
+        st.subheader("Resultados ordenados (mais baratos primeiro)")
+        def colorir_status(val):
+            if val == 'oportunidade':
+                return 'background-color: #006400; color: white'
+            elif val == 'barato':
+                return 'background-color: #32CD32; color: black'
+            elif val == 'neutro':
+                return 'background-color: #D4AF37; color: black'
+            elif val == 'atencao':
+                return 'background-color: #FFA500; color: black'
+            elif val == 'caro':
+                return 'background-color: #8B0000; color: white'
+            return ''
+        st.dataframe(
+            df_scan.style.format({
+                "Preço": "R$ {:.2f}",
+                "DY (%)": "{:.2f}%",
+                "Pontuação": "{:.0f}"
+            }).applymap(colorir_status, subset=["Status"]),
+            width='stretch',
+            height=400
+        )
+        st.subheader("🔎 Ver análise detalhada")
+        ticker_detalhe = st.selectbox("Selecione um ativo para análise completa", df_scan['Ticker'].tolist())
+        if ticker_detalhe:
+            dados_hist = buscar_dados_historicos(ticker_detalhe)
+            if dados_hist:
+                status, msg, cor, explicacao, pontuacao = analisar_preco_ativo(ticker_detalhe, dados_hist)
+                st.markdown(f"<h3 style='color:{cor}'>{msg}</h3>", unsafe_allow_html=True)
+                st.markdown(explicacao)
+                fig = plotar_grafico_historico(dados_hist, ticker_detalhe)
+                if fig:
+                    st.plotly_chart(fig, use_container_width=True)
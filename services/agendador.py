@@ -0,0 +1,40 @@
+# services/agendador.py
+import threading
+
+class Agendador:
+    """Executa uma tarefa a cada `intervalo` segundos numa thread daemon.
+
+    A primeira execução acontece logo ao iniciar. Erros da tarefa são
+    registrados e não interrompem o ciclo seguinte.
+    """
+
+    def __init__(self, nome: str, intervalo: float, tarefa):
+        self.nome = nome
+        self.intervalo = intervalo
+        self.tarefa = tarefa
+        self._parar = threading.Event()
+        self._thread = None
+
+    @property
+    def ativo(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def iniciar(self):
+        if self.ativo:
+            return
+        self._parar.clear()
+        self._thread = threading.Thread(target=self._loop, name=self.nome, daemon=True)
+        self._thread.start()
+
+    def parar(self, timeout: float = None):
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _loop(self):
+        while not self._parar.is_set():
+            try:
+                self.tarefa()
+            except Exception as e:
+                print(f"Erro no agendador {self.nome}: {e}")
+            self._parar.wait(self.intervalo)
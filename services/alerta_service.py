@@ -0,0 +1,179 @@
+# services/alerta_service.py
+import bisect
+import threading
+from datetime import datetime
+import streamlit as st
+from config.settings import settings
+from database.pool import obter_pool
+from services.agendador import Agendador
+from services.cache_mercado import obter_cache_mercado
+from services.preco_service import PrecoService
+
+ACIMA = "Acima de R$"
+ABAIXO = "Abaixo de R$"
+
+class _Gatilhos:
+    """Preços-alvo de um ticker e sentido, em ordem crescente, com os ids alinhados."""
+
+    def __init__(self):
+        self.precos = []
+        self.ids = []
+
+    def adicionar(self, preco: float, alerta_id: str):
+        pos = bisect.bisect_right(self.precos, preco)
+        self.precos.insert(pos, preco)
+        self.ids.insert(pos, alerta_id)
+
+    def remover(self, preco: float, alerta_id: str):
+        pos = bisect.bisect_left(self.precos, preco)
+        while pos < len(self.ids) and self.ids[pos] != alerta_id:
+            pos += 1
+        if pos < len(self.ids):
+            del self.precos[pos]
+            del self.ids[pos]
+
+    def __len__(self):
+        return len(self.ids)
+
+
+class IndiceAlertas:
+    """Alertas ativos por ticker: alvos "acima" e "abaixo" ordenados para busca binária.
+
+    Uma cotação encontra todos os alertas disparados em O(log n + k): os
+    "acima" com alvo <= preço são um prefixo da lista, os "abaixo" com
+    alvo >= preço são um sufixo.
+    """
+
+    def __init__(self, alertas=()):
+        self._por_ticker = {}  # ticker -> {ACIMA: _Gatilhos, ABAIXO: _Gatilhos}
+        self._alertas = {}     # id -> (user_id, ticker, tipo, preco)
+        for alerta_id, user_id, ticker, tipo, preco in alertas:
+            self.adicionar(alerta_id, user_id, ticker, tipo, preco)
+
+    def __len__(self):
+        return len(self._alertas)
+
+    def tickers(self):
+        return list(self._por_ticker)
+
+    def alerta(self, alerta_id: str):
+        return self._alertas.get(alerta_id)
+
+    def adicionar(self, alerta_id, user_id, ticker, tipo, preco):
+        if tipo not in (ACIMA, ABAIXO):
+            return
+        gatilhos = self._por_ticker.setdefault(ticker, {ACIMA: _Gatilhos(), ABAIXO: _Gatilhos()})
+        gatilhos[tipo].adicionar(preco, alerta_id)
+        self._alertas[alerta_id] = (user_id, ticker, tipo, preco)
+
+    def remover(self, alerta_id):
+        alerta = self._alertas.pop(alerta_id, None)
+        if alerta is None:
+            return
+        _, ticker, tipo, preco = alerta
+        gatilhos = self._por_ticker[ticker]
+        gatilhos[tipo].remover(preco, alerta_id)
+        if not gatilhos[ACIMA] and not gatilhos[ABAIXO]:
+            del self._por_ticker[ticker]
+
+    def disparados(self, ticker: str, preco: float) -> list:
+        """Ids dos alertas de `ticker` cujo alvo foi atingido por `preco`."""
+        gatilhos = self._por_ticker.get(ticker)
+        if gatilhos is None:
+            return []
+        acima, abaixo = gatilhos[ACIMA], gatilhos[ABAIXO]
+        return (acima.ids[:bisect.bisect_right(acima.precos, preco)]
+                + abaixo.ids[bisect.bisect_left(abaixo.precos, preco):])
+
+
+class AlertaService:
+    """Verifica os alertas de todos os usuários em segundo plano.
+
+    A cada ciclo faz uma única busca agrupada das cotações dos tickers com
+    alertas ativos, encontra os disparados pelo `IndiceAlertas` (só com
+    cotações "ok" do dia, nunca com um preço antigo), desativa esses
+    alertas e grava um evento em `alertas_disparados`, que é o que as
+    páginas leem. O índice só é recarregado do banco quando outra conexão
+    gravou algo (`PRAGMA data_version`).
+    """
+
+    def __init__(self, db_path: str, intervalo: int = None, buscar_cotacoes=None):
+        self.db_path = db_path
+        self.buscar_cotacoes = buscar_cotacoes or PrecoService.buscar_cotacoes_batch
+        self._indice = IndiceAlertas()
+        self._versao_dados = None
+        self._conn = None
+        self._lock = threading.Lock()
+        self._agendador = Agendador("alertas", intervalo or settings.ALERTAS_INTERVALO, self.verificar)
+
+    def _conexao(self):
+        # Conexão dedicada: data_version só é comparável dentro da mesma conexão
+        if self._conn is None:
+            self._conn = obter_pool(self.db_path).conectar()
+        return self._conn
+
+    def _sincronizar(self, conn):
+        versao = conn.execute("PRAGMA data_version").fetchone()[0]
+        if versao == self._versao_dados:
+            return
+        self._indice = IndiceAlertas(conn.execute(
+            "SELECT id, user_id, ticker, tipo, preco FROM alertas WHERE ativo = 1"
+        ).fetchall())
+        self._versao_dados = versao
+
+    def verificar(self) -> int:
+        """Um ciclo de verificação; retorna quantos alertas dispararam."""
+        with self._lock:
+            conn = self._conexao()
+            self._sincronizar(conn)
+            tickers = self._indice.tickers()
+            if not tickers:
+                return 0
+            cotacoes = self.buscar_cotacoes(tickers)
+            agora = datetime.now().strftime('%d/%m/%Y %H:%M')
+            eventos = []
+            for ticker in tickers:
+                preco, status = cotacoes.get(ticker, (None, None, None))[:2]
+                # Só dispara com a cotação do dia: preço mantido após falha ou fechamento antigo ("aviso") não serve
+                if not preco or status != "ok":
+                    continue
+                for alerta_id in self._indice.disparados(ticker, preco):
+                    user_id, _, tipo, alvo = self._indice.alerta(alerta_id)
+                    eventos.append((alerta_id, user_id, ticker, tipo, alvo, float(preco), agora))
+            if not eventos:
+                return 0
+            disparados = []
+            try:
+                for evento in eventos:
+                    # O usuário pode ter excluído o alerta desde a última sincronização
+                    if conn.execute("UPDATE alertas SET ativo = 0 WHERE id = ? AND ativo = 1", (evento[0],)).rowcount:
+                        disparados.append(evento)
+                conn.executemany(
+                    """INSERT INTO alertas_disparados (alerta_id, user_id, ticker, tipo, preco_alvo, preco, disparado_em)
+                       VALUES (?, ?, ?, ?, ?, ?, ?)""", disparados)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            for evento in eventos:
+                self._indice.remover(evento[0])
+            return len(disparados)
+
+    def iniciar(self):
+        self._agendador.iniciar()
+
+    def parar(self, timeout: float = None):
+        self._agendador.parar(timeout)
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+@st.cache_resource
+def obter_alertas(db_path: str) -> AlertaService:
+    """Verificador de alertas em segundo plano, um por processo."""
+    cache = obter_cache_mercado()
+    # Alerta dispara sobre preço atual: nada de cotação antiga servida enquanto atualiza
+    servico = AlertaService(db_path, buscar_cotacoes=lambda tickers: cache.cotacoes(tickers, aceitar_antigas=False))
+    servico.iniciar()
+    return servico
@@ -1,5 +1,27 @@
 # services/analise_service.py
+import numpy as np
+import pandas as pd
 from services.preco_service import DadosAtivo
+from services.telemetria_service import cronometrar
+
+# Pregões em 12 meses
+JANELA_12M = 252
+
+def _alinhar_pela_cauda(precos: pd.DataFrame) -> np.ndarray:
+    """Empilha as séries alinhadas pela última observação de cada uma.
+
+    A linha -1 é o último preço de cada ticker, a linha -252 o preço de 252
+    pregões atrás, e assim por diante. Isso reproduz o `tail()`/`iloc[-252]`
+    por ticker mesmo quando os calendários (B3 x EUA) ou o início das séries
+    não coincidem. Ativos com menos histórico ficam com NaN no topo.
+    """
+    colunas = [precos[c].dropna().to_numpy(dtype=float) for c in precos.columns]
+    n = max((len(c) for c in colunas), default=0)
+    matriz = np.full((n, len(colunas)), np.nan)
+    for j, valores in enumerate(colunas):
+        if len(valores):
+            matriz[n - len(valores):, j] = valores
+    return matriz
 
 class AnaliseResultado:
     """Resultado estruturado da análise de preço."""
@@ -37,6 +59,118 @@ class AnaliseService:
         'caro': '#FF4444'
     }
     
+    MENSAGENS = {
+        'oportunidade': "🔥 OPORTUNIDADE! Muito barato",
+        'barato': "👍 Barato - Bom momento",
+        'neutro': "⚖️ Preço justo",
+        'atencao': "⚠️ Atenção - Acima da média",
+        'caro': "❌ CARO! Evite comprar"
+    }
+    
+    # Cortes de pontuação por sensibilidade do Scanner
+    SENSIBILIDADES = {
+        'Conservador': THRESHOLDS,
+        'Moderado': THRESHOLDS,
+        'Agressivo': {
+            'oportunidade': -30,
+            'barato': -10,
+            'neutro': 0,
+            'atencao': 15,
+            'caro': float('inf')
+        }
+    }
+    
+    # Faixas de cada regra da pontuação (as de `analisar`)
+    REGRAS = {
+        'media': (0.15, 0.10),           # desvio da média de 12m para ±25 e ±20 pontos
+        'faixa': (15, 30, 70, 85),       # posição na faixa mín-máx (%) para -25, -15, +15, +25
+        'variacao': (-20, -10, 30, 50)   # variação anual (%) para -20, -10, +15, +25
+    }
+    
+    @classmethod
+    def pontuar(cls, p, m12, p20, p80, min5, max5, var_ano, regras: dict = None):
+        """Mesma pontuação de `analisar`, vetorizada (escalares ou arrays de mesmo formato).
+        
+        `regras` substitui faixas de `REGRAS` (usado na calibração).
+        """
+        regras = {**cls.REGRAS, **(regras or {})}
+        desvio_forte, desvio = regras['media']
+        faixa_min, faixa_baixa, faixa_alta, faixa_max = regras['faixa']
+        queda_forte, queda, alta, alta_forte = regras['variacao']
+        p, m12, p20, p80, min5, max5, var_ano = (
+            np.asarray(x, dtype=float) for x in (p, m12, p20, p80, min5, max5, var_ano))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pos_rel = np.where(max5 > min5, (p - min5) / (max5 - min5) * 100, 50)
+        with np.errstate(invalid='ignore'):
+            pontos_media = np.select(
+                [p < m12 * (1 - desvio_forte), p < m12 * (1 - desvio), p < m12,
+                 p > m12 * (1 + desvio_forte), p > m12 * (1 + desvio), p > m12],
+                [-25, -20, -10, 25, 20, 10], 0)
+            pontos_percentil = np.select([p < p20, p > p80], [-30, 30], 0)
+            pontos_faixa = np.select(
+                [pos_rel < faixa_min, pos_rel < faixa_baixa, pos_rel > faixa_max, pos_rel > faixa_alta],
+                [-25, -15, 25, 15], 0)
+            pontos_variacao = np.select(
+                [var_ano < queda_forte, var_ano < queda, var_ano > alta_forte, var_ano > alta],
+                [-20, -10, 25, 15], 0)
+        return pontos_media + pontos_percentil + pontos_faixa + pontos_variacao
+    
+    @classmethod
+    def classificar(cls, pontuacao, limites: dict = None):
+        """Status de cada pontuação segundo os cortes (`THRESHOLDS` por padrão)."""
+        limites = limites or cls.THRESHOLDS
+        p = np.asarray(pontuacao)
+        return np.select(
+            [p <= limites['oportunidade'], p <= limites['barato'], p <= limites['neutro'], p <= limites['atencao']],
+            ['oportunidade', 'barato', 'neutro', 'atencao'], 'caro')
+    
+    @classmethod
+    @cronometrar("analise")
+    def analisar_universo(cls, precos: pd.DataFrame, precos_atuais: pd.Series = None) -> pd.DataFrame:
+        """Pontua N ativos de uma vez a partir de uma matriz larga de preços ajustados.
+        
+        `precos` tem uma coluna por ticker (índice de datas); `precos_atuais`
+        é o fechamento real usado na comparação, como em `analisar` (se
+        omitido, usa o último preço ajustado). Não gera explicações: use
+        `analisar` apenas para o ativo que o usuário abrir.
+        """
+        precos = precos.loc[:, precos.notna().any()]
+        tickers = list(precos.columns)
+        if not tickers:
+            return pd.DataFrame(columns=['preco_atual', 'pontuacao', 'status', 'mensagem', 'cor'])
+        matriz = _alinhar_pela_cauda(precos)
+        n_validos = np.count_nonzero(~np.isnan(matriz), axis=0)
+        ultimo = matriz[-1]
+        media_12m = np.nanmean(matriz[-JANELA_12M:], axis=0)
+        p20, p80 = np.nanquantile(matriz, [0.20, 0.80], axis=0)
+        minimo = np.nanmin(matriz, axis=0)
+        maximo = np.nanmax(matriz, axis=0)
+        if len(matriz) > JANELA_12M:
+            variacao = np.where(n_validos > JANELA_12M, (ultimo / matriz[-JANELA_12M] - 1) * 100, 0.0)
+        else:
+            variacao = np.zeros(len(tickers))
+        preco = ultimo if precos_atuais is None else precos_atuais.reindex(tickers).fillna(pd.Series(ultimo, index=tickers)).to_numpy(dtype=float)
+        
+        pontuacao = cls.pontuar(preco, media_12m, p20, p80, minimo, maximo, variacao)
+        status = cls.classificar(pontuacao)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            posicao = np.where(maximo > minimo, (preco - minimo) / (maximo - minimo) * 100, 50)
+        return pd.DataFrame({
+            'preco_atual': preco,
+            'preco_medio_12m': media_12m,
+            'preco_medio_5y': np.nanmean(matriz, axis=0),
+            'percentil_20': p20,
+            'percentil_80': p80,
+            'minimo_5y': minimo,
+            'maximo_5y': maximo,
+            'posicao_relativa': posicao,
+            'variacao_anual': variacao,
+            'pontuacao': pontuacao,
+            'status': status,
+            'mensagem': [cls.MENSAGENS[s] for s in status],
+            'cor': [cls.CORES[s] for s in status]
+        }, index=pd.Index(tickers, name='ticker'))
+    
     def analisar(self, dados: DadosAtivo) -> AnaliseResultado:
         """Executa análise completa baseada em dados históricos."""
         
@@ -1,29 +1,138 @@
 # services/auditoria_service.py
+import atexit
+import queue
+import threading
 import streamlit as st
 from datetime import datetime
-from database.repository import DatabaseManager
-from models.ativo import LogAuditoria
+from database.pool import obter_pool
 from config.settings import settings
 
 class AuditoriaService:
-    """Serviço para registro de logs de auditoria."""
-    
-    def __init__(self):
-        self.db = DatabaseManager()
-    
+    """Serviço para registro de logs de auditoria.
+
+    `registrar` só coloca o evento numa fila limitada e retorna; uma thread
+    grava os eventos em lotes (`executemany` + um commit) quando o lote
+    enche ou a cada `intervalo` segundos. Com a fila cheia o evento é
+    descartado e contado, para nunca segurar a renderização da página. O
+    que estiver na fila é gravado ao encerrar o processo.
+    """
+
+    def __init__(self, db_path: str = "database/invest.db", lote: int = None,
+                 intervalo: float = None, capacidade: int = None):
+        self.db_path = db_path
+        self.lote = lote or settings.AUDITORIA_LOTE
+        self.intervalo = intervalo or settings.AUDITORIA_INTERVALO
+        self._fila = queue.Queue(maxsize=capacidade or settings.AUDITORIA_FILA)
+        self._acordar = threading.Event()
+        self._parar = threading.Event()
+        self._lock = threading.Lock()
+        self._contadores = {'enfileirados': 0, 'gravados': 0, 'descartados': 0, 'lotes': 0, 'erros': 0}
+        self._thread = None
+        if settings.ENABLE_AUDIT_LOG:
+            self._thread = threading.Thread(target=self._loop, name="auditoria", daemon=True)
+            self._thread.start()
+            atexit.register(self.encerrar)
+
     def registrar(self, user_id: int, acao: str, detalhes: str = ""):
-        """Registra uma ação do usuário no log."""
-        if not settings.ENABLE_AUDIT_LOG:
+        """Enfileira uma ação do usuário para o log (não bloqueia)."""
+        if self._thread is None:
             return
-        
         try:
             ip = st.context.headers.get('X-Forwarded-For', 'desconhecido') if hasattr(st, 'context') else None
-            with self.db.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT INTO logs_auditoria (user_id, acao, detalhes, ip_address)
-                    VALUES (?, ?, ?, ?)
-                ''', (user_id, acao[:50], detalhes[:500], ip))
+        except Exception:
+            ip = None
+        evento = (user_id, acao[:50], (detalhes or "")[:500], ip, datetime.now().isoformat(timespec='seconds'))
+        try:
+            self._fila.put_nowait(evento)
+        except queue.Full:
+            with self._lock:
+                self._contadores['descartados'] += 1
+            return
+        with self._lock:
+            self._contadores['enfileirados'] += 1
+        if self._fila.qsize() >= self.lote:
+            self._acordar.set()
+
+    def estatisticas(self) -> dict:
+        with self._lock:
+            return {**self._contadores, 'pendentes': self._fila.qsize()}
+
+    def _criar_tabela(self):
+        conn = obter_pool(self.db_path).conectar()
+        try:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS logs_auditoria (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id INTEGER,
+                    acao TEXT NOT NULL,
+                    detalhes TEXT,
+                    ip_address TEXT,
+                    timestamp TEXT NOT NULL
+                )
+            ''')
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _drenar(self) -> list:
+        eventos = []
+        while len(eventos) < self.lote:
+            try:
+                eventos.append(self._fila.get_nowait())
+            except queue.Empty:
+                break
+        return eventos
+
+    def _gravar(self, eventos: list):
+        conn = obter_pool(self.db_path).conectar()
+        try:
+            conn.executemany('''
+                INSERT INTO logs_auditoria (user_id, acao, detalhes, ip_address, timestamp)
+                VALUES (?, ?, ?, ?, ?)
+            ''', eventos)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def flush(self):
+        """Grava tudo o que está na fila, em lotes."""
+        while True:
+            eventos = self._drenar()
+            if not eventos:
+                return
+            try:
+                self._gravar(eventos)
+                with self._lock:
+                    self._contadores['gravados'] += len(eventos)
+                    self._contadores['lotes'] += 1
+            except Exception as e:
+                # Não interrompe a aplicação, apenas loga no console
+                with self._lock:
+                    self._contadores['erros'] += 1
+                    self._contadores['descartados'] += len(eventos)
+                print(f"Erro ao registrar log: {e}")
+                return
+
+    def _loop(self):
+        try:
+            self._criar_tabela()
         except Exception as e:
-            # Não interrompe a aplicação, apenas loga no console
-            print(f"Erro ao registrar log: {e}")
+            print(f"Erro ao criar tabela de auditoria: {e}")
+        while not self._parar.is_set():
+            self._acordar.wait(self.intervalo)
+            self._acordar.clear()
+            self.flush()
+
+    def encerrar(self, timeout: float = 5.0):
+        """Para a thread e grava o que restou na fila."""
+        if self._thread is None:
+            return
+        self._parar.set()
+        self._acordar.set()
+        self._thread.join(timeout)
+        self.flush()
+
+@st.cache_resource
+def obter_auditoria(db_path: str = "database/invest.db") -> AuditoriaService:
+    """Gravador de auditoria em lotes, um por processo."""
+    return AuditoriaService(db_path)
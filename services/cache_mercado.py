@@ -0,0 +1,172 @@
+# services/cache_mercado.py
+import threading
+import time
+from types import MappingProxyType
+import streamlit as st
+from config.settings import settings
+from services.preco_service import PrecoService, _executor, formatar_ticker_yf, historico_store
+from services.single_flight import single_flight
+from services.telemetria_service import telemetria
+
+# Falhas expiram antes, para a próxima sessão tentar de novo
+TTL_FALHA = 30
+
+def _idade(segundos: float) -> str:
+    if segundos < 60:
+        return f"Há {segundos:.0f}s"
+    if segundos < 3600:
+        return f"Há {segundos / 60:.0f} min"
+    return f"Há {segundos / 3600:.0f} h"
+
+class CacheMercado:
+    """Cotações e históricos compartilhados por todas as sessões do processo.
+
+    Diferente de `st.cache_data`, os valores não são serializados nem copiados
+    a cada leitura: todas as sessões recebem o mesmo objeto. Por isso o que sai
+    daqui é somente leitura (tuplas e `MappingProxyType`); os DataFrames dentro
+    dos históricos também são compartilhados e não devem ser alterados.
+
+    Cada ticker expira sozinho, e `invalidar` descarta apenas os tickers pedidos.
+    Sessões que pedem o mesmo ticker vencido ao mesmo tempo compartilham uma
+    única busca (`single_flight`), em vez de cada uma ir ao Yahoo.
+    """
+
+    def __init__(self, ttl_cotacao: int = None, ttl_historico: int = None):
+        self.ttl_cotacao = ttl_cotacao or settings.YF_CACHE_TTL
+        self.ttl_historico = ttl_historico or settings.HISTORICO_TTL
+        self._cotacoes = {}    # ticker -> (expira_em, (preco, status, msg), obtida_em)
+        self._historicos = {}  # (ticker, periodo) -> (expira_em, dados)
+        self._revalidando = set()  # tickers com atualização em segundo plano
+        self._invalidados = set()  # tickers que a próxima leitura busca na hora
+        self._lock = threading.Lock()
+
+    def cotacoes(self, tickers, aceitar_antigas: bool = True) -> dict:
+        """{ticker: (preco, status, msg)}; só os tickers vencidos vão ao Yahoo.
+
+        Com `aceitar_antigas` (stale-while-revalidate), a cotação vencida volta
+        na hora com status "aviso" e a idade na mensagem, e a atualização roda
+        em segundo plano. Ticker que ainda não tem cotação em memória usa o
+        último fechamento do histórico em disco da mesma forma. Só esperam a
+        rede os tickers sem nenhum preço local, os invalidados e as chamadas
+        com `aceitar_antigas=False` (verificação de alertas), para as quais
+        uma entrada "aviso" ainda válida (o último preço bom mantido após uma
+        falha, ou um fechamento que não é de hoje) também conta como ausente.
+        """
+        agora = time.monotonic()
+        resultado, antigas, faltando, forcados = {}, [], [], set()
+        with self._lock:
+            for ticker in dict.fromkeys(tickers):
+                entrada = self._cotacoes.get(ticker)
+                if ticker in self._invalidados:
+                    self._invalidados.discard(ticker)
+                    forcados.add(ticker)
+                    faltando.append(ticker)
+                elif entrada and entrada[0] > agora and (aceitar_antigas or entrada[1][1] != "aviso"):
+                    resultado[ticker] = entrada[1]
+                elif entrada and entrada[1][0] and aceitar_antigas:
+                    resultado[ticker] = (entrada[1][0], "aviso", f"{_idade(agora - entrada[2])} · atualizando")
+                    antigas.append(ticker)
+                else:
+                    faltando.append(ticker)
+        if faltando and aceitar_antigas:
+            do_disco = self._ultimo_fechamento([t for t in faltando if t not in forcados])
+            resultado.update(do_disco)
+            antigas.extend(do_disco)
+            faltando = [t for t in faltando if t not in do_disco]
+        telemetria.contar_cache("CacheMercado.cotacoes", acertos=len(resultado) - len(antigas),
+                                falhas=len(faltando) + len(antigas))
+        if antigas:
+            self._revalidar(antigas)
+        if faltando:
+            novas = self._buscar(faltando)
+            resultado.update(novas)
+        return resultado
+
+    @staticmethod
+    def _ultimo_fechamento(tickers) -> dict:
+        """Última barra do histórico em disco de cada ticker, como cotação "aviso"."""
+        resultado = {}
+        for ticker in tickers:
+            hist = historico_store.carregar(formatar_ticker_yf(ticker))
+            if hist.empty or 'Close' not in hist.columns:
+                continue
+            fechamento = hist['Close'].dropna()
+            if not fechamento.empty:
+                resultado[ticker] = (fechamento.iloc[-1], "aviso",
+                                     f"Último: {fechamento.index[-1].strftime('%d/%m')} · atualizando")
+        return resultado
+
+    def _buscar(self, tickers) -> dict:
+        novas = single_flight.executar_lote(
+            "cotacao", tickers, lambda lote: PrecoService.buscar_cotacoes_batch(tuple(lote)))
+        agora = time.monotonic()
+        with self._lock:
+            for ticker, cotacao in novas.items():
+                anterior = self._cotacoes.get(ticker)
+                if cotacao[1] != "erro":
+                    self._cotacoes[ticker] = (agora + self.ttl_cotacao, cotacao, agora)
+                elif anterior and anterior[1][0]:
+                    # Mantém o último preço bom; ele volta a ser servido como antigo após TTL_FALHA
+                    self._cotacoes[ticker] = (agora + TTL_FALHA, (anterior[1][0], "aviso",
+                                              f"{_idade(agora - anterior[2])} · sem atualização"), anterior[2])
+                else:
+                    self._cotacoes[ticker] = (agora + TTL_FALHA, cotacao, agora)
+        return novas
+
+    def _revalidar(self, tickers):
+        """Atualiza `tickers` no pool de downloads, sem bloquear quem leu a cotação antiga."""
+        with self._lock:
+            tickers = [t for t in tickers if t not in self._revalidando]
+            self._revalidando.update(tickers)
+        if not tickers:
+            return
+
+        def _tarefa():
+            try:
+                self._buscar(tickers)
+            except Exception as e:
+                print(f"Erro ao atualizar cotações em segundo plano: {e}")
+            finally:
+                with self._lock:
+                    self._revalidando.difference_update(tickers)
+
+        try:
+            _executor.submit(_tarefa)
+        except RuntimeError:  # pool encerrado (fim do processo)
+            with self._lock:
+                self._revalidando.difference_update(tickers)
+
+    def cotacao(self, ticker: str):
+        return self.cotacoes([ticker])[ticker]
+
+    def historico(self, ticker: str, periodo: str, carregar):
+        """Dados históricos de `ticker`, calculados por `carregar(ticker, periodo)` quando vencidos."""
+        chave = (ticker, periodo)
+        with self._lock:
+            entrada = self._historicos.get(chave)
+        if entrada and entrada[0] > time.monotonic():
+            telemetria.contar_cache("CacheMercado.historico", acertos=1)
+            return entrada[1]
+        telemetria.contar_cache("CacheMercado.historico", falhas=1)
+        dados = single_flight.executar(("historico", ticker, periodo), lambda: carregar(ticker, periodo))
+        if isinstance(dados, dict):
+            dados = MappingProxyType(dados)
+        ttl = self.ttl_historico if dados else TTL_FALHA
+        with self._lock:
+            self._historicos[chave] = (time.monotonic() + ttl, dados)
+        return dados
+
+    def invalidar(self, tickers):
+        """Descarta cotações e históricos apenas dos tickers informados; a próxima leitura espera a rede."""
+        tickers = set(tickers)
+        with self._lock:
+            for ticker in tickers:
+                self._cotacoes.pop(ticker, None)
+            self._invalidados.update(tickers)
+            for chave in [c for c in self._historicos if c[0] in tickers]:
+                del self._historicos[chave]
+
+@st.cache_resource
+def obter_cache_mercado() -> CacheMercado:
+    """Instância única do cache por processo."""
+    return CacheMercado()
@@ -1 +1,153 @@
+# services/dividendos_service.py
+import threading
+from datetime import date, datetime
+import pandas as pd
+from config.settings import settings
+from database.dividendos_store import DividendosStore
+from services.provedor_mercado import ErroProvedor, obter_provedor
+from services.single_flight import single_flight
+from services.telemetria_service import cronometrar, telemetria
 
+# Regra única de 12 meses (DY, Bazin, Scanner): proventos com data-com nos últimos 365 dias
+JANELA_12M = pd.Timedelta(days=365)
+
+def _normalizar(dividendos: pd.Series) -> pd.Series:
+    """Proventos positivos indexados pela data-com (sem fuso nem hora), um por data."""
+    if dividendos is None or dividendos.empty:
+        return pd.Series(dtype=float, name='valor', index=pd.DatetimeIndex([], name='data_com'))
+    dividendos = dividendos[dividendos > 0]
+    indice = pd.DatetimeIndex(dividendos.index)
+    if indice.tz is not None:
+        indice = indice.tz_localize(None)
+    serie = pd.Series(dividendos.to_numpy(dtype=float), index=indice.normalize().rename('data_com'), name='valor')
+    return serie[~serie.index.duplicated(keep='last')].sort_index()
+
+def resumir(dividendos: pd.Series, hoje: date = None) -> dict:
+    """Soma e quantidade de proventos dos últimos 12 meses, e a última data-com."""
+    serie = _normalizar(dividendos)
+    hoje = hoje or date.today()
+    janela = serie[serie.index > pd.Timestamp(hoje) - JANELA_12M]
+    return {
+        'soma_12m': float(janela.sum()),
+        'pagamentos_12m': int(len(janela)),
+        'ultima_data_com': serie.index[-1].date().isoformat() if not serie.empty else None,
+        'calculado_em': hoje.isoformat()
+    }
+
+
+class DividendosService:
+    """Proventos de cada ticker com o resumo de 12 meses pré-calculado.
+
+    O provedor é consultado no máximo uma vez a cada `settings.DIVIDENDOS_TTL`
+    segundos por ticker; entre uma consulta e outra, proventos novos também
+    chegam pelas barras que o histórico incremental baixa (`registrar`). Os
+    proventos são mesclados por data-com, e o resumo é recalculado quando
+    entra provento novo ou muda o dia, ficando salvo ao lado deles: o preço
+    teto de uma carteira inteira sai de leituras locais. Com o provedor
+    falhando, vale o que já está salvo.
+    """
+
+    def __init__(self, store: DividendosStore = None, ttl: int = None):
+        self.store = store or DividendosStore()
+        self.ttl = ttl or settings.DIVIDENDOS_TTL
+        self._series = {}  # ticker_yf -> Series de proventos
+        self._metas = {}   # ticker_yf -> {'atualizado_em', 'resumo'}
+        self._lock = threading.Lock()
+
+    def _meta(self, ticker_yf: str) -> dict:
+        meta = self._metas.get(ticker_yf)
+        if meta is None:
+            meta = self._metas[ticker_yf] = self.store.carregar_meta(ticker_yf)
+        return meta
+
+    def _serie(self, ticker_yf: str) -> pd.Series:
+        serie = self._series.get(ticker_yf)
+        if serie is None:
+            serie = self._series[ticker_yf] = _normalizar(self.store.carregar(ticker_yf))
+        return serie
+
+    def registrar(self, ticker_yf: str, dividendos: pd.Series, consultado: bool = False):
+        """Mescla `dividendos` aos salvos por data-com; `consultado` marca uma consulta completa ao provedor."""
+        novos = _normalizar(dividendos)
+        with self._lock:
+            atual = self._serie(ticker_yf)
+            combinado = pd.concat([atual, novos]) if not novos.empty else atual
+            combinado = combinado[~combinado.index.duplicated(keep='last')].sort_index()
+            mudou = not combinado.equals(atual)
+            if not (mudou or consultado):
+                return
+            meta = dict(self._meta(ticker_yf))
+            if consultado:
+                meta['atualizado_em'] = datetime.now().isoformat()
+            meta['resumo'] = resumir(combinado)
+            self._series[ticker_yf] = combinado
+            self._metas[ticker_yf] = meta
+            if mudou:
+                self.store.salvar(ticker_yf, combinado, meta)
+            else:
+                self.store.salvar_meta(ticker_yf, meta)
+
+    def _vencido(self, ticker_yf: str) -> bool:
+        atualizado_em = self._meta(ticker_yf).get('atualizado_em')
+        return not atualizado_em or (datetime.now() - datetime.fromisoformat(atualizado_em)).total_seconds() >= self.ttl
+
+    def _consultar(self, ticker_yf: str):
+        try:
+            dividendos = obter_provedor().dividendos(ticker_yf)
+        except ErroProvedor as e:
+            print(f"Proventos de {ticker_yf} servidos do disco: {e}")
+            return
+        self.registrar(ticker_yf, dividendos, consultado=True)
+
+    def _resumo(self, ticker_yf: str) -> dict:
+        hoje = date.today()
+        with self._lock:
+            resumo = self._meta(ticker_yf).get('resumo')
+            if resumo and resumo['calculado_em'] == hoje.isoformat():
+                return resumo
+            serie = self._serie(ticker_yf)
+        resumo = resumir(serie, hoje)
+        with self._lock:
+            self._metas[ticker_yf] = {**self._meta(ticker_yf), 'resumo': resumo}
+        return resumo
+
+    @cronometrar("mercado")
+    def resumos(self, tickers, prazo_total: float = None) -> dict:
+        """{ticker: resumo de 12 meses}; só os tickers com consulta vencida vão ao provedor, em paralelo."""
+        # Import local: o preco_service importa este módulo para o histórico registrar proventos
+        from services.preco_service import _em_paralelo, formatar_ticker_yf
+        mapa = {t: formatar_ticker_yf(t) for t in dict.fromkeys(tickers)}
+        with self._lock:
+            vencidos = [t for t, ticker_yf in mapa.items() if self._vencido(ticker_yf)]
+        telemetria.contar_cache("DividendosService.resumos", acertos=len(mapa) - len(vencidos), falhas=len(vencidos))
+
+        def _atualizar(ticker):
+            single_flight.executar(("dividendos", mapa[ticker]), lambda: self._consultar(mapa[ticker]))
+
+        if len(vencidos) == 1:
+            _atualizar(vencidos[0])
+        elif vencidos:
+            _em_paralelo(_atualizar, vencidos, prazo_total or settings.YF_TIMEOUT * 2)
+        return {t: self._resumo(ticker_yf) for t, ticker_yf in mapa.items()}
+
+    def resumo(self, ticker: str) -> dict:
+        return self.resumos([ticker])[ticker]
+
+    def dividend_yield(self, ticker: str, preco: float):
+        """DY (%) dos últimos 12 meses sobre `preco`; None sem proventos ou sem preço."""
+        soma = self.resumo(ticker)['soma_12m']
+        if not preco or preco <= 0 or soma <= 0:
+            return None
+        return soma / preco * 100
+
+    def preco_teto(self, ticker: str, dy_desejado: float = 0.06):
+        """Preço teto de Bazin: proventos dos últimos 12 meses / DY desejado. Retorna (preco_teto, mensagem)."""
+        soma = self.resumo(ticker)['soma_12m']
+        if soma <= 0:
+            return None, "Sem dividendos nos últimos 12 meses"
+        preco_teto = soma / dy_desejado
+        return preco_teto, f"R$ {preco_teto:.2f}"
+
+
+# Instância do processo, compartilhada pelas páginas, pelo Scanner e pelo histórico incremental
+dividendos_service = DividendosService()
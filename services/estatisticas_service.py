@@ -0,0 +1,225 @@
+# services/estatisticas_service.py
+import bisect
+import math
+import threading
+from collections import deque
+import pandas as pd
+
+# Pregões em 12 meses
+JANELA_12M = 252
+
+class EstatisticasRolantes:
+    """Estatísticas do 'Adj Close' de uma janela por data, mantidas barra a barra.
+
+    As barras "fechadas" ficam em estruturas incrementais: soma corrente (média
+    da janela), soma dos últimos 251 valores (média de 12 meses), lista ordenada
+    (percentis) e deques monotônicos (mínimo e máximo). A barra mais recente
+    fica separada, porque é regravada várias vezes durante o pregão; ela só
+    entra nas estruturas quando chega a barra do dia seguinte e é combinada
+    com elas na consulta. Os resultados batem com `tail(252).mean()`,
+    `quantile()`, `min()`/`max()` e `iloc[-252]` sobre a mesma janela.
+    """
+
+    def __init__(self, periodo: str = "5y", base: str = None):
+        self.periodo = periodo
+        self.base = base  # identifica o download completo que originou o histórico
+        self.ultima = None  # [data, valor] da barra mais recente
+        self._janela = deque()  # [data, valor] das barras fechadas, em ordem
+        self._ordenados = []
+        self._soma = 0.0
+        self._ultimos_12m = deque()  # últimos JANELA_12M - 1 valores fechados
+        self._soma_12m = 0.0
+        self._minimos = deque()  # [seq, valor] crescente em valor
+        self._maximos = deque()  # [seq, valor] decrescente em valor
+        self._seq = 0  # seq da próxima barra fechada
+        self._seq_inicio = 0  # seq da primeira barra da janela
+
+    def __len__(self):
+        return len(self._janela) + (1 if self.ultima else 0)
+
+    def adicionar(self, data: str, valor: float) -> bool:
+        """Inclui a barra de `data` ('AAAA-MM-DD'); a mesma data substitui a barra corrente.
+
+        Retorna False se a barra for anterior à mais recente (o histórico
+        foi reescrito e as estatísticas precisam ser reconstruídas).
+        """
+        if valor is None or math.isnan(valor):
+            return True
+        if self.ultima is None or data > self.ultima[0]:
+            if self.ultima is not None:
+                self._fechar(*self.ultima)
+            self.ultima = [data, valor]
+            return True
+        if data == self.ultima[0]:
+            self.ultima[1] = valor
+            return True
+        return False
+
+    def _fechar(self, data: str, valor: float):
+        self._janela.append([data, valor])
+        bisect.insort(self._ordenados, valor)
+        self._soma += valor
+        if len(self._ultimos_12m) == JANELA_12M - 1:
+            self._soma_12m -= self._ultimos_12m.popleft()
+        self._ultimos_12m.append(valor)
+        self._soma_12m += valor
+        while self._minimos and self._minimos[-1][1] >= valor:
+            self._minimos.pop()
+        self._minimos.append([self._seq, valor])
+        while self._maximos and self._maximos[-1][1] <= valor:
+            self._maximos.pop()
+        self._maximos.append([self._seq, valor])
+        self._seq += 1
+
+    def descartar_anteriores(self, inicio: str):
+        """Remove da janela as barras fechadas anteriores a `inicio`."""
+        while self._janela and self._janela[0][0] < inicio:
+            _, valor = self._janela.popleft()
+            del self._ordenados[bisect.bisect_left(self._ordenados, valor)]
+            self._soma -= valor
+            # Janela com menos de 12 meses: a barra também sai da média de 12m
+            if len(self._ultimos_12m) > len(self._janela):
+                self._soma_12m -= self._ultimos_12m.popleft()
+            self._seq_inicio += 1
+            if self._minimos and self._minimos[0][0] < self._seq_inicio:
+                self._minimos.popleft()
+            if self._maximos and self._maximos[0][0] < self._seq_inicio:
+                self._maximos.popleft()
+
+    def _ordem(self, k: int) -> float:
+        """k-ésimo menor valor entre as barras fechadas e a corrente."""
+        atual = self.ultima[1]
+        pos = bisect.bisect_left(self._ordenados, atual)
+        if k < pos:
+            return self._ordenados[k]
+        if k == pos:
+            return atual
+        return self._ordenados[k - 1]
+
+    def _quantil(self, q: float) -> float:
+        # Interpolação linear, como pandas.Series.quantile
+        h = (len(self) - 1) * q
+        baixo = math.floor(h)
+        v_baixo = self._ordem(baixo)
+        if h == baixo:
+            return v_baixo
+        return v_baixo + (h - baixo) * (self._ordem(baixo + 1) - v_baixo)
+
+    def resumo(self) -> dict:
+        """Métricas da janela atual em O(1); vazio se não houver barras."""
+        if self.ultima is None:
+            return {}
+        atual = self.ultima[1]
+        n = len(self)
+        if n > JANELA_12M:
+            variacao_anual = (atual / self._ultimos_12m[0] - 1) * 100
+        else:
+            variacao_anual = 0
+        return {
+            'preco_medio_12m': (self._soma_12m + atual) / (len(self._ultimos_12m) + 1),
+            'preco_medio_5y': (self._soma + atual) / n,
+            'percentil_20': self._quantil(0.20),
+            'percentil_80': self._quantil(0.80),
+            'minimo_5y': min(self._minimos[0][1], atual) if self._minimos else atual,
+            'maximo_5y': max(self._maximos[0][1], atual) if self._maximos else atual,
+            'variacao_anual': variacao_anual
+        }
+
+    def para_dict(self) -> dict:
+        return {
+            'periodo': self.periodo,
+            'base': self.base,
+            'ultima': self.ultima,
+            'janela': list(self._janela),
+            'ordenados': self._ordenados,
+            'soma': self._soma,
+            'ultimos_12m': list(self._ultimos_12m),
+            'soma_12m': self._soma_12m,
+            'minimos': list(self._minimos),
+            'maximos': list(self._maximos),
+            'seq': self._seq,
+            'seq_inicio': self._seq_inicio
+        }
+
+    @classmethod
+    def de_dict(cls, dados: dict) -> "EstatisticasRolantes":
+        est = cls(dados['periodo'], dados.get('base'))
+        est.ultima = dados['ultima']
+        est._janela = deque(dados['janela'])
+        est._ordenados = dados['ordenados']
+        est._soma = dados['soma']
+        est._ultimos_12m = deque(dados['ultimos_12m'])
+        est._soma_12m = dados['soma_12m']
+        est._minimos = deque(dados['minimos'])
+        est._maximos = deque(dados['maximos'])
+        est._seq = dados['seq']
+        est._seq_inicio = dados['seq_inicio']
+        return est
+
+    @classmethod
+    def construir(cls, serie: pd.Series, periodo: str, base: str = None) -> "EstatisticasRolantes":
+        """Reconstrói do zero a partir de uma série 'Adj Close' já recortada na janela."""
+        est = cls(periodo, base)
+        for data, valor in zip(serie.index.strftime('%Y-%m-%d'), serie.to_numpy(dtype=float)):
+            est.adicionar(data, valor)
+        # Soma exata na reconstrução, para não herdar erro de arredondamento
+        est._soma = math.fsum(v for _, v in est._janela)
+        est._soma_12m = math.fsum(est._ultimos_12m)
+        return est
+
+
+class EstatisticasService:
+    """Registro por ticker das `EstatisticasRolantes`, em memória e em disco.
+
+    O registro fica ao lado do histórico no `HistoricoStore`. A cada chamada
+    só as barras a partir da última incluída são processadas; quando o
+    histórico foi baixado de novo (dividendo, desdobramento ou período maior),
+    o 'Adj Close' antigo mudou e o registro é reconstruído.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._registros = {}
+        self._lock = threading.Lock()
+
+    def _carregar(self, ticker_yf: str):
+        est = self._registros.get(ticker_yf)
+        if est is None:
+            dados = self.store.carregar_estatisticas(ticker_yf)
+            if dados:
+                try:
+                    est = EstatisticasRolantes.de_dict(dados)
+                except (KeyError, TypeError):
+                    est = None
+        return est
+
+    def atualizar(self, ticker_yf: str, hist: pd.DataFrame, periodo: str, inicio) -> dict:
+        """Sincroniza o registro com `hist` (já recortado a partir de `inicio`) e devolve o resumo."""
+        if hist.empty or 'Adj Close' not in hist.columns:
+            return {}
+        base = self.store.carregar_meta(ticker_yf).get('base')
+        serie = hist['Adj Close']
+        with self._lock:
+            est = self._carregar(ticker_yf)
+            alterado = False
+            if est is None or est.periodo != periodo or est.base != base or est.ultima is None:
+                est, alterado = EstatisticasRolantes.construir(serie, periodo, base), True
+            else:
+                marco = pd.Timestamp(est.ultima[0])
+                if serie.index.tz is not None:
+                    marco = marco.tz_localize(serie.index.tz)
+                novos = serie.iloc[serie.index.searchsorted(marco):]
+                antes = (est.ultima[0], est.ultima[1], len(est))
+                for data, valor in zip(novos.index.strftime('%Y-%m-%d'), novos.to_numpy(dtype=float)):
+                    if not est.adicionar(data, valor):
+                        est = EstatisticasRolantes.construir(serie, periodo, base)
+                        break
+                alterado = (est.ultima[0], est.ultima[1], len(est)) != antes
+            if inicio is not None:
+                tamanho = len(est)
+                est.descartar_anteriores(inicio.strftime('%Y-%m-%d'))
+                alterado = alterado or len(est) != tamanho
+            self._registros[ticker_yf] = est
+            if alterado:
+                self.store.salvar_estatisticas(ticker_yf, est.para_dict())
+            return est.resumo()
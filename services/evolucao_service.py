@@ -0,0 +1,208 @@
+# services/evolucao_service.py
+import threading
+import time
+import numpy as np
+import pandas as pd
+from config.settings import settings
+from database.transacoes import aplicar_evento, posicao_vazia
+from services.preco_service import _inicio_periodo
+from services.risco_service import TTL_INCOMPLETA, RiscoService
+from services.telemetria_service import cronometrar
+
+# Maior período aceito pelo Yahoo antes de "max"
+ANOS_MAX_YF = 10
+
+def _periodo_busca(periodo: str) -> str:
+    if periodo.endswith("y") and int(periodo[:-1]) > ANOS_MAX_YF:
+        return "max"
+    return periodo
+
+def xirr(datas, valores, chute: float = 0.1) -> float:
+    """Taxa anual que zera o valor presente dos fluxos (Newton, com bisseção de reserva).
+
+    `valores` do ponto de vista do investidor: aportes negativos, resgates e
+    o patrimônio final positivos. NaN se os fluxos não trocam de sinal.
+    """
+    valores = np.asarray(valores, dtype=float)
+    if not (valores > 0).any() or not (valores < 0).any():
+        return float('nan')
+    datas = pd.DatetimeIndex(datas)
+    anos = ((datas - datas[0]).days.to_numpy() / 365.0)
+
+    def vpl(taxa):
+        return np.sum(valores / (1 + taxa) ** anos)
+
+    taxa = chute
+    for _ in range(50):
+        fator = (1 + taxa) ** anos
+        f = np.sum(valores / fator)
+        derivada = np.sum(-anos * valores / (fator * (1 + taxa)))
+        if derivada == 0 or not np.isfinite(derivada):
+            break
+        nova = taxa - f / derivada
+        if nova <= -1:
+            nova = (taxa - 1) / 2
+        if abs(nova - taxa) < 1e-10:
+            return float(nova)
+        taxa = nova
+
+    baixo, alto = -0.9999, 10.0
+    if vpl(baixo) * vpl(alto) > 0:
+        return float('nan')
+    for _ in range(200):
+        meio = (baixo + alto) / 2
+        if vpl(baixo) * vpl(meio) <= 0:
+            alto = meio
+        else:
+            baixo = meio
+    return float((baixo + alto) / 2)
+
+
+class EvolucaoCarteira:
+    """Patrimônio diário reconstruído a partir do livro de transações.
+
+    `diario` tem as colunas 'Patrimônio' (quantidade na data x fechamento),
+    'Investido' (custo das posições abertas), 'Fluxo' (entradas menos
+    saídas do dia a valor de mercado; proventos contam como saída) e
+    'Rentabilidade' (retorno ponderado pelo tempo acumulado, em %).
+    """
+
+    def __init__(self, diario: pd.DataFrame, por_ativo: pd.DataFrame, ausentes=()):
+        self.diario = diario
+        self.por_ativo = por_ativo
+        self.ausentes = list(ausentes)  # tickers sem histórico, fora do patrimônio
+
+    @property
+    def vazia(self) -> bool:
+        return self.diario.empty
+
+    @property
+    def twr(self) -> float:
+        """Retorno ponderado pelo tempo no período (%)."""
+        return float(self.diario['Rentabilidade'].iloc[-1]) if not self.vazia else 0.0
+
+    @property
+    def mwr(self) -> float:
+        """Retorno ponderado pelo dinheiro (TIR anual dos fluxos, %)."""
+        if self.vazia:
+            return float('nan')
+        patrimonio = self.diario['Patrimônio'].to_numpy()
+        fluxos = -self.diario['Fluxo'].to_numpy()
+        # O patrimônio do primeiro dia já inclui os fluxos do dia: entra como aporte inicial
+        fluxos[0] = -patrimonio[0]
+        fluxos[-1] += patrimonio[-1]
+        return xirr(self.diario.index, fluxos) * 100
+
+
+class EvolucaoService:
+    """Valorização histórica da carteira, com cache por (usuário, versão do livro, período)."""
+
+    _cache = {}  # (user_id, versao, periodo) -> (expira_em, EvolucaoCarteira)
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _posicoes_por_evento(livro: pd.DataFrame) -> pd.DataFrame:
+        """Quantidade, custo e fluxo após cada evento, com a quantidade em cotas de hoje.
+
+        O 'Close' do Yahoo já vem ajustado por desdobramentos; multiplicar a
+        quantidade pelo fator dos desdobramentos posteriores deixa as duas
+        na mesma unidade (e a quantidade contínua no dia do desdobramento).
+        """
+        linhas = []
+        for ticker, eventos in livro.groupby('ticker', sort=False):
+            posicao = posicao_vazia(None)
+            for data, tipo, qtd, preco, taxas in eventos[['data', 'tipo', 'qtd', 'preco', 'taxas']].itertuples(index=False):
+                qtd_antes = posicao['qtd']
+                aplicar_evento(posicao, tipo, qtd, preco, taxas, None)
+                if tipo == 'compra':
+                    fluxo = qtd * preco + taxas
+                elif tipo == 'venda':
+                    fluxo = -(qtd * preco - taxas)
+                elif tipo == 'dividendo':
+                    fluxo = -qtd * preco
+                else:
+                    fluxo = 0.0
+                fator = qtd if tipo == 'desdobramento' else 1.0
+                linhas.append((data, ticker, tipo, posicao['qtd'], posicao['qtd'] * posicao['pm'],
+                               fluxo, posicao['qtd'] - qtd_antes if tipo == 'ajuste' else 0.0, fator))
+        eventos = pd.DataFrame(linhas, columns=['data', 'ticker', 'tipo', 'qtd', 'custo', 'fluxo', 'delta_ajuste', 'fator'])
+        # Produto dos fatores dos desdobramentos estritamente posteriores, por ticker
+        fator_total = eventos.groupby('ticker')['fator'].transform('prod')
+        fator_ate_aqui = eventos.groupby('ticker')['fator'].cumprod()
+        eventos['fator_futuro'] = fator_total / fator_ate_aqui
+        eventos['data'] = pd.to_datetime(eventos['data'])
+        return eventos
+
+    @classmethod
+    @cronometrar("analise")
+    def calcular(cls, livro: pd.DataFrame, periodo: str = "1y") -> EvolucaoCarteira:
+        """Junta o livro (ordenado por data e id) com a matriz de preços em uma passada vetorizada."""
+        vazia = EvolucaoCarteira(pd.DataFrame(columns=['Patrimônio', 'Investido', 'Fluxo', 'Rentabilidade']),
+                                 pd.DataFrame())
+        if livro.empty:
+            return vazia
+        eventos = cls._posicoes_por_evento(livro)
+        tickers = list(dict.fromkeys(eventos['ticker']))
+        precos = RiscoService.matriz_precos(tickers, _periodo_busca(periodo), coluna='Close')
+        vazia.ausentes = RiscoService.ausentes(tickers, precos)
+        if precos.empty:
+            return vazia
+        inicio = max(pd.Timestamp(_inicio_periodo(periodo)).tz_localize(None).normalize()
+                     if periodo != "max" else precos.index[0], eventos['data'].min())
+        precos = precos.loc[precos.index >= inicio].ffill()
+        if precos.empty:
+            return vazia
+        datas = precos.index
+
+        # Último estado de cada ticker em cada data com evento, propagado para os pregões
+        ultimos = eventos.groupby(['data', 'ticker']).last()
+        qtd = (ultimos['qtd'] * ultimos['fator_futuro']).unstack('ticker')
+        custo = ultimos['custo'].unstack('ticker')
+        calendario = qtd.index.union(datas)
+        qtd = qtd.reindex(calendario).ffill().reindex(datas).fillna(0.0).reindex(columns=precos.columns, fill_value=0.0)
+        custo = custo.reindex(calendario).ffill().reindex(datas).fillna(0.0)
+
+        valores = qtd * precos.fillna(0.0)
+        patrimonio = valores.sum(axis=1)
+
+        # Fluxos: eventos antes do início entram no patrimônio inicial; os demais caem no pregão seguinte
+        eventos = eventos[eventos['data'] >= datas[0]]
+        pregao = datas[np.minimum(datas.searchsorted(eventos['data']), len(datas) - 1)]
+        # Ajustes (edição manual) entram ou saem a valor de mercado
+        linhas_p = datas.get_indexer(pregao)
+        colunas_p = precos.columns.get_indexer(eventos['ticker'])
+        preco_evento = np.where(colunas_p >= 0, precos.to_numpy()[linhas_p, colunas_p], np.nan)
+        ajuste = eventos['delta_ajuste'].to_numpy() * eventos['fator_futuro'].to_numpy() * np.nan_to_num(preco_evento)
+        fluxo = pd.Series(eventos['fluxo'].to_numpy() + ajuste, index=pregao).groupby(level=0).sum()
+        fluxo = fluxo.reindex(datas, fill_value=0.0)
+
+        # Retorno diário ponderado pelo tempo: (V_t - F_t) / V_{t-1} - 1
+        v = patrimonio.to_numpy()
+        anterior = np.concatenate(([0.0], v[:-1]))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            retorno = np.where(anterior > 0, (v - fluxo.to_numpy()) / anterior - 1, 0.0)
+        rentabilidade = (np.cumprod(1 + retorno) - 1) * 100
+
+        diario = pd.DataFrame({
+            'Patrimônio': patrimonio,
+            'Investido': custo.sum(axis=1),
+            'Fluxo': fluxo,
+            'Rentabilidade': rentabilidade
+        }, index=datas)
+        return EvolucaoCarteira(diario, valores.loc[:, (valores != 0).any()], vazia.ausentes)
+
+    @classmethod
+    def avaliar(cls, user_id, versao: int, periodo: str, carregar_livro) -> EvolucaoCarteira:
+        """`calcular` com cache; `carregar_livro()` só é chamado quando a versão ou o TTL mudam."""
+        chave = (user_id, versao, periodo)
+        agora = time.monotonic()
+        with cls._lock:
+            entrada = cls._cache.get(chave)
+            if entrada and entrada[0] > agora:
+                return entrada[1]
+        evolucao = cls.calcular(carregar_livro(), periodo)
+        with cls._lock:
+            for vencida in [c for c, (expira, _) in cls._cache.items() if expira <= agora or (c[0] == user_id and c[1] != versao)]:
+                del cls._cache[vencida]
+            cls._cache[chave] = (agora + (TTL_INCOMPLETA if evolucao.ausentes else settings.HISTORICO_TTL), evolucao)
+        return evolucao
@@ -0,0 +1,60 @@
+# services/imposto_service.py
+import pandas as pd
+
+# Alíquota e limite mensal de vendas isentas (None = sem isenção) por classe
+REGRAS_IR = {
+    'Ações': (0.15, 20000.0),
+    'ETF/BDR': (0.15, None),
+    'FII': (0.20, None),
+}
+
+def classe_ir(setor) -> str:
+    """Classe de apuração do IR a partir do setor da posição; None se fica fora da apuração."""
+    setor = setor or ''
+    if setor.startswith('FII'):
+        return 'FII'
+    if setor == 'Ações':
+        return 'Ações'
+    if setor in ('ETF', 'BDR'):
+        return 'ETF/BDR'
+    return None
+
+
+class ImpostoService:
+    """Apuração mensal do IR sobre vendas (operações comuns), a partir do livro de transações."""
+
+    @staticmethod
+    def apurar_mensal(vendas: pd.DataFrame) -> pd.DataFrame:
+        """IR de cada mês com vendas, com o prejuízo compensado dentro de cada classe.
+
+        `vendas` tem as colunas data, setor, qtd, preco e resultado; deve
+        incluir os anos anteriores para que o prejuízo acumulado chegue
+        certo ao ano consultado. Só Ações têm a isenção de R$ 20 mil em
+        vendas no mês; um lucro isento não consome prejuízo, mas o prejuízo
+        de um mês isento continua compensável.
+        """
+        colunas = ['Mês'] + [f'{p} {c}' for c in REGRAS_IR for p in ('Vendas', 'Lucro')] + \
+                  ['Prejuízo a compensar', 'IR devido']
+        vendas = vendas.assign(classe=vendas['setor'].map(classe_ir)).dropna(subset=['classe'])
+        if vendas.empty:
+            return pd.DataFrame(columns=colunas)
+        vendas = vendas.assign(mes=vendas['data'].str[:7], valor=vendas['qtd'] * vendas['preco'],
+                               resultado=vendas['resultado'].fillna(0.0))
+        por_mes = vendas.groupby(['mes', 'classe'])[['valor', 'resultado']].sum()
+
+        prejuizo = dict.fromkeys(REGRAS_IR, 0.0)
+        linhas = []
+        for mes in sorted(vendas['mes'].unique()):
+            linha = {'Mês': mes, 'IR devido': 0.0}
+            for classe, (aliquota, limite_isencao) in REGRAS_IR.items():
+                valor, lucro = por_mes.loc[(mes, classe)] if (mes, classe) in por_mes.index else (0.0, 0.0)
+                linha[f'Vendas {classe}'], linha[f'Lucro {classe}'] = valor, lucro
+                if lucro < 0:
+                    prejuizo[classe] -= lucro
+                elif lucro > 0 and not (limite_isencao and valor <= limite_isencao):
+                    base = max(lucro - prejuizo[classe], 0.0)
+                    prejuizo[classe] = max(prejuizo[classe] - lucro, 0.0)
+                    linha['IR devido'] += base * aliquota
+            linha['Prejuízo a compensar'] = sum(prejuizo.values())
+            linhas.append(linha)
+        return pd.DataFrame(linhas, columns=colunas)
@@ -1,6 +1,118 @@
+import time
 import streamlit as st
 import pandas as pd
-import yfinance as ticker_data # Exemplo usando yfinance
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime
+from config.settings import settings
+from database.historico_store import HistoricoStore
+from services.dividendos_service import dividendos_service, resumir
+from services.estatisticas_service import EstatisticasService
+from services.provedor_mercado import ErroProvedor, obter_provedor
+from services.single_flight import single_flight
+from services.telemetria_service import cronometrar, telemetria
+
+historico_store = HistoricoStore()
+estatisticas_service = EstatisticasService(historico_store)
+
+# Pool compartilhado pelo processo: downloads que estouram o prazo de uma página
+# continuam em segundo plano e alimentam o histórico em disco para a próxima leitura
+_executor = ThreadPoolExecutor(max_workers=settings.MAX_WORKERS, thread_name_prefix="precos")
+
+# Eventos que reescrevem a coluna 'Adj Close' (e 'Close', no caso de desdobramento) de todo o passado
+COLUNAS_EVENTOS = ['Dividends', 'Stock Splits']
+
+# Série da telemetria do histórico: acerto = servido do disco, falha = foi ao provedor de mercado
+METRICA_HISTORICO = "PrecoService.buscar_historico_incremental"
+
+def formatar_ticker_yf(ticker: str) -> str:
+    """PETR4 -> PETR4.SA; tickers internacionais ficam como estão."""
+    return f"{ticker}.SA" if ticker[-1].isdigit() else ticker
+
+def _inicio_periodo(periodo: str):
+    """Converte um período do yfinance ('5y', '6mo', 'ytd', 'max'...) na data inicial."""
+    hoje = pd.Timestamp.now().normalize()
+    if periodo == "max":
+        return None
+    if periodo == "ytd":
+        return hoje.replace(month=1, day=1)
+    if periodo.endswith("mo"):
+        return hoje - pd.DateOffset(months=int(periodo[:-2]))
+    if periodo.endswith("wk"):
+        return hoje - pd.DateOffset(weeks=int(periodo[:-2]))
+    if periodo.endswith("y"):
+        return hoje - pd.DateOffset(years=int(periodo[:-1]))
+    if periodo.endswith("d"):
+        return hoje - pd.DateOffset(days=int(periodo[:-1]))
+    raise ValueError(f"Período inválido: {periodo}")
+
+def _cobre_periodo(periodo_salvo, periodo: str) -> bool:
+    if not periodo_salvo:
+        return False
+    inicio_salvo = _inicio_periodo(periodo_salvo)
+    if inicio_salvo is None:
+        return True
+    # O arquivo só cresce para frente, então cobre ao menos o período com que foi baixado
+    inicio = _inicio_periodo(periodo)
+    return inicio is not None and inicio_salvo <= inicio
+
+def _recortar(hist: pd.DataFrame, periodo: str) -> pd.DataFrame:
+    inicio = _inicio_periodo(periodo)
+    if inicio is None or hist.empty:
+        return hist
+    if hist.index.tz is not None:
+        inicio = inicio.tz_localize(hist.index.tz)
+    return hist[hist.index >= inicio]
+
+def calcular_dividend_yield(hist: pd.DataFrame, preco_atual: float):
+    """DY (%) a partir da coluna 'Dividends' do histórico, sem outra ida à rede (mesma regra de 12 meses do DividendosService)."""
+    if 'Dividends' not in hist.columns or not preco_atual or preco_atual <= 0:
+        return None
+    dividends_12m = resumir(hist['Dividends'])['soma_12m']
+    if dividends_12m <= 0:
+        return None
+    return (dividends_12m / preco_atual) * 100
+
+def _registrar_proventos(ticker_yf: str, barras: pd.DataFrame):
+    """Leva os proventos das barras recém-baixadas ao DividendosService, sem outra ida à rede."""
+    if 'Dividends' in barras.columns and (barras['Dividends'].fillna(0) > 0).any():
+        dividendos_service.registrar(ticker_yf, barras['Dividends'])
+
+def _em_paralelo(funcao, tickers, prazo_total):
+    """Executa `funcao(ticker)` no pool compartilhado; devolve ({ticker: resultado}, [tickers fora do prazo])."""
+    futuros = {_executor.submit(funcao, t): t for t in tickers}
+    concluidos, pendentes = wait(futuros, timeout=prazo_total)
+    for futuro in pendentes:
+        futuro.cancel()
+    return {futuros[f]: f.result() for f in concluidos}, [futuros[f] for f in pendentes]
+
+
+class DadosAtivo:
+    """Preço atual, métricas históricas e histórico bruto de um ativo."""
+
+    def __init__(self, ticker: str, status: str, mensagem: str = "",
+                 preco_atual: float = 0.0, preco_medio_12m: float = 0.0,
+                 preco_medio_5y: float = 0.0, percentil_20: float = 0.0,
+                 percentil_80: float = 0.0, minimo_5y: float = 0.0,
+                 maximo_5y: float = 0.0, variacao_anual: float = 0.0,
+                 dividend_yield: float = None, historico: pd.DataFrame = None):
+        self.ticker = ticker
+        self.status = status  # "ok", "erro" ou "timeout"
+        self.mensagem = mensagem
+        self.preco_atual = preco_atual
+        self.preco_medio_12m = preco_medio_12m
+        self.preco_medio_5y = preco_medio_5y
+        self.percentil_20 = percentil_20
+        self.percentil_80 = percentil_80
+        self.minimo_5y = minimo_5y
+        self.maximo_5y = maximo_5y
+        self.variacao_anual = variacao_anual
+        self.dividend_yield = dividend_yield
+        self.historico = historico if historico is not None else pd.DataFrame()
+
+    @classmethod
+    def falha(cls, ticker: str, status: str, mensagem: str) -> "DadosAtivo":
+        return cls(ticker=ticker, status=status, mensagem=mensagem)
+
 
 class PrecoService:
     @staticmethod
@@ -8,16 +120,188 @@ class PrecoService:
     def buscar_cotacao_atual(ticker):
         """Busca o preço atual de um ativo com proteção de cache."""
         try:
-            stock = ticker_data.Ticker(f"{ticker}.SA")
-            info = stock.fast_info
-            return info['last_price']
+            return obter_provedor().ultimo_preco(f"{ticker}.SA")
         except Exception as e:
             st.error(f"Erro ao buscar cotação de {ticker}: {e}")
             return 0.0
 
+    @staticmethod
+    @cronometrar("mercado")
+    def buscar_cotacoes_batch(tickers):
+        """Cotação de vários ativos em um único download agrupado.
+
+        Retorna {ticker: (preco, status, msg)} no mesmo formato de `pegar_preco`.
+        """
+        tickers = list(dict.fromkeys(tickers))
+        if not tickers:
+            return {}
+        mapa = {formatar_ticker_yf(t): t for t in tickers}
+        try:
+            dados = obter_provedor().fechamentos(list(mapa), periodo="2d")
+        except Exception as e:
+            return {t: (None, "erro", str(e)) for t in tickers}
+        telemetria.contar_bytes("PrecoService.buscar_cotacoes_batch", dados.memory_usage(deep=True).sum())
+        hoje = datetime.now().date()
+        resultado = {}
+        for ticker_yf, ticker in mapa.items():
+            fechamento = dados[ticker_yf].dropna() if ticker_yf in dados.columns else pd.Series(dtype=float)
+            if fechamento.empty:
+                resultado[ticker] = (None, "erro", "Sem dados disponíveis")
+                continue
+            preco = fechamento.iloc[-1]
+            ultima_data = fechamento.index[-1].date()
+            if ultima_data == hoje:
+                resultado[ticker] = (preco, "ok", "Atualizado")
+            else:
+                resultado[ticker] = (preco, "aviso", f"Último: {ultima_data.strftime('%d/%m')}")
+        return resultado
+
+    @staticmethod
+    def _buscar_dados_single(ticker, periodo="5y") -> DadosAtivo:
+        """Monta o DadosAtivo de um ticker a partir do histórico incremental."""
+        try:
+            hist, estatisticas = PrecoService.buscar_estatisticas(formatar_ticker_yf(ticker), periodo)
+            if hist.empty:
+                return DadosAtivo.falha(ticker, "erro", "Sem dados disponíveis")
+            preco_atual = hist['Close'].iloc[-1]
+            dy = calcular_dividend_yield(hist, preco_atual)
+            return DadosAtivo(
+                ticker=ticker,
+                status="ok",
+                preco_atual=preco_atual,
+                dividend_yield=dy,
+                **estatisticas,
+                historico=hist
+            )
+        except Exception as e:
+            return DadosAtivo.falha(ticker, "erro", str(e))
+
+    @staticmethod
+    def buscar_precos_batch(tickers, prazo_total: float = None) -> dict:
+        """Busca os dados de vários ativos em paralelo (até `settings.MAX_WORKERS` ao mesmo tempo).
+
+        Cada download respeita `settings.YF_TIMEOUT`; o lote inteiro respeita
+        `prazo_total` (padrão: 2x o timeout). Tickers que não terminam a tempo
+        voltam com status "timeout" e os que falham com status "erro", sem
+        derrubar o restante do lote.
+        """
+        tickers = list(dict.fromkeys(tickers))
+        if prazo_total is None:
+            prazo_total = settings.YF_TIMEOUT * 2
+        inicio = time.monotonic()
+        resultado, pendentes = _em_paralelo(PrecoService._buscar_dados_single, tickers, prazo_total)
+        for ticker in pendentes:
+            resultado[ticker] = DadosAtivo.falha(ticker, "timeout", f"Sem resposta em {time.monotonic() - inicio:.0f}s")
+        return {t: resultado[t] for t in tickers}
+
+    @staticmethod
+    def buscar_historicos_batch(tickers, periodo="5y", prazo_total: float = None) -> dict:
+        """Históricos de vários ativos em paralelo; tickers sem dados, com erro ou fora do prazo ficam de fora."""
+        tickers = list(dict.fromkeys(tickers))
+        if prazo_total is None:
+            prazo_total = settings.YF_TIMEOUT * 2
+
+        def _buscar(ticker):
+            try:
+                return PrecoService.buscar_historico_incremental(formatar_ticker_yf(ticker), periodo)
+            except Exception as e:
+                print(f"Erro ao buscar histórico de {ticker}: {e}")
+                return pd.DataFrame()
+
+        resultado, _ = _em_paralelo(_buscar, tickers, prazo_total)
+        return {t: resultado[t] for t in tickers if t in resultado and not resultado[t].empty}
+
     @staticmethod
     @st.cache_data(ttl=3600) # Cache de 1 hora para dados históricos
     def buscar_historico(ticker, period="1y"):
-        stock = ticker_data.Ticker(f"{ticker}.SA")
-        return stock.history(period=period)
-        
+        return PrecoService.buscar_historico_incremental(f"{ticker}.SA", period)
+
+    @staticmethod
+    @cronometrar("mercado")
+    def buscar_historico_incremental(ticker_yf, periodo="5y"):
+        """Histórico diário (sem ajuste automático) servido do disco.
+
+        Só vai à rede para baixar as barras posteriores à última salva, e no
+        máximo uma vez a cada `settings.HISTORICO_TTL` segundos por ticker.
+        O download completo do período acontece apenas na primeira vez, quando
+        um período maior é pedido ou quando um dividendo/desdobramento novo
+        invalida o 'Adj Close' já gravado. Chamadas simultâneas para o mesmo
+        ticker e período (Scanner, alertas, páginas) fazem uma única
+        sincronização e recebem cópias do resultado. Com o provedor falhando
+        (circuito aberto, limite de taxa), serve o que já está em disco.
+        """
+        return single_flight.executar(("historico_disco", ticker_yf, periodo),
+                                      lambda: PrecoService._historico_ou_disco(ticker_yf, periodo),
+                                      copiar=pd.DataFrame.copy)
+
+    @staticmethod
+    def expirar_historicos(tickers):
+        """Faz a próxima leitura de `tickers` sincronizar com a rede, ignorando `settings.HISTORICO_TTL`."""
+        for ticker in tickers:
+            historico_store.expirar(formatar_ticker_yf(ticker))
+
+    @staticmethod
+    def _historico_ou_disco(ticker_yf, periodo):
+        try:
+            return PrecoService._sincronizar_historico(ticker_yf, periodo)
+        except ErroProvedor:
+            hist = historico_store.carregar(ticker_yf)
+            if hist.empty:
+                raise
+            return _recortar(hist, periodo)
+
+    @staticmethod
+    def _sincronizar_historico(ticker_yf, periodo):
+        hist = historico_store.carregar(ticker_yf)
+        meta = historico_store.carregar_meta(ticker_yf)
+        provedor = obter_provedor()
+
+        if hist.empty or not _cobre_periodo(meta.get('periodo'), periodo):
+            telemetria.contar_cache(METRICA_HISTORICO, falhas=1)
+            novo = provedor.historico(ticker_yf, periodo=periodo)
+            if novo.empty and periodo != "max":
+                periodo = "max"
+                novo = provedor.historico(ticker_yf, periodo=periodo)
+            telemetria.contar_bytes(METRICA_HISTORICO, novo.memory_usage(deep=True).sum())
+            if novo.empty:
+                return hist
+            hist = historico_store.salvar(ticker_yf, novo, periodo)
+            _registrar_proventos(ticker_yf, novo)
+            return _recortar(hist, periodo)
+
+        atualizado_em = meta.get('atualizado_em')
+        if atualizado_em and (datetime.now() - datetime.fromisoformat(atualizado_em)).total_seconds() < settings.HISTORICO_TTL:
+            telemetria.contar_cache(METRICA_HISTORICO, acertos=1)
+            return _recortar(hist, periodo)
+        telemetria.contar_cache(METRICA_HISTORICO, falhas=1)
+
+        # Refaz a partir da última barra salva, que pode ter sido gravada com o pregão em andamento
+        ultima = hist.index[-1]
+        novos = provedor.historico(ticker_yf, inicio=ultima.date())
+        telemetria.contar_bytes(METRICA_HISTORICO, novos.memory_usage(deep=True).sum())
+        if novos.empty:
+            historico_store.marcar_sincronizado(ticker_yf)
+            return _recortar(hist, periodo)
+        eventos = novos.loc[novos.index > ultima, [c for c in COLUNAS_EVENTOS if c in novos.columns]]
+        if (eventos.fillna(0) != 0).any().any():
+            periodo_salvo = meta.get('periodo', periodo)
+            completo = provedor.historico(ticker_yf, periodo=periodo_salvo)
+            telemetria.contar_bytes(METRICA_HISTORICO, completo.memory_usage(deep=True).sum())
+            if not completo.empty:
+                hist = historico_store.salvar(ticker_yf, completo, periodo_salvo)
+                _registrar_proventos(ticker_yf, completo)
+                return _recortar(hist, periodo)
+        hist = historico_store.anexar(ticker_yf, novos)
+        _registrar_proventos(ticker_yf, novos)
+        return _recortar(hist, periodo)
+
+    @staticmethod
+    def buscar_estatisticas(ticker_yf, periodo="5y"):
+        """(histórico, métricas) do período; as métricas vêm do registro rolante do ticker.
+
+        As chaves são as de `DadosAtivo`: preco_medio_12m, preco_medio_5y,
+        percentil_20, percentil_80, minimo_5y, maximo_5y e variacao_anual.
+        """
+        hist = PrecoService.buscar_historico_incremental(ticker_yf, periodo)
+        estatisticas = estatisticas_service.atualizar(ticker_yf, hist, periodo, _inicio_periodo(periodo))
+        return hist, estatisticas
@@ -0,0 +1,356 @@
+# services/provedor_mercado.py
+import json
+import random
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from config.settings import settings
+from services.resiliencia import BaldeTokens, Disjuntor
+from services.telemetria_service import telemetria
+
+# Formato de `yf.Ticker.history(auto_adjust=False)`, que o HistoricoStore grava
+COLUNAS_HISTORICO = ['Open', 'High', 'Low', 'Close', 'Adj Close', 'Volume', 'Dividends', 'Stock Splits']
+
+# Recuo entre tentativas: 0.5s, 1s, 2s... (com jitter), sempre dentro de settings.YF_TIMEOUT
+RECUO_INICIAL = 0.5
+RECUO_MAXIMO = 8.0
+
+class ErroProvedor(Exception):
+    """Falha ao obter dados de mercado (inclusive as falhas sintéticas do replay)."""
+
+
+class FalhaTransporte(ErroProvedor):
+    """Falha de acesso (rede, tempo esgotado, limite de requisições), e não do dado pedido."""
+
+
+class CircuitoAberto(ErroProvedor):
+    """O provedor falhou seguidamente e está em pausa; quem chama deve servir o que tem guardado."""
+
+
+class ProvedorMercado(ABC):
+    """Fonte dos dados de mercado do app: históricos, cotações, proventos e câmbio.
+
+    Os tickers chegam no formato do Yahoo (PETR4.SA, ^BVSP, USDBRL=X) e os
+    históricos saem no formato de `Ticker.history(auto_adjust=False)`, com
+    índice com fuso. Ticker sem dados devolve DataFrame/Series vazio; falha
+    de acesso levanta exceção, que os serviços já tratam por ticker.
+    """
+
+    nome = "base"
+
+    @abstractmethod
+    def historico(self, ticker_yf: str, periodo: str = None, inicio=None) -> pd.DataFrame:
+        """Barras diárias do `periodo` ('5y', 'max'...) ou a partir da data `inicio`."""
+
+    @abstractmethod
+    def fechamentos(self, tickers_yf, periodo: str = "2d") -> pd.DataFrame:
+        """Fechamentos recentes de vários tickers numa chamada só, uma coluna por ticker."""
+
+    @abstractmethod
+    def dividendos(self, ticker_yf: str) -> pd.Series:
+        """Proventos por ação, indexados pela data-com."""
+
+    @abstractmethod
+    def ultimo_preco(self, ticker_yf: str) -> float:
+        """Último preço negociado."""
+
+    def cambio(self, moeda: str = "USD", base: str = "BRL") -> float:
+        """Quanto vale uma unidade de `moeda` em `base`."""
+        return self.ultimo_preco(f"{moeda}{base}=X")
+
+
+class ProvedorYahoo(ProvedorMercado):
+    """Yahoo Finance via yfinance (importado só na primeira chamada)."""
+
+    nome = "yahoo"
+
+    def __init__(self, timeout: int = None):
+        self.timeout = timeout or settings.YF_TIMEOUT
+
+    @staticmethod
+    def _yf():
+        import yfinance
+        return yfinance
+
+    def historico(self, ticker_yf, periodo=None, inicio=None):
+        acao = self._yf().Ticker(ticker_yf)
+        if inicio is not None:
+            return acao.history(start=inicio, auto_adjust=False, timeout=self.timeout)
+        return acao.history(period=periodo or "1mo", auto_adjust=False, timeout=self.timeout)
+
+    def fechamentos(self, tickers_yf, periodo="2d"):
+        tickers_yf = list(tickers_yf)
+        dados = self._yf().download(tickers_yf, period=periodo, group_by="ticker", auto_adjust=False,
+                                    progress=False, threads=True, timeout=self.timeout)
+        if not isinstance(dados.columns, pd.MultiIndex):
+            # Um ticker só: o yfinance pode devolver as colunas sem o nível do ticker
+            return pd.DataFrame({tickers_yf[0]: dados['Close']}) if 'Close' in dados.columns else pd.DataFrame()
+        presentes = [t for t in tickers_yf if t in dados.columns.get_level_values(0)]
+        return pd.DataFrame({t: dados[t]['Close'] for t in presentes}, index=dados.index)
+
+    def dividendos(self, ticker_yf):
+        return self._yf().Ticker(ticker_yf).dividends
+
+    def ultimo_preco(self, ticker_yf):
+        return self._yf().Ticker(ticker_yf).fast_info['last_price']
+
+
+class ProvedorReplay(ProvedorMercado):
+    """Mercado offline servido das gravações em Parquet de `infra/scripts/gravar_fixtures.py`.
+
+    As datas de cada gravação são transladadas para terminar no último pregão
+    até hoje, então períodos relativos ("1y", "5y") e a cotação "de hoje" se
+    comportam como no Yahoo. Tickers sem gravação são derivados de uma
+    gravação da mesma classe (retornos deslocados, preço reescalado), de
+    forma determinística pelo nome, o que permite simular carteiras e o
+    universo do Scanner inteiros. Cada chamada espera `latencia_ms`
+    (±50%) e falha com `FalhaTransporte` com probabilidade `taxa_erro`.
+    """
+
+    nome = "replay"
+
+    def __init__(self, diretorio: str = None, latencia_ms: float = None, taxa_erro: float = None,
+                 semente: int = None, gravacoes: dict = None, derivar: bool = True):
+        self.latencia = (settings.REPLAY_LATENCIA_MS if latencia_ms is None else latencia_ms) / 1000
+        self.taxa_erro = settings.REPLAY_TAXA_ERRO if taxa_erro is None else taxa_erro
+        self.derivar = derivar
+        self._aleatorio = random.Random(semente)
+        self._lock = threading.Lock()
+        if gravacoes is None:
+            gravacoes = self._ler_gravacoes(Path(diretorio or settings.REPLAY_DIR))
+        self._series = {t: self._ancorar(h) for t, h in gravacoes.items()}
+        # Bases para derivar tickers desconhecidos: FIIs/ETFs (final 11) e o resto, sem índices e câmbio
+        bases = sorted(t for t in self._series if not t.startswith('^') and not t.endswith('=X'))
+        self._bases = {True: [t for t in bases if self._final_11(t)], False: [t for t in bases if not self._final_11(t)]}
+
+    @staticmethod
+    def _ler_gravacoes(diretorio: Path) -> dict:
+        manifesto = diretorio / "manifest.json"
+        if not manifesto.is_file():
+            raise ErroProvedor(f"Sem gravações em {diretorio} (rode infra/scripts/gravar_fixtures.py)")
+        arquivos = json.loads(manifesto.read_text())['arquivos']
+        return {t: pd.read_parquet(diretorio / arquivo) for t, arquivo in arquivos.items()}
+
+    @staticmethod
+    def _ancorar(hist: pd.DataFrame) -> pd.DataFrame:
+        hoje = pd.Timestamp.now(tz=hist.index.tz).normalize().tz_localize(None)
+        fim = pd.offsets.BDay().rollback(hoje)
+        datas = pd.bdate_range(end=fim, periods=len(hist), tz=hist.index.tz, name=hist.index.name)
+        return hist.reindex(columns=COLUNAS_HISTORICO, fill_value=0.0).set_axis(datas)
+
+    @staticmethod
+    def _final_11(ticker_yf: str) -> bool:
+        return ticker_yf.split('.')[0].endswith('11')
+
+    @staticmethod
+    def _derivar(hist: pd.DataFrame, deslocamento: int, escala: float) -> pd.DataFrame:
+        """Mesma série com os retornos (e proventos) deslocados e o preço reescalado."""
+        close = hist['Close'].to_numpy()
+        retornos = np.roll(np.diff(np.log(close)), deslocamento)
+        novo_close = np.round(close[0] * escala * np.exp(np.concatenate(([0.0], np.cumsum(retornos)))), 2)
+        proporcao = lambda coluna: np.roll((hist[coluna] / hist['Close']).to_numpy(), deslocamento)
+        derivado = pd.DataFrame(index=hist.index)
+        for coluna in ('Open', 'High', 'Low'):
+            derivado[coluna] = np.round(proporcao(coluna) * novo_close, 2)
+        derivado['Close'] = novo_close
+        derivado['Adj Close'] = proporcao('Adj Close') * novo_close
+        derivado['Volume'] = np.roll(hist['Volume'].to_numpy(), deslocamento)
+        derivado['Dividends'] = np.round(proporcao('Dividends') * novo_close, 4)
+        derivado['Stock Splits'] = 0.0
+        return derivado
+
+    def _serie(self, ticker_yf: str) -> pd.DataFrame:
+        serie = self._series.get(ticker_yf)
+        if serie is not None or not self.derivar:
+            return serie if serie is not None else pd.DataFrame(columns=COLUNAS_HISTORICO)
+        bases = self._bases[self._final_11(ticker_yf)] or self._bases[not self._final_11(ticker_yf)]
+        if not bases:
+            return pd.DataFrame(columns=COLUNAS_HISTORICO)
+        codigo = zlib.crc32(ticker_yf.encode())
+        serie = self._derivar(self._series[bases[codigo % len(bases)]], 1 + codigo % 997,
+                              0.5 + (codigo >> 10) % 100 / 50)
+        with self._lock:
+            return self._series.setdefault(ticker_yf, serie)
+
+    def _simular_rede(self):
+        with self._lock:
+            espera = self.latencia * self._aleatorio.uniform(0.5, 1.5) if self.latencia else 0.0
+            falhou = self.taxa_erro > 0 and self._aleatorio.random() < self.taxa_erro
+        if espera:
+            time.sleep(espera)
+        if falhou:
+            raise FalhaTransporte("Falha sintética do provedor replay")
+
+    def historico(self, ticker_yf, periodo=None, inicio=None):
+        from services.preco_service import _inicio_periodo
+        self._simular_rede()
+        hist = self._serie(ticker_yf)
+        if hist.empty:
+            return hist.copy()
+        if inicio is not None:
+            corte = pd.Timestamp(inicio)
+        else:
+            corte = _inicio_periodo(periodo or "1mo")
+        if corte is None:
+            return hist.copy()
+        if corte.tzinfo is None:
+            corte = corte.tz_localize(hist.index.tz)
+        return hist[hist.index >= corte].copy()
+
+    def fechamentos(self, tickers_yf, periodo="2d"):
+        self._simular_rede()
+        barras = int(periodo[:-1]) if periodo.endswith("d") else None
+        colunas = {}
+        for ticker_yf in tickers_yf:
+            hist = self._serie(ticker_yf)
+            if not hist.empty:
+                colunas[ticker_yf] = hist['Close'].tail(barras) if barras else hist['Close']
+        return pd.DataFrame(colunas)
+
+    def dividendos(self, ticker_yf):
+        self._simular_rede()
+        hist = self._serie(ticker_yf)
+        if hist.empty:
+            return pd.Series(dtype=float, name='Dividends')
+        return hist['Dividends'][hist['Dividends'] > 0].copy()
+
+    def ultimo_preco(self, ticker_yf):
+        self._simular_rede()
+        hist = self._serie(ticker_yf)
+        if hist.empty:
+            raise ErroProvedor(f"{ticker_yf}: sem gravação")
+        return float(hist['Close'].iloc[-1])
+
+
+class ProvedorProtegido(ProvedorMercado):
+    """Envolve um provedor com limite de taxa, novas tentativas e circuit breaker.
+
+    Um único `BaldeTokens` e um único `Disjuntor` valem para todas as
+    chamadas do processo (threads do pool incluídas), porque o limite do
+    Yahoo é por cliente, não por tipo de dado. Cada chamada respeita
+    `settings.YF_TIMEOUT` no total: espera por token, tentativas e recuo
+    exponencial com jitter entre elas. Respostas de limite ("Too Many
+    Requests") reduzem a taxa; sucessos a recuperam aos poucos. Só falhas
+    de acesso (rede, tempo esgotado, limite) são repetidas, e cada chamada
+    que esgota as tentativas conta uma falha para o disjuntor; erros do
+    dado (ticker desconhecido, sem gravação) saem na hora e não contam,
+    para um ticker ruim não tirar o mercado do ar para todos. Com o
+    circuito aberto a chamada falha na hora com `CircuitoAberto`. Latência
+    e erros de cada endpoint vão para a telemetria como "<provedor>.<endpoint>".
+    Qualquer falha sai como `ErroProvedor`.
+    """
+
+    def __init__(self, provedor: ProvedorMercado, balde: BaldeTokens = None, disjuntor: Disjuntor = None,
+                 tentativas: int = None, timeout: float = None):
+        self.provedor = provedor
+        self.nome = provedor.nome
+        self.balde = balde or BaldeTokens(settings.YF_TAXA, settings.YF_RAJADA)
+        self.disjuntor = disjuntor or Disjuntor(settings.DISJUNTOR_FALHAS, settings.DISJUNTOR_ESPERA)
+        self.tentativas = tentativas or settings.YF_TENTATIVAS
+        self.timeout = timeout or settings.YF_TIMEOUT
+
+    @staticmethod
+    def _limitado(erro: Exception) -> bool:
+        texto = f"{type(erro).__name__} {erro}"
+        return "RateLimit" in texto or "Too Many Requests" in texto or "429" in texto
+
+    @classmethod
+    def _transitoria(cls, erro: Exception) -> bool:
+        """Falha de acesso, que vale repetir e conta para o disjuntor (OSError cobre rede, timeout e requests)."""
+        if isinstance(erro, (FalhaTransporte, OSError)) or cls._limitado(erro):
+            return True
+        nome = type(erro).__name__
+        return "Timeout" in nome or "Connection" in nome
+
+    def _chamar(self, endpoint: str, funcao, *args, **kwargs):
+        rotulo = f"{self.nome}.{endpoint}"
+        prazo = time.monotonic() + self.timeout
+        # Uma vaga no disjuntor por chamada: as novas tentativas não passam por ele de novo
+        if not self.disjuntor.permitir():
+            raise CircuitoAberto(f"{self.nome} em pausa por falhas seguidas "
+                                 f"(tenta de novo em {self.disjuntor.segundos_para_reabrir():.0f}s)")
+        tentativa = 0
+        while True:
+            if not self.balde.adquirir(prazo - time.monotonic()):
+                if tentativa:
+                    self.disjuntor.falha()
+                else:
+                    self.disjuntor.liberar()
+                raise ErroProvedor(f"{rotulo}: limite de requisições, sem vaga em {self.timeout}s")
+            inicio = time.perf_counter()
+            try:
+                resultado = funcao(*args, **kwargs)
+            except Exception as e:
+                if telemetria.ativa:
+                    telemetria.registrar(rotulo, "rede", time.perf_counter() - inicio, erro=True)
+                if not self._transitoria(e):
+                    # O provedor respondeu; o problema é o dado pedido
+                    self.disjuntor.liberar()
+                    raise ErroProvedor(f"{rotulo}: {e}") from e
+                if self._limitado(e):
+                    self.balde.reduzir()
+                tentativa += 1
+                recuo = min(RECUO_MAXIMO, RECUO_INICIAL * 2 ** (tentativa - 1)) * random.uniform(0.5, 1.5)
+                if tentativa >= self.tentativas or time.monotonic() + recuo >= prazo:
+                    self.disjuntor.falha()
+                    raise ErroProvedor(f"{rotulo}: {e}") from e
+                time.sleep(recuo)
+                continue
+            if telemetria.ativa:
+                telemetria.registrar(rotulo, "rede", time.perf_counter() - inicio)
+            self.balde.aumentar()
+            self.disjuntor.sucesso()
+            return resultado
+
+    def historico(self, ticker_yf, periodo=None, inicio=None):
+        return self._chamar("historico", self.provedor.historico, ticker_yf, periodo=periodo, inicio=inicio)
+
+    def fechamentos(self, tickers_yf, periodo="2d"):
+        return self._chamar("fechamentos", self.provedor.fechamentos, tickers_yf, periodo=periodo)
+
+    def dividendos(self, ticker_yf):
+        return self._chamar("dividendos", self.provedor.dividendos, ticker_yf)
+
+    def ultimo_preco(self, ticker_yf):
+        return self._chamar("ultimo_preco", self.provedor.ultimo_preco, ticker_yf)
+
+    def cambio(self, moeda="USD", base="BRL"):
+        return self._chamar("cambio", self.provedor.cambio, moeda, base)
+
+    def estado(self) -> dict:
+        """Situação do circuito e do limitador, para a página de desempenho."""
+        return {
+            'provedor': self.nome,
+            'circuito': self.disjuntor.estado,
+            'falhas_seguidas': self.disjuntor.falhas,
+            'reabre_em_s': self.disjuntor.segundos_para_reabrir(),
+            'taxa_atual': self.balde.taxa,
+            'taxa_maxima': self.balde.taxa_maxima
+        }
+
+
+PROVEDORES = {ProvedorYahoo.nome: ProvedorYahoo, ProvedorReplay.nome: ProvedorReplay}
+
+_provedor = None
+_lock_provedor = threading.Lock()
+
+def obter_provedor() -> ProvedorMercado:
+    """Provedor do processo, escolhido por `settings.PROVEDOR_MERCADO` ("yahoo" ou "replay") e protegido."""
+    global _provedor
+    if _provedor is None:
+        with _lock_provedor:
+            if _provedor is None:
+                if settings.PROVEDOR_MERCADO not in PROVEDORES:
+                    raise ValueError(f"PROVEDOR_MERCADO inválido: {settings.PROVEDOR_MERCADO}")
+                _provedor = ProvedorProtegido(PROVEDORES[settings.PROVEDOR_MERCADO]())
+    return _provedor
+
+def definir_provedor(provedor: ProvedorMercado = None):
+    """Troca o provedor do processo (None volta ao de `settings` na próxima chamada)."""
+    global _provedor
+    with _lock_provedor:
+        _provedor = provedor
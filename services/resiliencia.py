@@ -0,0 +1,108 @@
+# services/resiliencia.py
+import threading
+import time
+
+class BaldeTokens:
+    """Limitador token bucket com taxa adaptativa (AIMD).
+
+    Cada requisição consome um token; os tokens voltam a `taxa` por segundo
+    até `rajada`. `reduzir` (resposta de limite do servidor) corta a taxa
+    pela metade, até `taxa_minima`; `aumentar` (sucesso) devolve um vigésimo
+    da taxa máxima por vez. Compartilhado entre as threads do pool.
+    """
+
+    def __init__(self, taxa: float, rajada: int, taxa_minima: float = None):
+        self.taxa_maxima = taxa
+        self.taxa_minima = taxa_minima or taxa / 20
+        self.taxa = taxa
+        self.rajada = rajada
+        self._tokens = float(rajada)
+        self._ultimo = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _repor(self, agora: float):
+        self._tokens = min(self.rajada, self._tokens + (agora - self._ultimo) * self.taxa)
+        self._ultimo = agora
+
+    def adquirir(self, prazo: float) -> bool:
+        """Espera um token por até `prazo` segundos; False se não couber no prazo."""
+        limite = time.monotonic() + max(prazo, 0.0)
+        while True:
+            with self._lock:
+                agora = time.monotonic()
+                self._repor(agora)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                espera = (1 - self._tokens) / self.taxa
+            if agora + espera > limite:
+                return False
+            time.sleep(espera)
+
+    def reduzir(self):
+        with self._lock:
+            self.taxa = max(self.taxa_minima, self.taxa / 2)
+            self._tokens = min(self._tokens, 0.0)
+
+    def aumentar(self):
+        with self._lock:
+            self.taxa = min(self.taxa_maxima, self.taxa + self.taxa_maxima / 20)
+
+
+class Disjuntor:
+    """Circuit breaker: abre após `limite_falhas` falhas seguidas e rejeita chamadas enquanto aberto.
+
+    Depois de `espera` segundos deixa passar uma única chamada de teste
+    (meio-aberto): sucesso fecha o circuito, falha reabre com o dobro da
+    espera anterior, até `espera_maxima`.
+    """
+
+    FECHADO, ABERTO, MEIO_ABERTO = "fechado", "aberto", "meio-aberto"
+
+    def __init__(self, limite_falhas: int, espera: float, espera_maxima: float = 600):
+        self.limite_falhas = limite_falhas
+        self.espera = espera
+        self.espera_maxima = espera_maxima
+        self.estado = self.FECHADO
+        self.falhas = 0
+        self.aberturas = 0
+        self.reabre_em = 0.0
+        self._sondando = False
+        self._lock = threading.Lock()
+
+    def permitir(self) -> bool:
+        with self._lock:
+            if self.estado == self.FECHADO:
+                return True
+            if self.estado == self.ABERTO and time.monotonic() >= self.reabre_em:
+                self.estado = self.MEIO_ABERTO
+                self._sondando = False
+            if self.estado == self.MEIO_ABERTO and not self._sondando:
+                self._sondando = True
+                return True
+            return False
+
+    def sucesso(self):
+        with self._lock:
+            self.estado = self.FECHADO
+            self.falhas = 0
+            self.aberturas = 0
+            self._sondando = False
+
+    def falha(self):
+        with self._lock:
+            self.falhas += 1
+            if self.estado == self.MEIO_ABERTO or self.falhas >= self.limite_falhas:
+                self.aberturas += 1
+                espera = min(self.espera_maxima, self.espera * 2 ** (self.aberturas - 1))
+                self.reabre_em = time.monotonic() + espera
+                self.estado = self.ABERTO
+                self._sondando = False
+
+    def liberar(self):
+        """Devolve a vaga de teste do meio-aberto sem contar sucesso nem falha."""
+        with self._lock:
+            self._sondando = False
+
+    def segundos_para_reabrir(self) -> float:
+        return max(0.0, self.reabre_em - time.monotonic()) if self.estado == self.ABERTO else 0.0
@@ -0,0 +1,140 @@
+# services/risco_service.py
+import hashlib
+import threading
+import time
+import numpy as np
+import pandas as pd
+from config.settings import settings
+from services.preco_service import PrecoService
+from services.telemetria_service import cronometrar
+
+# Pregões por ano, para anualizar retorno e volatilidade
+PREGOES_ANO = 252
+
+# Análise com ativos sem histórico (provedor falhando) fica pouco em cache, para completar logo
+TTL_INCOMPLETA = 60
+
+def chave_carteira(tickers, periodo: str) -> str:
+    """Hash da carteira (tickers, sem ordem) e do período: chave do cache de análises."""
+    conteudo = "|".join(sorted(set(tickers))) + "#" + periodo
+    return hashlib.sha1(conteudo.encode('utf-8')).hexdigest()
+
+def correlacao_pareada(retornos: np.ndarray) -> np.ndarray:
+    """Correlação de Pearson entre colunas usando, para cada par, só as linhas em que ambas existem.
+
+    Mesmo resultado de `DataFrame.corr()`, mas com produtos de matrizes em vez
+    de um laço por par. Sem NaN, cai direto em `np.corrcoef`.
+    """
+    valido = ~np.isnan(retornos)
+    if valido.all():
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.atleast_2d(np.corrcoef(retornos, rowvar=False))
+    m = valido.astype(float)
+    x = np.where(valido, retornos, 0.0)
+    n = m.T @ m                 # linhas em comum por par
+    soma = x.T @ m              # soma de x_i nas linhas em comum com j
+    soma_q = (x * x).T @ m      # soma de x_i² nas linhas em comum com j
+    produto = x.T @ x
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cov = produto - soma * soma.T / n
+        var_i = soma_q - soma * soma / n
+        corr = cov / np.sqrt(var_i * var_i.T)
+    corr[n < 2] = np.nan
+    return np.clip(corr, -1.0, 1.0)
+
+class AnaliseCarteira:
+    """Matriz de preços alinhada de uma carteira e tudo que é derivado dela."""
+
+    def __init__(self, precos: pd.DataFrame, ausentes=()):
+        self.precos = precos
+        self.ausentes = list(ausentes)  # tickers pedidos que ficaram sem histórico
+        preenchidos = precos.ffill()
+        # Retornos com feriados de outro mercado como retorno zero (como o pct_change padrão)
+        self.retornos = preenchidos.pct_change(fill_method=None)
+        # Retornos no calendário de cada ativo: só nos dias em que ele negociou
+        self._retornos_proprios = self.retornos.where(precos.notna())
+        self._preenchidos = preenchidos
+        self._correlacao = None
+        self._risco = None
+
+    @property
+    def correlacao(self) -> pd.DataFrame:
+        if self._correlacao is None:
+            corr = correlacao_pareada(self.retornos.iloc[1:].to_numpy(dtype=float))
+            self._correlacao = pd.DataFrame(corr, index=self.precos.columns, columns=self.precos.columns)
+        return self._correlacao
+
+    @property
+    def risco(self) -> pd.DataFrame:
+        """Retorno e volatilidade anualizados e drawdown máximo (%) por ativo."""
+        if self._risco is None:
+            r = self._retornos_proprios.to_numpy(dtype=float)
+            p = self._preenchidos.to_numpy(dtype=float)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                pico = np.fmax.accumulate(p, axis=0)
+                drawdown = np.nanmin(p / pico - 1, axis=0)
+            self._risco = pd.DataFrame({
+                'retorno_medio': np.nanmean(r, axis=0) * PREGOES_ANO * 100,
+                'volatilidade': np.nanstd(r, axis=0, ddof=1) * np.sqrt(PREGOES_ANO) * 100,
+                'max_drawdown': drawdown * 100
+            }, index=self.precos.columns)
+        return self._risco
+
+    def pares(self, limite_alto: float = 0.8, limite_baixo: float = 0.3):
+        """([(ativo1, ativo2, corr)] com |corr| > limite_alto, [...] com |corr| < limite_baixo)."""
+        corr = self.correlacao.to_numpy()
+        nomes = self.correlacao.columns
+        i, j = np.triu_indices(len(nomes), k=1)
+        valores = corr[i, j]
+        absolutos = np.abs(valores)
+
+        def _lista(mascara):
+            return [(nomes[a], nomes[b], v) for a, b, v in zip(i[mascara], j[mascara], valores[mascara])]
+
+        return _lista(absolutos > limite_alto), _lista(absolutos < limite_baixo)
+
+
+class RiscoService:
+    """Análises de correlação e risco com uma única matriz de preços por carteira e período."""
+
+    _cache = {}  # chave_carteira -> (expira_em, AnaliseCarteira)
+    _lock = threading.Lock()
+
+    @staticmethod
+    @cronometrar("mercado")
+    def matriz_precos(tickers, periodo: str = "1y", coluna: str = 'Adj Close') -> pd.DataFrame:
+        """Preços diários dos tickers alinhados por data (NaN onde o ativo não negociou)."""
+        historicos = PrecoService.buscar_historicos_batch(tickers, periodo)
+        series = {}
+        for ticker in dict.fromkeys(tickers):
+            hist = historicos.get(ticker)
+            if hist is None or coluna not in hist.columns:
+                continue
+            serie = hist[coluna]
+            # B3 e bolsas americanas têm fusos diferentes: alinha pela data do pregão
+            if serie.index.tz is not None:
+                serie = serie.tz_localize(None)
+            series[ticker] = serie.groupby(serie.index.normalize()).last()
+        return pd.DataFrame(series).sort_index()
+
+    @staticmethod
+    def ausentes(tickers, precos: pd.DataFrame) -> list:
+        """Tickers pedidos que não estão na matriz de preços (sem dados, erro ou fora do prazo)."""
+        return [t for t in dict.fromkeys(tickers) if t not in precos.columns]
+
+    @classmethod
+    def analisar(cls, tickers, periodo: str = "1y") -> AnaliseCarteira:
+        """AnaliseCarteira compartilhada por todas as abas enquanto a carteira não mudar."""
+        chave = chave_carteira(tickers, periodo)
+        agora = time.monotonic()
+        with cls._lock:
+            entrada = cls._cache.get(chave)
+            if entrada and entrada[0] > agora:
+                return entrada[1]
+        precos = cls.matriz_precos(tickers, periodo)
+        analise = AnaliseCarteira(precos, cls.ausentes(tickers, precos))
+        with cls._lock:
+            for vencida in [c for c, (expira, _) in cls._cache.items() if expira <= agora]:
+                del cls._cache[vencida]
+            cls._cache[chave] = (agora + (TTL_INCOMPLETA if analise.ausentes else settings.HISTORICO_TTL), analise)
+        return analise
@@ -0,0 +1,135 @@
+# services/scanner_service.py
+import threading
+from datetime import datetime
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import streamlit as st
+from config.settings import settings, CATEGORIAS_SCANNER
+from services.preco_service import PrecoService, calcular_dividend_yield
+from services.analise_service import AnaliseService
+from services.agendador import Agendador
+
+class SnapshotScanner:
+    """Categoria pontuada por inteiro em `calculado_em`.
+
+    `resultado` é o DataFrame de `AnaliseService.analisar_universo` (indexado
+    por ticker) acrescido da coluna `dividend_yield`.
+    """
+
+    def __init__(self, categoria: str, calculado_em: datetime, resultado: pd.DataFrame):
+        self.categoria = categoria
+        self.calculado_em = calculado_em
+        self.resultado = resultado
+
+    def tabela(self, sensibilidade: str = "Moderado") -> pd.DataFrame:
+        """Tabela da página, reclassificada para a sensibilidade pedida."""
+        status_lista = AnaliseService.classificar(
+            self.resultado['pontuacao'], AnaliseService.SENSIBILIDADES[sensibilidade]
+        )
+        return pd.DataFrame({
+            "Ticker": self.resultado.index,
+            "Status": status_lista,
+            "Preço": self.resultado['preco_atual'].to_numpy(),
+            "DY (%)": self.resultado['dividend_yield'].fillna(0).to_numpy(),
+            "Pontuação": self.resultado['pontuacao'].to_numpy(),
+            "Resumo": [AnaliseService.MENSAGENS[s] for s in status_lista]
+        })
+
+class ScannerService:
+    """Mantém um snapshot pontuado por categoria do Scanner.
+
+    Um agendador recalcula todas as categorias a cada `intervalo` segundos;
+    a página só lê o último snapshot. Os snapshots também vão para disco,
+    então um processo recém-iniciado já abre com o resultado anterior.
+    """
+
+    def __init__(self, categorias: dict = None, intervalo: int = None, base_dir: str = None):
+        self.categorias = categorias or CATEGORIAS_SCANNER
+        self.intervalo = intervalo or settings.SCANNER_INTERVALO
+        self.base_dir = Path(base_dir or settings.PROCESSADOS_DIR)
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        self._snapshots = {}
+        self._lock = threading.Lock()
+        self._agendador = Agendador("scanner", self.intervalo, self.atualizar_todas)
+
+    def iniciar(self):
+        self._agendador.iniciar()
+
+    def parar(self, timeout: float = None):
+        self._agendador.parar(timeout)
+
+    def _caminho(self, categoria: str) -> Path:
+        nome = categoria.lower().replace(' ', '_')
+        return self.base_dir / f"scanner_{nome}.parquet"
+
+    def snapshot(self, categoria: str):
+        """Último snapshot da categoria, ou None se ainda não houver nenhum."""
+        with self._lock:
+            snap = self._snapshots.get(categoria)
+        if snap is None:
+            snap = self._carregar(categoria)
+            if snap is not None:
+                with self._lock:
+                    # O agendador pode ter publicado um mais novo nesse meio tempo
+                    snap = self._snapshots.setdefault(categoria, snap)
+        return snap
+
+    def calcular(self, categoria: str):
+        """Baixa/atualiza os históricos da categoria e publica um novo snapshot."""
+        tickers = self.categorias[categoria]
+        # Fora da página não há usuário esperando: prazo mais folgado
+        historicos = PrecoService.buscar_historicos_batch(tickers, prazo_total=settings.YF_TIMEOUT * 6)
+        if not historicos:
+            return self.snapshot(categoria)
+        resultado = AnaliseService.analisar_universo(
+            pd.DataFrame({t: h['Adj Close'] for t, h in historicos.items()}),
+            pd.Series({t: h['Close'].iloc[-1] for t, h in historicos.items()})
+        )
+        # None (sem proventos) vira NaN para a coluna continuar numérica
+        resultado['dividend_yield'] = np.array([
+            calcular_dividend_yield(historicos[t], p) for t, p in resultado['preco_atual'].items()
+        ], dtype=float)
+        snap = SnapshotScanner(categoria, datetime.now(), resultado)
+        with self._lock:
+            self._snapshots[categoria] = snap
+        self._salvar(snap)
+        return snap
+
+    def atualizar_todas(self):
+        for categoria in self.categorias:
+            try:
+                self.calcular(categoria)
+            except Exception as e:
+                print(f"Erro ao atualizar o scanner de {categoria}: {e}")
+
+    def _salvar(self, snap: SnapshotScanner):
+        df = snap.resultado.copy()
+        df['calculado_em'] = snap.calculado_em
+        caminho = self._caminho(snap.categoria)
+        tmp = caminho.with_suffix('.parquet.tmp')
+        try:
+            df.to_parquet(tmp)
+            tmp.replace(caminho)
+        except Exception as e:
+            print(f"Erro ao salvar snapshot do scanner ({snap.categoria}): {e}")
+
+    def _carregar(self, categoria: str):
+        caminho = self._caminho(categoria)
+        if not caminho.exists():
+            return None
+        try:
+            df = pd.read_parquet(caminho)
+        except Exception:
+            return None
+        if df.empty:
+            return None
+        calculado_em = pd.Timestamp(df['calculado_em'].iloc[0]).to_pydatetime()
+        return SnapshotScanner(categoria, calculado_em, df.drop(columns=['calculado_em']))
+
+@st.cache_resource
+def obter_scanner() -> ScannerService:
+    """Um único ScannerService por processo, compartilhado por todas as sessões."""
+    scanner = ScannerService()
+    scanner.iniciar()
+    return scanner
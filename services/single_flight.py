@@ -0,0 +1,124 @@
+# services/single_flight.py
+import threading
+
+class _Voo:
+    """Uma busca em andamento e o resultado que os que esperam por ela vão receber."""
+
+    __slots__ = ('pronto', 'resultado', 'erro')
+
+    def __init__(self):
+        self.pronto = threading.Event()
+        self.resultado = None
+        self.erro = None
+
+
+class SingleFlight:
+    """Coalescência de buscas concorrentes pela mesma chave.
+
+    A chave é uma tupla `(tipo, ticker, ...)`, por exemplo
+    `("historico", "PETR4", "5y")`. A primeira thread que pede uma chave
+    executa a busca; as que chegam enquanto ela está em andamento esperam e
+    recebem o mesmo resultado (ou a mesma exceção), sem ir à rede de novo.
+    Nada fica guardado depois que a busca termina: o cache continua sendo
+    papel de quem chama. Os contadores por tipo mostram quantas buscas foram
+    de fato feitas e quantas foram deduplicadas.
+    """
+
+    def __init__(self):
+        self._voos = {}        # chave -> _Voo
+        self._contadores = {}  # tipo -> [executadas, deduplicadas]
+        self._lock = threading.Lock()
+
+    def _contar(self, tipo, executadas=0, deduplicadas=0):
+        contador = self._contadores.setdefault(tipo, [0, 0])
+        contador[0] += executadas
+        contador[1] += deduplicadas
+
+    @staticmethod
+    def _esperar(voo: _Voo, copiar=None):
+        voo.pronto.wait()
+        if voo.erro is not None:
+            raise voo.erro
+        return copiar(voo.resultado) if copiar and voo.resultado is not None else voo.resultado
+
+    def executar(self, chave: tuple, buscar, copiar=None):
+        """Resultado de `buscar()`, executado uma única vez por chave entre as threads concorrentes.
+
+        `copiar`, se informado, é aplicado ao resultado entregue às threads que
+        esperaram, para que elas não compartilhem um objeto mutável com a que buscou.
+        """
+        with self._lock:
+            voo = self._voos.get(chave)
+            lider = voo is None
+            if lider:
+                voo = self._voos[chave] = _Voo()
+            self._contar(chave[0], executadas=int(lider), deduplicadas=int(not lider))
+        if not lider:
+            return self._esperar(voo, copiar)
+        try:
+            voo.resultado = buscar()
+            return voo.resultado
+        except BaseException as e:
+            voo.erro = e
+            raise
+        finally:
+            with self._lock:
+                del self._voos[chave]
+            voo.pronto.set()
+
+    def executar_lote(self, tipo: str, itens, buscar_lote) -> dict:
+        """{item: resultado} com `buscar_lote(itens) -> dict` chamado só para os itens sem busca em andamento.
+
+        Os itens que outra thread já está buscando (chave `(tipo, item)`)
+        são esperados em vez de entrar no lote desta chamada.
+        """
+        proprios, alheios = {}, {}
+        with self._lock:
+            for item in dict.fromkeys(itens):
+                chave = (tipo, item)
+                voo = self._voos.get(chave)
+                if voo is None:
+                    proprios[item] = self._voos[chave] = _Voo()
+                else:
+                    alheios[item] = voo
+            self._contar(tipo, executadas=len(proprios), deduplicadas=len(alheios))
+        resultado = {}
+        if proprios:
+            try:
+                obtidos = buscar_lote(list(proprios))
+                for item, voo in proprios.items():
+                    voo.resultado = obtidos.get(item)
+                resultado.update(obtidos)
+            except BaseException as e:
+                for voo in proprios.values():
+                    voo.erro = e
+                raise
+            finally:
+                with self._lock:
+                    for item in proprios:
+                        del self._voos[(tipo, item)]
+                for voo in proprios.values():
+                    voo.pronto.set()
+        for item, voo in alheios.items():
+            obtido = self._esperar(voo)
+            if obtido is not None:
+                resultado[item] = obtido
+        return resultado
+
+    def estatisticas(self) -> list:
+        """[{Tipo, Executadas, Deduplicadas, Em andamento}] desde o início do processo (ou de `zerar`)."""
+        with self._lock:
+            em_andamento = {}
+            for chave in self._voos:
+                em_andamento[chave[0]] = em_andamento.get(chave[0], 0) + 1
+            return [{'Tipo': tipo, 'Executadas': executadas, 'Deduplicadas': deduplicadas,
+                     'Em andamento': em_andamento.get(tipo, 0)}
+                    for tipo, (executadas, deduplicadas) in sorted(self._contadores.items())]
+
+    def zerar(self):
+        with self._lock:
+            self._contadores.clear()
+
+
+# Instância do processo, compartilhada pelo cache de mercado e pelo PrecoService
+single_flight = SingleFlight()
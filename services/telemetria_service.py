@@ -0,0 +1,214 @@
+# services/telemetria_service.py
+import functools
+import json
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from config.settings import settings
+
+PERCENTIS = (50, 95, 99)
+
+class _Serie:
+    """Últimas latências (s) de uma função ou página, mais contadores acumulados."""
+
+    __slots__ = ('categoria', 'duracoes', 'chamadas', 'erros', 'acertos', 'falhas', 'bytes')
+
+    def __init__(self, categoria: str, capacidade: int):
+        self.categoria = categoria
+        self.duracoes = deque(maxlen=capacidade)
+        self.chamadas = 0
+        self.erros = 0
+        self.acertos = 0
+        self.falhas = 0
+        self.bytes = 0
+
+
+class TelemetriaService:
+    """Latências por função e por página em buffers circulares, em memória.
+
+    Cada função instrumentada guarda as últimas `capacidade` durações; os
+    percentis saem desses buffers, então o custo por chamada é um
+    `perf_counter` e um append. Contadores de acerto/falha de cache e de
+    bytes recebidos da rede ficam na mesma série. Chamadas feitas na thread
+    de uma renderização (`pagina`) também são somadas à página, e cada
+    renderização grava uma linha JSON em `settings.LOG_PATH`.
+    """
+
+    def __init__(self, capacidade: int = None, log_path: str = None, ativa: bool = None):
+        self.capacidade = capacidade or settings.TELEMETRIA_AMOSTRAS
+        self.ativa = settings.TELEMETRIA_ATIVA if ativa is None else ativa
+        self._funcoes = {}  # nome -> _Serie
+        self._paginas = {}  # página -> _Serie
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._log = self._criar_log(log_path or settings.LOG_PATH)
+
+    @staticmethod
+    def _criar_log(caminho: str) -> logging.Logger:
+        log = logging.getLogger("investsim.telemetria")
+        log.setLevel(logging.INFO)
+        log.propagate = False
+        if not log.handlers:
+            try:
+                Path(caminho).parent.mkdir(parents=True, exist_ok=True)
+                handler = logging.FileHandler(caminho, encoding="utf-8", delay=True)
+            except OSError:
+                handler = logging.NullHandler()
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            log.addHandler(handler)
+        return log
+
+    def _serie(self, tabela: dict, nome: str, categoria: str) -> _Serie:
+        serie = tabela.get(nome)
+        if serie is None:
+            serie = tabela[nome] = _Serie(categoria, self.capacidade)
+        return serie
+
+    def registrar(self, nome: str, categoria: str, segundos: float, erro: bool = False):
+        with self._lock:
+            serie = self._serie(self._funcoes, nome, categoria)
+            serie.duracoes.append(segundos)
+            serie.chamadas += 1
+            serie.erros += erro
+        render = getattr(self._local, 'render', None)
+        if render is not None:
+            total = render['funcoes'].setdefault(nome, [0, 0.0])
+            total[0] += 1
+            total[1] += segundos
+
+    def contar_cache(self, nome: str, acertos: int = 0, falhas: int = 0, categoria: str = "cache"):
+        if not self.ativa:
+            return
+        with self._lock:
+            serie = self._serie(self._funcoes, nome, categoria)
+            serie.acertos += acertos
+            serie.falhas += falhas
+
+    def contar_bytes(self, nome: str, quantidade: int, categoria: str = "mercado"):
+        if not self.ativa or not quantidade:
+            return
+        with self._lock:
+            self._serie(self._funcoes, nome, categoria).bytes += int(quantidade)
+
+    @contextmanager
+    def medir(self, nome: str, categoria: str = "outros"):
+        """Bloco cronometrado: `with telemetria.medir("grafico_dashboard", "grafico"): ...`."""
+        if not self.ativa:
+            yield
+            return
+        inicio = time.perf_counter()
+        erro = False
+        try:
+            yield
+        except BaseException:
+            erro = True
+            raise
+        finally:
+            self.registrar(nome, categoria, time.perf_counter() - inicio, erro)
+
+    def cronometrar(self, categoria: str, nome: str = None):
+        """Decorador de `medir` com o nome qualificado da função."""
+        def decorador(funcao):
+            if not self.ativa:
+                return funcao
+            rotulo = nome or funcao.__qualname__
+
+            @functools.wraps(funcao)
+            def envoltorio(*args, **kwargs):
+                with self.medir(rotulo, categoria):
+                    return funcao(*args, **kwargs)
+            return envoltorio
+        return decorador
+
+    @contextmanager
+    def pagina(self, nome: str, user_id=None):
+        """Renderização de uma página do menu: latência total e o tempo de cada função chamada nela."""
+        if not self.ativa:
+            yield
+            return
+        render = {'funcoes': {}}
+        self._local.render = render
+        inicio = time.perf_counter()
+        erro = False
+        try:
+            yield
+        except BaseException as e:
+            # st.rerun/st.stop interrompem o script por exceção; não são erro da página
+            erro = type(e).__name__ not in ("RerunException", "StopException")
+            raise
+        finally:
+            segundos = time.perf_counter() - inicio
+            self._local.render = None
+            with self._lock:
+                serie = self._serie(self._paginas, nome, "pagina")
+                serie.duracoes.append(segundos)
+                serie.chamadas += 1
+                serie.erros += erro
+            self._log.info(json.dumps({
+                'pagina': nome,
+                'user_id': user_id,
+                'ms': round(segundos * 1000, 2),
+                'erro': erro,
+                'funcoes': {f: {'n': n, 'ms': round(s * 1000, 2)} for f, (n, s) in render['funcoes'].items()}
+            }, ensure_ascii=False))
+
+    @staticmethod
+    def _tabela(series: dict) -> pd.DataFrame:
+        linhas = []
+        for nome, serie in series.items():
+            duracoes = np.asarray(serie.duracoes) * 1000
+            p50, p95, p99 = np.percentile(duracoes, PERCENTIS) if len(duracoes) else (np.nan,) * 3
+            consultas = serie.acertos + serie.falhas
+            linhas.append({
+                'Nome': nome,
+                'Categoria': serie.categoria,
+                'Chamadas': serie.chamadas,
+                'Erros': serie.erros,
+                'p50 (ms)': p50,
+                'p95 (ms)': p95,
+                'p99 (ms)': p99,
+                'Máx (ms)': duracoes.max() if len(duracoes) else np.nan,
+                'Cache (acertos)': serie.acertos,
+                'Cache (falhas)': serie.falhas,
+                'Acerto (%)': serie.acertos / consultas * 100 if consultas else np.nan,
+                'Bytes': serie.bytes
+            })
+        colunas = ['Nome', 'Categoria', 'Chamadas', 'Erros', 'p50 (ms)', 'p95 (ms)', 'p99 (ms)', 'Máx (ms)',
+                   'Cache (acertos)', 'Cache (falhas)', 'Acerto (%)', 'Bytes']
+        return pd.DataFrame(linhas, columns=colunas)
+
+    def por_funcao(self) -> pd.DataFrame:
+        """p50/p95/p99 (ms) das últimas chamadas de cada função, com cache e bytes."""
+        with self._lock:
+            series = {n: self._copiar(s) for n, s in self._funcoes.items()}
+        return self._tabela(series).sort_values('p95 (ms)', ascending=False, na_position='last')
+
+    def por_pagina(self) -> pd.DataFrame:
+        """p50/p95/p99 (ms) das últimas renderizações de cada página do menu."""
+        with self._lock:
+            series = {n: self._copiar(s) for n, s in self._paginas.items()}
+        tabela = self._tabela(series)
+        return tabela.drop(columns=['Categoria', 'Cache (acertos)', 'Cache (falhas)', 'Acerto (%)', 'Bytes'])
+
+    @staticmethod
+    def _copiar(serie: _Serie) -> _Serie:
+        copia = _Serie(serie.categoria, serie.duracoes.maxlen)
+        copia.duracoes.extend(serie.duracoes)
+        for campo in ('chamadas', 'erros', 'acertos', 'falhas', 'bytes'):
+            setattr(copia, campo, getattr(serie, campo))
+        return copia
+
+    def limpar(self):
+        with self._lock:
+            self._funcoes.clear()
+            self._paginas.clear()
+
+
+# Instância do processo; os decoradores são aplicados na importação dos módulos
+telemetria = TelemetriaService()
+cronometrar = telemetria.cronometrar
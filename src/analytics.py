@@ -1,5 +1,5 @@
 import pandas as pd
-import yfinance as yf
+from services.provedor_mercado import ErroProvedor, obter_provedor
 
 def process_metrics(df):
     """Calcula rentabilidade ponderada (MWA) e motor decisional."""
@@ -27,8 +27,7 @@ def process_metrics(df):
 def convert_to_usd(valor_brl):
     """Converte BRL para USD usando cotação em tempo real."""
     try:
-        usd_ticker = yf.Ticker("USDBRL=X")
-        cotacao = usd_ticker.fast_info['last_price']
+        cotacao = obter_provedor().cambio("USD", "BRL")
         return valor_brl / cotacao
-    except:
+    except ErroProvedor:
         return valor_brl / 5.60 # Fallback 2026
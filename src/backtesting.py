@@ -1,27 +1,177 @@
-import yfinance as yf
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 import pandas as pd
 import streamlit as st
+from services.risco_service import RiscoService, PREGOES_ANO
+from services.telemetria_service import cronometrar
+
+# Meses por período de rebalanceamento ('nunca' = compra e segura)
+FREQUENCIAS = {'mensal': 1, 'trimestral': 3, 'semestral': 6, 'anual': 12, 'nunca': None}
+
+def pesos_de_metas(df_ativos: pd.DataFrame, metas: dict) -> pd.Series:
+    """Peso alvo por ticker: a meta de cada classe (metas_alocacao) dividida igualmente entre os ativos dela.
+
+    Classes sem meta ficam de fora; sem nenhuma meta, pesos iguais.
+    """
+    tickers = df_ativos.drop_duplicates('ticker').set_index('ticker')['setor']
+    if not metas:
+        return pd.Series(1.0 / len(tickers), index=tickers.index)
+    por_classe = tickers.map(tickers.value_counts())
+    pesos = tickers.map(metas).fillna(0.0) / por_classe
+    pesos = pesos[pesos > 0]
+    return (pesos / pesos.sum()).rename("peso")
+
+def _inicios_de_periodo(datas: pd.DatetimeIndex, meses) -> np.ndarray:
+    """Máscara do primeiro pregão de cada bloco de `meses` meses (o primeiro dia sempre entra)."""
+    marcas = np.zeros(len(datas), dtype=bool)
+    marcas[0] = True
+    if meses:
+        bloco = (datas.year.to_numpy() * 12 + datas.month.to_numpy() - 1) // meses
+        marcas[1:] |= bloco[1:] != bloco[:-1]
+    return marcas
+
+@cronometrar("analise")
+def backtest(precos: pd.DataFrame, pesos, rebalanceamento: str = 'mensal', valor_inicial: float = 10000.0,
+             aporte_mensal: float = 0.0, aportes: pd.Series = None, custo: float = 0.0005) -> pd.DataFrame:
+    """Simula a carteira com pesos alvo sobre a matriz de preços (datas x tickers).
+
+    Entre dois eventos (rebalanceamento ou aporte) as quantidades ficam
+    constantes, então o único laço em Python é sobre os eventos; o
+    patrimônio diário sai de um produto quantidade x preço vetorizado.
+    Ativos sem preço na data (ainda não listados) ficam de fora e os pesos
+    dos demais são renormalizados. `aporte_mensal` entra no primeiro pregão
+    de cada mês; `aportes` (data -> valor) no primeiro pregão a partir da
+    data. Aportes fora de um rebalanceamento compram na proporção dos pesos.
+    `custo` é a fração cobrada sobre o volume negociado.
+
+    Retorna um DataFrame com 'Patrimônio', 'Aportado', 'Custos' e 'Cota'
+    (valor da cota, base 1, que desconta os aportes).
+    """
+    pesos = pd.Series(pesos, dtype=float).reindex(precos.columns).fillna(0.0)
+    precos = precos.loc[:, pesos > 0].sort_index()
+    pesos = pesos[precos.columns].to_numpy()
+    precos = precos.loc[precos.notna().any(axis=1)]
+    datas = precos.index
+    p = precos.ffill().to_numpy(dtype=float)
+    listado = ~np.isnan(p)
+    p = np.nan_to_num(p)
+    n = len(datas)
+
+    entradas = np.zeros(n)
+    entradas[0] = valor_inicial
+    if aporte_mensal:
+        entradas[1:] += aporte_mensal * _inicios_de_periodo(datas, 1)[1:]
+    if aportes is not None and len(aportes):
+        linhas = datas.searchsorted(pd.DatetimeIndex(aportes.index))
+        validas = linhas < n
+        np.add.at(entradas, linhas[validas], np.asarray(aportes, dtype=float)[validas])
+    rebalancear = _inicios_de_periodo(datas, FREQUENCIAS[rebalanceamento])
+    eventos = np.flatnonzero(rebalancear | (entradas != 0))
+
+    quantidades = np.zeros((len(eventos), p.shape[1]))
+    custos = np.zeros(n)
+    atual = np.zeros(p.shape[1])
+    for k, i in enumerate(eventos):
+        alvo = pesos * listado[i]
+        soma = alvo.sum()
+        if soma > 0:
+            alvo /= soma
+            with np.errstate(invalid='ignore', divide='ignore'):
+                if rebalancear[i]:
+                    valor = atual @ p[i] + entradas[i]
+                    # Custo estimado sobre o volume até o alvo e descontado antes de comprar
+                    volume = np.abs(alvo * valor - atual * p[i]).sum()
+                    custos[i] = volume * custo
+                    atual = np.where(alvo > 0, alvo * (valor - custos[i]) / p[i], 0.0)
+                else:
+                    custos[i] = entradas[i] * custo
+                    atual = atual + np.where(alvo > 0, alvo * (entradas[i] - custos[i]) / p[i], 0.0)
+        quantidades[k] = atual
+
+    # Quantidades vigentes em cada pregão e patrimônio em uma passada
+    vigente = np.searchsorted(eventos, np.arange(n), side='right') - 1
+    patrimonio = np.einsum('ij,ij->i', quantidades[vigente], p)
+    anterior = np.concatenate(([valor_inicial], patrimonio[:-1]))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        retorno = np.where(anterior > 0, (patrimonio - entradas) / anterior, 1.0)
+    retorno[0] = patrimonio[0] / valor_inicial if valor_inicial > 0 else 1.0
+    return pd.DataFrame({
+        'Patrimônio': patrimonio,
+        'Aportado': np.cumsum(entradas),
+        'Custos': np.cumsum(custos),
+        'Cota': np.cumprod(retorno)
+    }, index=datas)
+
+def metricas(resultado: pd.DataFrame) -> dict:
+    """Retorno total e anualizado, volatilidade e drawdown máximo (%) da cota."""
+    cota = resultado['Cota'].to_numpy()
+    if len(cota) < 2:
+        return {}
+    anos = (resultado.index[-1] - resultado.index[0]).days / 365.25
+    retornos = cota[1:] / cota[:-1] - 1
+    return {
+        'retorno_total': (cota[-1] / cota[0] - 1) * 100,
+        'retorno_anual': ((cota[-1] / cota[0]) ** (1 / anos) - 1) * 100 if anos > 0 else 0.0,
+        'volatilidade': retornos.std(ddof=1) * np.sqrt(PREGOES_ANO) * 100,
+        'max_drawdown': (cota / np.maximum.accumulate(cota) - 1).min() * 100,
+        'patrimonio_final': float(resultado['Patrimônio'].iloc[-1]),
+        'custos': float(resultado['Custos'].iloc[-1])
+    }
+
+# Matriz de preços de cada processo da varredura, recebida uma vez no inicializador
+_precos_processo = None
+
+def _iniciar_processo(precos):
+    global _precos_processo
+    _precos_processo = precos
+
+def _rodar_combinacao(parametros: dict) -> dict:
+    resultado = backtest(_precos_processo, **parametros)
+    return {**{k: v for k, v in parametros.items() if k != 'pesos'}, **metricas(resultado)}
+
+def varrer(precos: pd.DataFrame, combinacoes, processos: int = None) -> pd.DataFrame:
+    """Roda `backtest` para cada dicionário de parâmetros em `combinacoes` num pool de processos.
+
+    A matriz de preços é enviada a cada processo só uma vez. Retorna uma
+    linha por combinação com os parâmetros e as `metricas`.
+    """
+    combinacoes = list(combinacoes)
+    processos = processos or os.cpu_count() or 1
+    if processos == 1 or len(combinacoes) < 2:
+        _iniciar_processo(precos)
+        linhas = [_rodar_combinacao(c) for c in combinacoes]
+    else:
+        with ProcessPoolExecutor(max_workers=processos, initializer=_iniciar_processo, initargs=(precos,)) as executor:
+            linhas = list(executor.map(_rodar_combinacao, combinacoes, chunksize=max(1, len(combinacoes) // (processos * 4))))
+    return pd.DataFrame(linhas)
+
+def backtest_carteira(tickers, pesos, periodo: str = "5y", benchmark: str = "^BVSP", **parametros):
+    """Backtest sobre o histórico armazenado ('Adj Close', proventos reinvestidos) contra o benchmark.
+
+    Retorna (comparação com 'Minha Carteira' e o benchmark em base 1,
+    resultado do `backtest`) ou (None, None) sem histórico.
+    """
+    precos = RiscoService.matriz_precos(list(tickers) + [benchmark], periodo)
+    if precos.empty or precos.drop(columns=[benchmark], errors='ignore').empty:
+        return None, None
+    resultado = backtest(precos.drop(columns=[benchmark], errors='ignore'), pesos, **parametros)
+    comparacao = pd.DataFrame({'Minha Carteira': resultado['Cota']})
+    if benchmark in precos.columns:
+        indice = precos[benchmark].reindex(resultado.index).ffill()
+        comparacao[benchmark] = indice / indice.dropna().iloc[0]
+    return comparacao, resultado
 
 def run_backtest(df_carteira):
     """Compara o desempenho da carteira com o Ibovespa no último ano."""
-    tickers = [f"{t}.SA" if not t.endswith(".SA") else t for t in df_carteira['Ativo'].tolist()]
-    
+    tickers = df_carteira['Ativo'].tolist()
     try:
-        # Busca dados do último ano
-        data = yf.download(tickers + ["^BVSP"], period="1y", interval="1d")['Close']
-        retornos = data.pct_change().dropna()
-        acumulado = (1 + retornos).cumprod()
-        
-        # Performance da Carteira (Média ponderada simplificada dos ativos)
-        colunas_ativos = [c for c in acumulado.columns if c != "^BVSP"]
-        carteira_nomalizada = acumulado[colunas_ativos].mean(axis=1)
-        ibov_normalizado = acumulado["^BVSP"]
-        
-        return pd.DataFrame({
-            "Minha Carteira": carteira_nomalizada,
-            "Ibovespa": ibov_normalizado
-        })
+        # Pesos iguais na largada, sem rebalancear (compra e segura)
+        comparacao, _ = backtest_carteira(tickers, pd.Series(1.0, index=tickers), "1y",
+                                       rebalanceamento='nunca', custo=0.0)
+        if comparacao is None:
+            return None
+        return comparacao.rename(columns={"^BVSP": "Ibovespa"})
     except Exception as e:
         st.error(f"Erro no Backtesting: {e}")
         return None
-      
@@ -0,0 +1,167 @@
+"""Calibração dos cortes e das faixas da pontuação do Scanner.
+
+Reaplica as regras de `AnaliseService.pontuar` em todas as datas do
+histórico do universo de uma categoria e mede o retorno futuro de cada
+status, para milhares de combinações de parâmetros.
+
+Uso:
+    python -m src.calibracao --categoria Ações --periodo 10y --horizonte 63
+"""
+import argparse
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from config.settings import settings, CATEGORIAS_SCANNER
+from services.analise_service import AnaliseService, JANELA_12M
+from services.risco_service import RiscoService
+
+# Pregões em 5 anos (a janela do histórico que o Scanner analisa)
+JANELA_5Y = 5 * JANELA_12M
+
+STATUS = ['oportunidade', 'barato', 'neutro', 'atencao', 'caro']
+
+# Menor e maior pontuação possíveis em `pontuar` (-25-30-25-20 e 25+30+25+25)
+PONTUACAO_MIN, PONTUACAO_MAX = -100, 105
+
+def _variacao_anual(serie: pd.Series) -> pd.Series:
+    # Como `matriz[-JANELA_12M]` em analisar_universo: 251 pregões atrás, só com mais de 252 barras
+    variacao = (serie / serie.shift(JANELA_12M - 1) - 1) * 100
+    return variacao.where(np.arange(len(serie)) >= JANELA_12M, 0.0)
+
+def indicadores_rolantes(precos: pd.DataFrame) -> dict:
+    """Entradas de `pontuar` em todas as datas (matrizes datas x tickers), no calendário de cada ativo.
+
+    Mesmas definições de `AnaliseService.analisar_universo`: média dos
+    últimos 252 pregões, percentis 20/80 e mínimo/máximo da janela de 5
+    anos e variação anual (0 sem histórico), com o mesmo deslocamento.
+    """
+    def _por_ativo(funcao):
+        return pd.DataFrame({t: funcao(precos[t].dropna()) for t in precos.columns}).reindex(precos.index)
+
+    janela = lambda s: s.rolling(JANELA_5Y, min_periods=JANELA_12M)
+    return {
+        'p': precos,
+        'm12': _por_ativo(lambda s: s.rolling(JANELA_12M, min_periods=JANELA_12M).mean()),
+        'p20': _por_ativo(lambda s: janela(s).quantile(0.20)),
+        'p80': _por_ativo(lambda s: janela(s).quantile(0.80)),
+        'min5': _por_ativo(lambda s: janela(s).min()),
+        'max5': _por_ativo(lambda s: janela(s).max()),
+        'var_ano': _por_ativo(_variacao_anual)
+    }
+
+def retornos_futuros(precos: pd.DataFrame, horizonte: int) -> pd.DataFrame:
+    """Retorno (%) de cada data até `horizonte` pregões depois, no calendário de cada ativo."""
+    return pd.DataFrame({
+        t: (precos[t].dropna().shift(-horizonte) / precos[t].dropna() - 1) * 100 for t in precos.columns
+    }).reindex(precos.index)
+
+def grade_cortes(oportunidade=range(-60, -15, 5), barato=range(-40, 5, 5),
+                 neutro=range(-15, 20, 5), atencao=range(5, 50, 5)) -> np.ndarray:
+    """Combinações (oportunidade < barato < neutro < atencao) dos cortes de `classificar`."""
+    grade = np.array(list(itertools.product(oportunidade, barato, neutro, atencao)), dtype=int)
+    validas = (grade[:, 0] < grade[:, 1]) & (grade[:, 1] < grade[:, 2]) & (grade[:, 2] < grade[:, 3])
+    return grade[validas]
+
+def grade_regras(media=((0.15, 0.10), (0.20, 0.10), (0.10, 0.05)),
+                 faixa=((15, 30, 70, 85), (10, 25, 75, 90), (20, 35, 65, 80)),
+                 variacao=((-20, -10, 30, 50), (-30, -15, 20, 40))) -> list:
+    """Combinações das faixas de `AnaliseService.REGRAS`."""
+    return [{'media': m, 'faixa': f, 'variacao': v} for m, f, v in itertools.product(media, faixa, variacao)]
+
+def avaliar_cortes(pontuacao: np.ndarray, retorno: np.ndarray, cortes: np.ndarray) -> dict:
+    """Contagem, retorno médio e acerto (retorno > 0) de cada status para todas as linhas de `cortes`.
+
+    A pontuação é inteira e limitada, então um histograma por pontuação e
+    somas acumuladas dão as estatísticas de qualquer conjunto de cortes em
+    O(1): nenhum corte exige repassar as datas.
+    """
+    valido = ~np.isnan(retorno)
+    indice = pontuacao[valido].astype(int) - PONTUACAO_MIN
+    tamanho = PONTUACAO_MAX - PONTUACAO_MIN + 1
+    r = retorno[valido]
+    acumulados = [np.concatenate(([0.0], np.cumsum(np.bincount(indice, weights=w, minlength=tamanho))))
+                  for w in (None, r, (r > 0).astype(float))]
+    # Limites superiores (inclusive) de cada status; 'caro' vai até o fim
+    limites = np.column_stack([cortes - PONTUACAO_MIN + 1, np.full(len(cortes), tamanho)])
+    limites = np.clip(limites, 0, tamanho)
+    inicios = np.column_stack([np.zeros(len(cortes), dtype=int), limites[:, :-1]])
+    n, soma, acertos = (a[limites] - a[inicios] for a in acumulados)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return {'n': n, 'media': soma / n, 'acerto': acertos / n * 100}
+
+# Dados de cada processo da calibração, recebidos uma vez no inicializador
+_dados_processo = None
+
+def _iniciar_processo(indicadores, retorno, cortes):
+    global _dados_processo
+    _dados_processo = (indicadores, retorno, cortes)
+
+def _avaliar_regras(regras: dict) -> pd.DataFrame:
+    indicadores, retorno, cortes = _dados_processo
+    pontuacao = AnaliseService.pontuar(**indicadores, regras=regras)
+    # Datas sem janela mínima (menos de 12 meses de histórico) ficam de fora
+    retorno = np.where(np.isnan(indicadores['m12']), np.nan, retorno)
+    stats = avaliar_cortes(pontuacao, retorno, cortes)
+    tabela = pd.DataFrame(cortes, columns=STATUS[:-1])
+    for chave, valores in regras.items():
+        tabela[chave] = [valores] * len(tabela)
+    for j, status in enumerate(STATUS):
+        tabela[f'n_{status}'] = stats['n'][:, j]
+        tabela[f'retorno_{status}'] = stats['media'][:, j]
+        tabela[f'acerto_{status}'] = stats['acerto'][:, j]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        compra = (stats['media'][:, 0] * stats['n'][:, 0] + stats['media'][:, 1] * stats['n'][:, 1]) / (stats['n'][:, 0] + stats['n'][:, 1])
+        evita = (stats['media'][:, 3] * stats['n'][:, 3] + stats['media'][:, 4] * stats['n'][:, 4]) / (stats['n'][:, 3] + stats['n'][:, 4])
+    # Quanto os sinais de compra renderam a mais que os de "caro/atenção"
+    tabela['spread'] = compra - evita
+    return tabela
+
+def calibrar(precos: pd.DataFrame, horizonte: int = 63, regras=None, cortes: np.ndarray = None,
+             processos: int = None) -> pd.DataFrame:
+    """Uma linha por (regras, cortes) com n, retorno médio e acerto de cada status e o `spread`.
+
+    Os indicadores rolantes são calculados uma vez; cada conjunto de regras
+    gera a matriz de pontuações (datas x tickers) de uma vez e é avaliado
+    contra toda a grade de cortes. Conjuntos de regras rodam em paralelo.
+    """
+    regras = regras if regras is not None else grade_regras()
+    cortes = cortes if cortes is not None else grade_cortes()
+    indicadores = {k: v.to_numpy(dtype=float) for k, v in indicadores_rolantes(precos).items()}
+    retorno = retornos_futuros(precos, horizonte).to_numpy(dtype=float)
+    processos = min(processos or os.cpu_count() or 1, len(regras))
+    if processos <= 1:
+        _iniciar_processo(indicadores, retorno, cortes)
+        tabelas = [_avaliar_regras(r) for r in regras]
+    else:
+        with ProcessPoolExecutor(max_workers=processos, initializer=_iniciar_processo,
+                                 initargs=(indicadores, retorno, cortes)) as executor:
+            tabelas = list(executor.map(_avaliar_regras, regras))
+    return pd.concat(tabelas, ignore_index=True)
+
+def melhores(resultado: pd.DataFrame, n: int = 20, minimo_por_status: int = 100) -> pd.DataFrame:
+    """Combinações com maior `spread` entre as que têm amostras suficientes em todos os status."""
+    amostras = resultado[[f'n_{s}' for s in STATUS]].min(axis=1)
+    return resultado[amostras >= minimo_por_status].nlargest(n, 'spread')
+
+def main():
+    parser = argparse.ArgumentParser(description="Calibra os cortes do Scanner pelo retorno futuro de cada status")
+    parser.add_argument("--categoria", default="Ações", choices=list(CATEGORIAS_SCANNER))
+    parser.add_argument("--periodo", default="10y")
+    parser.add_argument("--horizonte", type=int, default=63, help="pregões à frente")
+    parser.add_argument("--processos", type=int, default=None)
+    args = parser.parse_args()
+
+    precos = RiscoService.matriz_precos(CATEGORIAS_SCANNER[args.categoria], args.periodo)
+    resultado = calibrar(precos, args.horizonte, processos=args.processos)
+    destino = Path(settings.PROCESSADOS_DIR) / f"calibracao_{args.categoria}_{args.horizonte}.parquet"
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    resultado.astype({c: str for c in AnaliseService.REGRAS}).to_parquet(destino)
+    print(f"{len(resultado)} combinações avaliadas; resultado em {destino}")
+    with pd.option_context('display.width', 200, 'display.max_columns', 12):
+        print(melhores(resultado)[STATUS[:-1] + list(AnaliseService.REGRAS) + ['spread']])
+
+if __name__ == "__main__":
+    main()
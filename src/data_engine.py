@@ -1,5 +1,5 @@
 import pandas as pd
-import yfinance as yf
+from services.provedor_mercado import obter_provedor
 import streamlit as st
 
 @st.cache_data(ttl=600)
@@ -18,16 +18,11 @@ def fetch_data():
 def sync_prices(df):
     try:
         tickers = df['Ativo'].unique().tolist()
-        data = yf.download(tickers, period="1d", progress=False)['Close']
+        data = obter_provedor().fechamentos(tickers, periodo="1d")
         
         p_dict = {}
         for t in tickers:
-            # Tratamento para um ou vários ativos
-            if len(tickers) > 1:
-                val = data[t].iloc[-1]
-            else:
-                val = data.iloc[-1]
-            p_dict[t] = float(val)
+            p_dict[t] = float(data[t].iloc[-1])
             
         df['Preço Atual'] = df['Ativo'].map(p_dict)
         df['Patrimônio'] = df['QTD'] * df['Preço Atual']
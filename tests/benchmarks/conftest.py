@@ -0,0 +1,156 @@
+"""Mercado offline para os benchmarks, a partir dos históricos gravados em data/raw/fixtures.
+
+O provedor de mercado do processo vira um `ProvedorReplay` sem latência nem
+falhas, e o HistoricoStore aponta para um diretório temporário: o caminho
+de produção roda inteiro (download -> disco -> estatísticas rolantes), só
+que sem rede. Carteiras maiores que o número de gravações usam tickers que
+o replay deriva das séries gravadas, com os retornos deslocados no tempo e
+o preço reescalado.
+
+Requer pytest-benchmark (`pip install -r requirements-dev.txt`).
+
+Comparação com o baseline gravado em baseline.json:
+    pytest tests/benchmarks --salvar-baseline        # grava as medianas em baseline.json
+    pytest tests/benchmarks                          # falha se a mediana passar de 1.5x a gravada (e de +5 ms)
+    pytest tests/benchmarks --tolerancia-baseline 2  # tolerância maior (máquinas diferentes)
+
+Benchmark sem medida no baseline gera um aviso `SemBaseline` em vez de passar calado.
+Os testes que recebem `n` rodam para cada tamanho de `TAMANHOS`.
+"""
+import json
+import os
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+RAIZ = Path(__file__).resolve().parents[2]
+FIXTURES = RAIZ / "data" / "raw" / "fixtures"
+BASELINE = Path(__file__).with_name("baseline.json")
+
+# Tamanhos de carteira usados nos benchmarks
+TAMANHOS = [5, 50, 500]
+
+# Regressões menores que isto (s) são ruído de agendamento, por maior que seja a razão
+FOLGA_MINIMA = 0.005
+
+
+class SemBaseline(pytest.PytestWarning):
+    """Benchmark medido sem referência em baseline.json: nada foi comparado."""
+
+
+def pytest_generate_tests(metafunc):
+    if "n" in metafunc.fixturenames:
+        metafunc.parametrize("n", TAMANHOS)
+
+
+def _classe(ticker_yf: str) -> str:
+    raiz = ticker_yf.split('.')[0]
+    if raiz.endswith('11'):
+        return "ETFs" if raiz in ("BOVA11", "IVVB11") else "FIIs"
+    return "Ações"
+
+
+class MercadoGravado:
+    """Universo de `tamanho` tickers: os gravados e, depois deles, nomes que o replay deriva."""
+
+    def __init__(self, gravacoes: dict, tamanho: int):
+        bases = [t.split('.')[0] for t in gravacoes if not t.startswith('^') and not t.endswith('=X')]
+        self.universo = bases[:tamanho]
+        for i in range(len(bases), tamanho):
+            self.universo.append(f"{bases[i % len(bases)][:4]}{i // len(bases):03d}")
+
+    def tickers(self, n: int) -> list:
+        return self.universo[:n]
+
+    def setor(self, ticker: str) -> str:
+        return _classe(f"{ticker}.SA")
+
+
+@pytest.fixture(scope="session")
+def gravacoes():
+    manifesto = json.loads((FIXTURES / "manifest.json").read_text())
+    return {t: pd.read_parquet(FIXTURES / arquivo) for t, arquivo in manifesto['arquivos'].items()}
+
+@pytest.fixture(scope="session")
+def mercado(gravacoes, tmp_path_factory):
+    """Troca o Yahoo pelo provedor replay e baixa (do disco) o universo inteiro uma vez."""
+    from services import preco_service
+    from services.provedor_mercado import ProvedorReplay, definir_provedor
+
+    universo = MercadoGravado(gravacoes, max(TAMANHOS))
+    definir_provedor(ProvedorReplay(gravacoes=gravacoes, latencia_ms=0, taxa_erro=0))
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(preco_service.historico_store, "base_dir", tmp_path_factory.mktemp("historico"))
+        mp.setattr(preco_service.dividendos_service.store, "base_dir", tmp_path_factory.mktemp("dividendos"))
+        preco_service.PrecoService.buscar_historicos_batch(universo.tickers(max(TAMANHOS)), "5y", prazo_total=600)
+        yield universo
+    definir_provedor(None)
+
+@pytest.fixture(scope="session")
+def dados_historicos(mercado):
+    """Resultado de `_carregar_dados_historicos` (5y) de cada ticker do universo."""
+    from modules.analise import _carregar_dados_historicos
+    return {t: _carregar_dados_historicos(t, "5y") for t in mercado.tickers(max(TAMANHOS))}
+
+@pytest.fixture(scope="session")
+def carteiras(mercado, dados_historicos):
+    """DataFrame no formato da página (ticker, setor, Patrimônio) por tamanho de carteira."""
+    rng = np.random.default_rng(7)
+    resultado = {}
+    for n in TAMANHOS:
+        tickers = mercado.tickers(n)
+        qtd = rng.integers(1, 500, n)
+        precos = np.array([dados_historicos[t]['preco_atual'] for t in tickers])
+        resultado[n] = pd.DataFrame({'ticker': tickers, 'setor': [mercado.setor(t) for t in tickers],
+                                     'qtd': qtd, 'Preço Atual': precos, 'Patrimônio': qtd * precos})
+    return resultado
+
+
+def pytest_addoption(parser):
+    grupo = parser.getgroup("baseline", "comparação com tests/benchmarks/baseline.json")
+    grupo.addoption("--salvar-baseline", action="store_true",
+                    help="grava as medianas desta execução como o novo baseline")
+    grupo.addoption("--tolerancia-baseline", type=float,
+                    default=float(os.getenv("BENCH_TOLERANCIA", "1.5")),
+                    help="falha quando a mediana passa de N x a do baseline (padrão 1.5)")
+
+@pytest.fixture(scope="session")
+def baseline(request):
+    registrado = json.loads(BASELINE.read_text()) if BASELINE.exists() else {}
+    medido = {}
+    yield registrado, medido
+    if request.config.getoption("--salvar-baseline", False) and medido:
+        BASELINE.write_text(json.dumps({**registrado, **medido}, indent=2, sort_keys=True) + "\n")
+
+@pytest.fixture
+def medir(benchmark, baseline, request):
+    """Roda `benchmark` (ou `benchmark.pedantic` com `rodadas`) e compara a mediana com o baseline."""
+    registrado, medido = baseline
+    chave = f"{request.node.module.__name__}::{request.node.name}"
+
+    def _medir(funcao, *args, rodadas=None, preparar=None, **kwargs):
+        if rodadas:
+            resultado = benchmark.pedantic(funcao, args=args, kwargs=kwargs, setup=preparar,
+                                           rounds=rodadas, iterations=1, warmup_rounds=1)
+        else:
+            resultado = benchmark(funcao, *args, **kwargs)
+        if benchmark.stats is None:  # --benchmark-disable
+            return resultado
+        mediana = benchmark.stats.stats.median
+        medido[chave] = mediana
+        if request.config.getoption("--salvar-baseline", False):
+            return resultado
+        referencia = registrado.get(chave)
+        tolerancia = request.config.getoption("--tolerancia-baseline", 1.5)
+        if not referencia:
+            warnings.warn(SemBaseline(f"{chave}: sem medida em {BASELINE.name}; "
+                                      "grave com --salvar-baseline"))
+        elif mediana > max(referencia * tolerancia, referencia + FOLGA_MINIMA):
+            pytest.fail(f"{chave}: mediana {mediana * 1000:.2f} ms, baseline {referencia * 1000:.2f} ms "
+                        f"(limite {tolerancia:.2f}x)")
+        return resultado
+
+    return _medir
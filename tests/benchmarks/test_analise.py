@@ -0,0 +1,27 @@
+"""Pós-processamento do histórico e pontuação de preço, de 5 a 500 ativos."""
+from modules.analise import _carregar_dados_historicos, analisar_preco_ativo
+from services.analise_service import AnaliseService
+from services.preco_service import PrecoService
+from services.risco_service import RiscoService
+
+def test_carregar_dados_historicos(medir, mercado, dados_historicos, n):
+    tickers = mercado.tickers(n)
+    resultado = medir(lambda: [_carregar_dados_historicos(t, "5y") for t in tickers], rodadas=5)
+    assert all(r is not None and r['preco_atual'] > 0 for r in resultado)
+
+def test_analisar_preco_ativo(medir, mercado, dados_historicos, n):
+    dados = [(t, dados_historicos[t]) for t in mercado.tickers(n)]
+    resultado = medir(lambda: [analisar_preco_ativo(t, d) for t, d in dados])
+    assert len(resultado) == n
+
+def test_analise_service_analisar(medir, mercado, n):
+    dados = [PrecoService._buscar_dados_single(t, "5y") for t in mercado.tickers(n)]
+    assert all(d.status == "ok" for d in dados)
+    servico = AnaliseService()
+    resultado = medir(lambda: [servico.analisar(d) for d in dados])
+    assert len(resultado) == n
+
+def test_analisar_universo(medir, mercado, n):
+    precos = RiscoService.matriz_precos(mercado.tickers(n), "5y")
+    resultado = medir(AnaliseService.analisar_universo, precos)
+    assert len(resultado) == n
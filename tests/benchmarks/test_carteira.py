@@ -0,0 +1,29 @@
+"""Correlação, risco/retorno e rebalanceamento de carteiras de 5 a 500 ativos."""
+import pytest
+
+from modules.analise import calcular_matriz_correlacao, calcular_rebalanceamento, calcular_risco_retorno
+from services.risco_service import AnaliseCarteira, RiscoService
+
+def _sem_cache():
+    # Cada rodada mede a análise inteira (matriz de preços do disco + cálculo), não o cache
+    RiscoService._cache.clear()
+
+def test_calcular_matriz_correlacao(medir, mercado, n):
+    tickers = mercado.tickers(n)
+    correlacao, precos = medir(calcular_matriz_correlacao, tickers, "1y", rodadas=5, preparar=_sem_cache)
+    assert correlacao.shape == (n, n)
+
+def test_calcular_risco_retorno(medir, mercado, n):
+    tickers = mercado.tickers(n)
+    resultado = medir(calcular_risco_retorno, tickers, "1y", rodadas=5, preparar=_sem_cache)
+    assert len(resultado) == n
+
+def test_correlacao_sem_io(medir, mercado, n):
+    precos = RiscoService.matriz_precos(mercado.tickers(n), "1y")
+    resultado = medir(lambda: AnaliseCarteira(precos).correlacao)
+    assert resultado.shape == (n, n)
+
+def test_calcular_rebalanceamento(medir, carteiras, n):
+    metas = {"Ações": 50.0, "FIIs": 30.0, "ETFs": 20.0}
+    resultado = medir(calcular_rebalanceamento, carteiras[n], metas, 1000.0)
+    assert resultado['Alvo (R$)'].sum() == pytest.approx(carteiras[n]['Patrimônio'].sum() + 1000.0)
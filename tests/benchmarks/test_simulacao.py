@@ -0,0 +1,15 @@
+"""Bola de Neve: projeção determinística e Monte Carlo."""
+import pytest
+
+from services.simulacao_service import SimulacaoService
+
+@pytest.mark.parametrize("meses", [120, 360, 600])
+def test_bola_de_neve(medir, meses):
+    resultado = medir(SimulacaoService.bola_de_neve, 10000.0, 1000.0, 0.10, meses)
+    assert len(resultado) == meses
+
+@pytest.mark.parametrize("caminhos", [10_000, 100_000])
+def test_monte_carlo(medir, caminhos):
+    resultado = medir(SimulacaoService.monte_carlo, 10000.0, 1000.0, 0.10, 0.18, 360,
+                      caminhos=caminhos, semente=1, rodadas=5)
+    assert (resultado['P5'] <= resultado['P95']).all()
@@ -0,0 +1,54 @@
+"""Banco SQLite em memória com o schema base de `modules.database.init_db`."""
+import sqlite3
+
+import pytest
+
+SCHEMA_BASE = """
+    CREATE TABLE usuarios (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        username TEXT UNIQUE NOT NULL,
+        nome TEXT NOT NULL,
+        senha_hash TEXT NOT NULL
+    );
+    CREATE TABLE ativos (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        ticker TEXT NOT NULL,
+        qtd REAL NOT NULL,
+        pm REAL NOT NULL,
+        setor TEXT NOT NULL,
+        FOREIGN KEY(user_id) REFERENCES usuarios(id)
+    );
+    CREATE TABLE metas_alocacao (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        classe TEXT NOT NULL,
+        percentual REAL NOT NULL,
+        FOREIGN KEY(user_id) REFERENCES usuarios(id)
+    );
+    CREATE TABLE alertas (
+        id TEXT PRIMARY KEY,
+        user_id INTEGER NOT NULL,
+        ticker TEXT NOT NULL,
+        tipo TEXT NOT NULL,
+        preco REAL NOT NULL,
+        ativo BOOL NOT NULL,
+        criado_em TEXT NOT NULL,
+        FOREIGN KEY(user_id) REFERENCES usuarios(id)
+    );
+"""
+
+@pytest.fixture
+def banco_legado():
+    """Schema base, sem nenhuma migração aplicada."""
+    conn = sqlite3.connect(":memory:")
+    conn.executescript(SCHEMA_BASE)
+    yield conn
+    conn.close()
+
+@pytest.fixture
+def banco(banco_legado):
+    """Schema base com todas as migrações aplicadas."""
+    from database.migracoes import aplicar_migracoes
+    aplicar_migracoes(banco_legado)
+    return banco_legado
@@ -0,0 +1,48 @@
+import sqlite3
+
+import pytest
+
+from services import cache_mercado
+from services.alerta_service import ABAIXO, ACIMA, AlertaService
+from services.cache_mercado import CacheMercado
+
+
+@pytest.fixture
+def servico(tmp_path, banco):
+    """AlertaService sobre um arquivo com o schema migrado e dois alertas de PETR4."""
+    caminho = str(tmp_path / "alertas.db")
+    banco.executemany("INSERT INTO alertas VALUES (?, 1, 'PETR4', ?, ?, 1, '01/01/2024')",
+                      [('a1', ACIMA, 40.0), ('a2', ABAIXO, 30.0)])
+    banco.commit()
+    with sqlite3.connect(caminho) as destino:
+        banco.backup(destino)
+    cotacoes = {}
+    servico = AlertaService(caminho, buscar_cotacoes=lambda tickers: {t: cotacoes[t] for t in tickers if t in cotacoes})
+    yield servico, cotacoes
+    servico.parar()
+
+def test_dispara_com_cotacao_do_dia(servico):
+    servico, cotacoes = servico
+    cotacoes['PETR4'] = (41.0, "ok", "Atualizado")
+    assert servico.verificar() == 1
+    assert servico.verificar() == 0
+
+@pytest.mark.parametrize("status", ["aviso", "erro"])
+def test_nao_dispara_com_cotacao_antiga(servico, status):
+    servico, cotacoes = servico
+    cotacoes['PETR4'] = (41.0, status, "Há 2 min · sem atualização")
+    assert servico.verificar() == 0
+
+
+def test_preco_mantido_apos_falha_nao_serve_para_alertas(monkeypatch):
+    respostas = iter([{'PETR4': (41.0, "ok", "Atualizado")}, {'PETR4': (None, "erro", "timeout")},
+                      {'PETR4': (None, "erro", "timeout")}])
+    monkeypatch.setattr(cache_mercado.PrecoService, "buscar_cotacoes_batch", lambda tickers: next(respostas))
+    cache = CacheMercado(ttl_cotacao=1)
+    assert cache.cotacoes(['PETR4'], aceitar_antigas=False)['PETR4'][1] == "ok"
+    cache._cotacoes['PETR4'] = (0.0,) + cache._cotacoes['PETR4'][1:]  # vence
+    assert cache.cotacoes(['PETR4'], aceitar_antigas=False)['PETR4'] == (None, "erro", "timeout")
+    # O preço bom fica guardado por TTL_FALHA como "aviso": as páginas o veem, os alertas não
+    assert cache._cotacoes['PETR4'][1][:2] == (41.0, "aviso")
+    assert cache.cotacoes(['PETR4'])['PETR4'][:2] == (41.0, "aviso")
+    assert cache.cotacoes(['PETR4'], aceitar_antigas=False)['PETR4'] == (None, "erro", "timeout")
@@ -0,0 +1,50 @@
+import pandas as pd
+import pytest
+
+from database.historico_store import HistoricoStore
+from services import preco_service
+from services.preco_service import PrecoService
+from services.provedor_mercado import COLUNAS_HISTORICO, ProvedorMercado, definir_provedor
+
+
+class ProvedorContador(ProvedorMercado):
+    nome = "contador"
+
+    def __init__(self):
+        self.chamadas = []
+
+    def historico(self, ticker_yf, periodo=None, inicio=None):
+        self.chamadas.append((ticker_yf, periodo, inicio))
+        datas = pd.bdate_range(end=pd.Timestamp.now().normalize(), periods=300, tz="America/Sao_Paulo")
+        return pd.DataFrame({c: 10.0 for c in COLUNAS_HISTORICO}, index=datas).assign(Dividends=0.0, **{'Stock Splits': 0.0})
+
+    def fechamentos(self, tickers_yf, periodo="2d"):
+        return pd.DataFrame()
+
+    def dividendos(self, ticker_yf):
+        return pd.Series(dtype=float)
+
+    def ultimo_preco(self, ticker_yf):
+        return 10.0
+
+
+@pytest.fixture
+def provedor(tmp_path, monkeypatch):
+    monkeypatch.setattr(preco_service, "historico_store", HistoricoStore(tmp_path / "historico"))
+    monkeypatch.setattr(preco_service.dividendos_service.store, "base_dir", tmp_path / "dividendos")
+    (tmp_path / "dividendos").mkdir()
+    provedor = ProvedorContador()
+    definir_provedor(provedor)
+    yield provedor
+    definir_provedor(None)
+
+def test_expirar_faz_a_proxima_leitura_ir_a_rede(provedor):
+    PrecoService.buscar_historico_incremental("PETR4.SA", "1y")
+    PrecoService.buscar_historico_incremental("PETR4.SA", "1y")
+    assert len(provedor.chamadas) == 1  # a segunda leitura vem do disco, dentro do HISTORICO_TTL
+
+    PrecoService.expirar_historicos(["PETR4"])
+    assert "atualizado_em" not in preco_service.historico_store.carregar_meta("PETR4.SA")
+    PrecoService.buscar_historico_incremental("PETR4.SA", "1y")
+    assert len(provedor.chamadas) == 2
+    assert provedor.chamadas[-1][2] is not None  # sincronização incremental, não o período inteiro
@@ -0,0 +1,50 @@
+import pandas as pd
+import pytest
+
+from services.imposto_service import ImpostoService, classe_ir
+
+
+def vendas(*linhas):
+    return pd.DataFrame(linhas, columns=['data', 'setor', 'qtd', 'preco', 'resultado'])
+
+def ir_por_mes(df):
+    return dict(zip(df['Mês'], df['IR devido']))
+
+
+def test_classes():
+    assert [classe_ir(s) for s in ('Ações', 'FII Papel', 'ETF', 'BDR', 'Renda Fixa', None)] == \
+        ['Ações', 'FII', 'ETF/BDR', 'ETF/BDR', None, None]
+
+def test_isencao_de_20_mil_so_para_acoes():
+    df = ImpostoService.apurar_mensal(vendas(
+        ('2024-01-10', 'Ações', 100, 150.0, 1000.0),
+        ('2024-01-12', 'ETF', 100, 150.0, 1000.0),
+        ('2024-01-15', 'BDR', 10, 50.0, 100.0),
+        ('2024-02-10', 'Ações', 100, 250.0, 2000.0),
+    ))
+    assert ir_por_mes(df) == {'2024-01': pytest.approx(165.0), '2024-02': pytest.approx(300.0)}
+
+def test_prejuizo_compensado_dentro_da_classe():
+    df = ImpostoService.apurar_mensal(vendas(
+        ('2023-11-10', 'FII Tijolo', 10, 90.0, -500.0),
+        ('2024-01-10', 'ETF', 100, 150.0, -300.0),
+        ('2024-02-10', 'FII Papel', 10, 120.0, 800.0),
+        ('2024-02-11', 'BDR', 100, 30.0, 200.0),
+        ('2024-03-10', 'ETF', 100, 150.0, 400.0),
+    ))
+    ir = ir_por_mes(df)
+    # FII: 800 - 500 do ano anterior; ETF/BDR: 200 consome o prejuízo de 300, sobra 100 para março
+    assert ir['2024-02'] == pytest.approx(300 * 0.20)
+    assert ir['2024-03'] == pytest.approx(300 * 0.15)
+    assert df['Prejuízo a compensar'].tolist() == [500.0, 800.0, 100.0, 0.0]
+
+def test_lucro_isento_nao_consome_prejuizo():
+    df = ImpostoService.apurar_mensal(vendas(
+        ('2024-01-10', 'Ações', 100, 150.0, -1000.0),
+        ('2024-02-10', 'Ações', 100, 100.0, 900.0),
+        ('2024-03-10', 'Ações', 100, 300.0, 1500.0),
+    ))
+    assert ir_por_mes(df) == {'2024-01': 0.0, '2024-02': 0.0, '2024-03': pytest.approx(500 * 0.15)}
+
+def test_setores_fora_da_apuracao():
+    assert ImpostoService.apurar_mensal(vendas(('2024-01-10', 'Renda Fixa', 1, 1000.0, 50.0))).empty
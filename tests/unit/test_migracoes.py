@@ -0,0 +1,20 @@
+from database.migracoes import MIGRACOES, aplicar_migracoes, versao_schema
+
+
+def _inserir(conn, linhas):
+    conn.executemany("INSERT INTO ativos (user_id, ticker, qtd, pm, setor) VALUES (?, ?, ?, ?, ?)", linhas)
+    conn.commit()
+
+def test_aplica_todas_as_migracoes_uma_vez(banco_legado):
+    assert aplicar_migracoes(banco_legado) == MIGRACOES[-1][0]
+    assert aplicar_migracoes(banco_legado) == versao_schema(banco_legado)
+
+def test_v1_funde_posicoes_repetidas_com_preco_medio_ponderado(banco_legado):
+    _inserir(banco_legado, [(1, 'PETR4', 10, 30.0, 'Ações'), (1, 'PETR4', 30, 34.0, 'Ações')])
+    aplicar_migracoes(banco_legado)
+    assert banco_legado.execute("SELECT qtd, pm FROM ativos WHERE ticker = 'PETR4'").fetchall() == [(40.0, 33.0)]
+
+def test_v1_posicoes_repetidas_que_somam_zero(banco_legado):
+    _inserir(banco_legado, [(1, 'VALE3', 10, 60.0, 'Ações'), (1, 'VALE3', -10, 65.0, 'Ações')])
+    aplicar_migracoes(banco_legado)
+    assert banco_legado.execute("SELECT qtd, pm FROM ativos WHERE ticker = 'VALE3'").fetchall() == [(0.0, 0.0)]
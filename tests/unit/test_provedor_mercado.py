@@ -0,0 +1,75 @@
+import pytest
+
+from services.provedor_mercado import (CircuitoAberto, ErroProvedor, FalhaTransporte,
+                                       ProvedorMercado, ProvedorProtegido)
+from services.resiliencia import BaldeTokens, Disjuntor
+
+
+class ProvedorFalso(ProvedorMercado):
+    """Levanta, em ordem, os erros de `erros` e depois devolve 10.0."""
+
+    nome = "falso"
+
+    def __init__(self, *erros):
+        self.erros = list(erros)
+        self.chamadas = 0
+
+    def ultimo_preco(self, ticker_yf):
+        self.chamadas += 1
+        if self.erros:
+            raise self.erros.pop(0)
+        return 10.0
+
+    historico = fechamentos = dividendos = ultimo_preco
+
+
+def protegido(provedor, tentativas=3, limite_falhas=2):
+    return ProvedorProtegido(provedor, balde=BaldeTokens(1000, 1000), disjuntor=Disjuntor(limite_falhas, 30),
+                             tentativas=tentativas, timeout=30)
+
+@pytest.fixture(autouse=True)
+def sem_recuo(monkeypatch):
+    monkeypatch.setattr("services.provedor_mercado.RECUO_INICIAL", 0.0)
+
+
+def test_falha_de_acesso_e_repetida():
+    provedor = ProvedorFalso(ConnectionError("reset"), TimeoutError("lento"))
+    cliente = protegido(provedor)
+    assert cliente.ultimo_preco("PETR4.SA") == 10.0
+    assert provedor.chamadas == 3
+    assert cliente.disjuntor.falhas == 0
+
+def test_chamada_que_esgota_as_tentativas_conta_uma_falha():
+    provedor = ProvedorFalso(*[FalhaTransporte("rede")] * 3)
+    cliente = protegido(provedor, limite_falhas=5)
+    with pytest.raises(ErroProvedor):
+        cliente.ultimo_preco("PETR4.SA")
+    assert provedor.chamadas == 3
+    assert cliente.disjuntor.falhas == 1
+
+def test_erro_do_dado_nao_e_repetido_nem_abre_o_circuito():
+    provedor = ProvedorFalso(*[ErroProvedor("XXXX3.SA: sem gravação"), KeyError("last_price")] * 3)
+    cliente = protegido(provedor)
+    for _ in range(6):
+        with pytest.raises(ErroProvedor):
+            cliente.ultimo_preco("XXXX3.SA")
+    assert provedor.chamadas == 6
+    assert cliente.disjuntor.estado == Disjuntor.FECHADO
+    assert cliente.ultimo_preco("PETR4.SA") == 10.0
+
+def test_circuito_abre_apos_chamadas_com_falha_de_acesso():
+    provedor = ProvedorFalso(*[OSError("rede")] * 2)
+    cliente = protegido(provedor, tentativas=1)
+    for _ in range(2):
+        with pytest.raises(ErroProvedor):
+            cliente.ultimo_preco("PETR4.SA")
+    with pytest.raises(CircuitoAberto):
+        cliente.ultimo_preco("PETR4.SA")
+    assert provedor.chamadas == 2
+
+def test_meio_aberto_tenta_de_novo_dentro_da_mesma_chamada():
+    provedor = ProvedorFalso(FalhaTransporte("rede"))
+    cliente = protegido(provedor)
+    cliente.disjuntor.estado, cliente.disjuntor.reabre_em = Disjuntor.ABERTO, 0.0
+    assert cliente.ultimo_preco("PETR4.SA") == 10.0
+    assert cliente.disjuntor.estado == Disjuntor.FECHADO
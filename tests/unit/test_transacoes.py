@@ -0,0 +1,118 @@
+import pytest
+
+from database.migracoes import aplicar_migracoes
+from database.transacoes import (DATA_ABERTURA, materializar, registrar_transacao,
+                                 versao_carteira)
+
+USER = 1
+
+
+def posicao(conn, ticker):
+    return conn.execute(
+        "SELECT qtd, pm, lucro_realizado, proventos, ultima_data FROM ativos WHERE user_id = ? AND ticker = ?",
+        (USER, ticker)
+    ).fetchone()
+
+def resultados(conn, ticker):
+    return [r for (r,) in conn.execute(
+        "SELECT resultado FROM transacoes WHERE ticker = ? AND tipo = 'venda' ORDER BY data, id", (ticker,))]
+
+
+def test_compra_acumula_preco_medio_com_taxas(banco):
+    registrar_transacao(banco, USER, 'petr4', 'compra', 100, 30.0, data='2024-01-10', taxas=10.0)
+    registrar_transacao(banco, USER, 'PETR4', 'compra', 100, 40.0, data='2024-02-10')
+    qtd, pm, *_ = posicao(banco, 'PETR4')
+    assert qtd == 200
+    assert pm == pytest.approx((3000 + 10 + 4000) / 200)
+
+def test_venda_realiza_resultado_e_zera_posicao(banco):
+    registrar_transacao(banco, USER, 'VALE3', 'compra', 10, 60.0, data='2024-01-10')
+    registrar_transacao(banco, USER, 'VALE3', 'venda', 4, 70.0, data='2024-02-10', taxas=2.0)
+    assert posicao(banco, 'VALE3')[:3] == (6, 60.0, pytest.approx(38.0))
+    registrar_transacao(banco, USER, 'VALE3', 'venda', 6, 50.0, data='2024-03-10')
+    assert posicao(banco, 'VALE3')[:3] == (0.0, 0.0, pytest.approx(-22.0))
+    assert resultados(banco, 'VALE3') == [pytest.approx(38.0), pytest.approx(-60.0)]
+
+def test_venda_maior_que_a_posicao_nao_grava_nada(banco):
+    registrar_transacao(banco, USER, 'ITUB4', 'compra', 10, 25.0, data='2024-01-10')
+    banco.commit()
+    versao = versao_carteira(banco, USER)
+    with pytest.raises(ValueError, match="ITUB4"):
+        registrar_transacao(banco, USER, 'ITUB4', 'venda', 11, 30.0, data='2024-02-10')
+    assert not banco.in_transaction
+    assert versao_carteira(banco, USER) == versao
+    assert banco.execute("SELECT COUNT(*) FROM transacoes").fetchone()[0] == 1
+    assert posicao(banco, 'ITUB4')[0] == 10
+
+def test_desdobramento_multiplica_cotas_e_divide_preco_medio(banco):
+    registrar_transacao(banco, USER, 'WEGE3', 'compra', 10, 40.0, data='2024-01-10')
+    registrar_transacao(banco, USER, 'WEGE3', 'desdobramento', 2, data='2024-02-10')
+    assert posicao(banco, 'WEGE3')[:2] == (20, 20.0)
+    registrar_transacao(banco, USER, 'WEGE3', 'desdobramento', 0.5, data='2024-03-10')
+    assert posicao(banco, 'WEGE3')[:2] == (10, 40.0)
+
+def test_dividendo_usa_a_posicao_quando_sem_quantidade(banco):
+    registrar_transacao(banco, USER, 'MXRF11', 'compra', 100, 10.0, data='2024-01-10')
+    registrar_transacao(banco, USER, 'MXRF11', 'dividendo', 0, 0.1, data='2024-02-15')
+    assert posicao(banco, 'MXRF11')[3] == pytest.approx(10.0)
+
+def test_ajuste_define_quantidade_e_preco_medio(banco):
+    registrar_transacao(banco, USER, 'BBAS3', 'compra', 10, 50.0, data='2024-01-10')
+    registrar_transacao(banco, USER, 'BBAS3', 'ajuste', 25, 45.0, data='2024-02-10')
+    assert posicao(banco, 'BBAS3')[:2] == (25, 45.0)
+    registrar_transacao(banco, USER, 'BBAS3', 'ajuste', 0, 0, data='2024-03-10')
+    assert posicao(banco, 'BBAS3')[:2] == (0, 0)
+
+def test_marca_dagua_aplica_so_o_que_falta(banco):
+    id_ = registrar_transacao(banco, USER, 'PRIO3', 'compra', 10, 40.0, data='2024-01-10')
+    assert versao_carteira(banco, USER) == id_
+    assert materializar(banco, USER) == id_
+    assert posicao(banco, 'PRIO3')[0] == 10
+    # Linha gravada fora de registrar_transacao: só ela é aplicada
+    cur = banco.execute(
+        """INSERT INTO transacoes (user_id, ticker, tipo, data, qtd, preco, taxas, criado_em)
+           VALUES (?, 'PRIO3', 'compra', '2024-02-10', 5, 46.0, 0, '2024-02-10T10:00:00')""", (USER,))
+    assert materializar(banco, USER) == cur.lastrowid
+    assert posicao(banco, 'PRIO3')[:2] == (15, pytest.approx(42.0))
+
+def test_compra_retroativa_refaz_o_ticker(banco):
+    registrar_transacao(banco, USER, 'KNRI11', 'compra', 10, 100.0, data='2024-03-01')
+    registrar_transacao(banco, USER, 'KNRI11', 'venda', 10, 120.0, data='2024-04-01')
+    registrar_transacao(banco, USER, 'KNRI11', 'compra', 10, 80.0, data='2024-01-01')
+    qtd, pm, lucro, _, ultima = posicao(banco, 'KNRI11')
+    assert (qtd, pm, ultima) == (10, 90.0, '2024-04-01')
+    # A venda agora sai do preço médio com a compra retroativa
+    assert resultados(banco, 'KNRI11') == [pytest.approx(300.0)]
+    assert lucro == pytest.approx(300.0)
+
+def test_venda_retroativa_antes_da_compra_que_a_cobre(banco):
+    registrar_transacao(banco, USER, 'HGLG11', 'compra', 10, 160.0, data='2024-03-01')
+    with pytest.raises(ValueError, match="HGLG11"):
+        registrar_transacao(banco, USER, 'HGLG11', 'venda', 5, 170.0, data='2024-02-01')
+    assert posicao(banco, 'HGLG11')[:2] == (10, 160.0)
+    assert resultados(banco, 'HGLG11') == []
+
+def test_venda_retroativa_que_descobre_venda_posterior(banco):
+    registrar_transacao(banco, USER, 'XPLG11', 'compra', 10, 100.0, data='2024-01-01')
+    registrar_transacao(banco, USER, 'XPLG11', 'venda', 10, 110.0, data='2024-03-01')
+    with pytest.raises(ValueError):
+        registrar_transacao(banco, USER, 'XPLG11', 'venda', 5, 105.0, data='2024-02-01')
+    assert resultados(banco, 'XPLG11') == [pytest.approx(100.0)]
+
+
+def test_migracao_semeia_saldo_de_abertura_antes_de_qualquer_negociacao(banco_legado):
+    banco_legado.execute("INSERT INTO ativos (user_id, ticker, qtd, pm, setor) VALUES (?, 'BOVA11', 100, 110.0, 'ETF')",
+                         (USER,))
+    banco_legado.commit()
+    aplicar_migracoes(banco_legado)
+    assert banco_legado.execute("SELECT tipo, data, qtd, preco FROM transacoes").fetchall() == [
+        ('ajuste', DATA_ABERTURA, 100, 110.0)]
+    assert posicao(banco_legado, 'BOVA11')[:2] == (100, 110.0)
+    assert versao_carteira(banco_legado, USER) == 1
+
+    # Negociações retroativas somam-se ao saldo de abertura em vez de serem apagadas por ele
+    registrar_transacao(banco_legado, USER, 'BOVA11', 'compra', 100, 130.0, data='2023-05-10')
+    registrar_transacao(banco_legado, USER, 'BOVA11', 'venda', 50, 140.0, data='2023-06-10')
+    qtd, pm, lucro, *_ = posicao(banco_legado, 'BOVA11')
+    assert (qtd, pm) == (150, 120.0)
+    assert lucro == pytest.approx(1000.0)
@@ -2,6 +2,8 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
+from services.simulacao_service import SimulacaoService
 from utils.exportacao import formatar_moeda
 
 def show_bola_neve(user_id):
@@ -17,25 +19,7 @@ def show_bola_neve(user_id):
         anos = st.slider("⏳ Período (anos)", 1, 50, 20)
     
     meses = anos * 12
-    taxa_mensal = (1 + taxa_anual) ** (1/12) - 1
-    
-    df_sim = pd.DataFrame({'Mês': range(1, meses+1)})
-    
-    # Com reinvestimento
-    patrim = []
-    atual = valor_inicial
-    for i in range(meses):
-        atual = atual * (1 + taxa_mensal) + aporte_mensal
-        patrim.append(atual)
-    df_sim['Com reinvestimento'] = patrim
-    
-    # Sem reinvestimento
-    patrim_sem = []
-    atual_sem = valor_inicial
-    for i in range(meses):
-        atual_sem = atual_sem + aporte_mensal
-        patrim_sem.append(atual_sem)
-    df_sim['Sem reinvestimento'] = patrim_sem
+    df_sim = SimulacaoService.bola_de_neve(valor_inicial, aporte_mensal, taxa_anual, meses)
     
     final_com = df_sim['Com reinvestimento'].iloc[-1]
     final_sem = df_sim['Sem reinvestimento'].iloc[-1]
@@ -57,6 +41,30 @@ def show_bola_neve(user_id):
                   color_discrete_map={'Com reinvestimento': '#D4AF37', 'Sem reinvestimento': '#FF4B4B'})
     st.plotly_chart(fig, use_container_width=True)
     
+    if st.checkbox("🎲 Simular cenários com volatilidade (Monte Carlo)"):
+        col_mc1, col_mc2 = st.columns(2)
+        with col_mc1:
+            volatilidade = st.slider("📉 Volatilidade anual (%)", 0.0, 40.0, 15.0, step=1.0) / 100
+        with col_mc2:
+            caminhos = st.select_slider("🔢 Cenários simulados", options=[10_000, 25_000, 50_000, 100_000], value=10_000)
+        faixas = SimulacaoService.monte_carlo(valor_inicial, aporte_mensal, taxa_anual, volatilidade,
+                                              meses, caminhos=caminhos, semente=42)
+        fig_mc = go.Figure()
+        fig_mc.add_trace(go.Scatter(x=faixas.index, y=faixas['P95'], line=dict(width=0), showlegend=False, hoverinfo='skip'))
+        fig_mc.add_trace(go.Scatter(x=faixas.index, y=faixas['P5'], fill='tonexty', fillcolor='rgba(212,175,55,0.15)',
+                                    line=dict(width=0), name='5% a 95%'))
+        fig_mc.add_trace(go.Scatter(x=faixas.index, y=faixas['P75'], line=dict(width=0), showlegend=False, hoverinfo='skip'))
+        fig_mc.add_trace(go.Scatter(x=faixas.index, y=faixas['P25'], fill='tonexty', fillcolor='rgba(212,175,55,0.35)',
+                                    line=dict(width=0), name='25% a 75%'))
+        fig_mc.add_trace(go.Scatter(x=faixas.index, y=faixas['P50'], line=dict(color='#D4AF37'), name='Mediana'))
+        fig_mc.update_layout(title="Faixas de patrimônio nos cenários simulados",
+                             xaxis_title='Mês', yaxis_title='Patrimônio (R$)')
+        st.plotly_chart(fig_mc, use_container_width=True)
+        col_p1, col_p2, col_p3 = st.columns(3)
+        col_p1.metric("Cenário pessimista (5%)", formatar_moeda(faixas['P5'].iloc[-1]))
+        col_p2.metric("Cenário mediano", formatar_moeda(faixas['P50'].iloc[-1]))
+        col_p3.metric("Cenário otimista (95%)", formatar_moeda(faixas['P95'].iloc[-1]))
+    
     with st.expander("📊 Ver tabela anual"):
         df_sim['Ano'] = ((df_sim['Mês'] - 1) // 12) + 1
         df_anual = df_sim.groupby('Ano').last().reset_index()
@@ -3,6 +3,7 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime
 from database.repository import AtivoRepository, MetaRepository
+from services.cache_mercado import obter_cache_mercado
 from services.preco_service import PrecoService
 from services.analise_service import AnaliseService
 from utils.graficos import GraficoService
@@ -25,7 +26,10 @@ def show_dashboard(user_id):
         st.caption(f"🕐 {datetime.now().strftime('%H:%M:%S')}")
     with col3:
         if st.button("🔄 Atualizar Preços"):
-            st.cache_data.clear()
+            # Esta página lê os preços do histórico em disco (buscar_precos_batch): é ele que expira
+            tickers = [a['ticker'] for a in repo.carregar_por_usuario(user_id)]
+            PrecoService.expirar_historicos(tickers)
+            obter_cache_mercado().invalidar(tickers)
             st.rerun()
     
     ativos = repo.carregar_por_usuario(user_id)
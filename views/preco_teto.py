@@ -27,10 +27,11 @@ def show_preco_teto(user_id):
         st.metric("DY Selecionado", f"{dy*100:.1f}%")
     
     resultados = []
+    cotacoes = preco_service.buscar_cotacoes_batch([a['ticker'] for a in ativos])
     for ativo in ativos:
         ticker = ativo['ticker']
         preco_teto, msg = teto_service.calcular_bazin(ticker, dy)
-        preco_atual, _, _ = preco_service.get_preco_cached(ticker)
+        preco_atual, _, _ = cotacoes[ticker]
         if preco_teto and preco_atual:
             diff = (preco_teto - preco_atual) / preco_atual * 100
             status = "✅ COMPRAR" if preco_atual <= preco_teto else "⏳ ESPERAR"